@@ -0,0 +1,83 @@
+"""Замер памяти на одну заметку.
+
+Сравнивает прежний @dataclass с __dict__ и двумя datetime, компактный
+Note со __slots__ и колоночный NoteTable.
+
+Запуск: python -m benchmarks.note_memory [количество]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+from core.models.note import Note
+from benchmarks.note_table import NoteTable
+
+CATEGORIES = ["Поддержка", "Мотивация", "Отвлечение"]
+
+
+@dataclass
+class LegacyNote:
+    """Прежнее представление заметки (для сравнения)."""
+    id: str
+    text: str
+    category: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    is_favorite: bool = False
+
+
+def _records(count: int) -> List[dict]:
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "id": f"{i:08d}-0000-0000-0000-000000000000",
+            "text": f"Заметка номер {i}",
+            "category": CATEGORIES[i % 3],
+            "created_at": (start + timedelta(minutes=i)).isoformat(),
+            "updated_at": (start + timedelta(minutes=i, seconds=30)).isoformat() if i % 2 else None,
+            "is_favorite": i % 5 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def _legacy(data: dict) -> LegacyNote:
+    return LegacyNote(
+        id=data["id"],
+        text=data["text"],
+        category=data["category"],
+        created_at=datetime.fromisoformat(data["created_at"]),
+        updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+        is_favorite=data["is_favorite"],
+    )
+
+
+def measure(build: Callable[[], object], count: int) -> float:
+    """Возвращает число байт на заметку, выделенных при построении коллекции."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    collection = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del collection
+    return (after - before) / count
+
+
+def main(count: int = 100_000) -> None:
+    records = _records(count)
+    # Строки id и текста общие для всех вариантов, поэтому разница — в накладных расходах
+    results = {
+        "dataclass (до)": measure(lambda: [_legacy(r) for r in records], count),
+        "Note со __slots__": measure(lambda: [Note.from_dict(r) for r in records], count),
+        "NoteTable": measure(lambda: NoteTable(Note.from_dict(r) for r in records), count),
+    }
+    print(f"Заметок: {count}")
+    for name, per_note in results.items():
+        print(f"{name:<20} {per_note:8.1f} байт/заметку")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
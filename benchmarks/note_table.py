@@ -0,0 +1,61 @@
+"""Колоночное хранение большого количества заметок.
+
+Вместо списка объектов Note поля хранятся в параллельных массивах: даты
+в array('q'), признак избранного в bytearray. Используется только как
+образец для сравнения в замере памяти (note_memory): приложение хранит
+заметки объектами Note.
+"""
+
+import sys
+from array import array
+from typing import Iterable, Iterator, List
+
+from core.models.note import Note
+
+_NO_TIMESTAMP = -(2 ** 63)  # Отметка «нет даты изменения»
+
+
+class NoteTable:
+    """Набор заметок в виде структуры массивов."""
+
+    __slots__ = ('ids', 'texts', 'categories', 'created', 'updated', 'favorites')
+
+    def __init__(self, notes: Iterable[Note] = ()):
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.categories: List[str] = []
+        self.created = array('q')
+        self.updated = array('q')
+        self.favorites = bytearray()
+        self.extend(notes)
+
+    def append(self, note: Note) -> None:
+        self.ids.append(note.id)
+        self.texts.append(note.text)
+        self.categories.append(sys.intern(note.category))
+        self.created.append(note.created_ts)
+        self.updated.append(note.updated_ts if note.updated_ts is not None else _NO_TIMESTAMP)
+        self.favorites.append(1 if note.is_favorite else 0)
+
+    def extend(self, notes: Iterable[Note]) -> None:
+        for note in notes:
+            self.append(note)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Note:
+        """Собирает объект Note для одной строки."""
+        note = Note.__new__(Note)
+        note.id = self.ids[index]
+        note.text = self.texts[index]
+        note.category = self.categories[index]
+        note.created_ts = self.created[index]
+        updated = self.updated[index]
+        note.updated_ts = updated if updated != _NO_TIMESTAMP else None
+        note.is_favorite = bool(self.favorites[index])
+        return note
+
+    def __iter__(self) -> Iterator[Note]:
+        for index in range(len(self.ids)):
+            yield self[index]
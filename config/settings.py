@@ -1,13 +1,24 @@
 """Менеджер настроек приложения.
 
-Обеспечивает сохранение и загрузку пользовательских настроек.
+Обеспечивает сохранение и загрузку пользовательских настроек. Запись
+выполняет один долгоживущий поток: серия изменений объединяется в одну
+атомарную запись (временный файл и rename), поэтому set() дёшев даже при
+непрерывном изменении размеров окна.
+
+На отдельные ключи можно подписаться (subscribe): обработчик получает
+(key, old, new). Изменения, сделанные за один проход цикла событий,
+доставляются одним уведомлением на ключ.
 """
 
 from dataclasses import dataclass, asdict
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 import json
+import threading
 from pathlib import Path
 
+from core.utils.background_writer import BackgroundWriter, atomic_write_text
+from core.utils.metrics import timed
+
 
 @dataclass
 class AppSettings:
@@ -15,9 +26,16 @@ class AppSettings:
     theme: str = "light"                    # Тема оформления
     window_width: int = 900                 # Ширина окна
     window_height: int = 650                # Высота окна
-    animations_enabled: bool = False        # Отключены для производительности
+    animations_enabled: bool = True         # Анимации на общих часах кадров
     auto_save: bool = True                  # Автосохранение
     groq_api_key: str = ""                  # API ключ Groq для AI ассистента
+    notes_backend: str = "json"             # Хранилище заметок: "json" или "sqlite"
+    view_cache_size: int = 4                # Сколько экранов держать построенными
+    view_cache_max_widgets: int = 20000     # Предел виджетов в скрытых экранах
+    watchdog_enabled: bool = False          # Сторож зависаний цикла событий
+    watchdog_threshold_ms: int = 200        # Задержка, считающаяся зависанием
+    metrics_enabled: bool = False           # Сбор метрик горячих путей
+    font_scale: float = 1.0                 # Масштаб шрифтов интерфейса (0.75–2.0)
     
     def to_dict(self) -> Dict[str, Any]:
         """Преобразует настройки в словарь."""
@@ -31,15 +49,32 @@ class AppSettings:
         return cls(**valid_fields)
 
 
+SettingsCallback = Callable[[str, Any, Any], None]
+
+
 class SettingsManager:
     """Менеджер для управления настройками приложения."""
     
-    def __init__(self, config_file: str = "config/settings.json"):
-        """Инициализирует менеджер настроек."""
+    def __init__(self, config_file: str = "config/settings.json", save_delay: float = 0.5):
+        """Инициализирует менеджер настроек.
+        
+        Args:
+            config_file: Файл настроек
+            save_delay: Окно объединения изменений перед записью, в секундах
+        """
         self.config_file = Path(config_file)
         self.config_file.parent.mkdir(exist_ok=True)
         self.settings = AppSettings()
-        self._save_pending = False  # Оптимизация: отложенное сохранение
+        # Защищает settings от записи из фонового потока во время изменения
+        self._lock = threading.RLock()
+        # Общий поток записи на всё время работы вместо Timer на каждую серию изменений
+        self._writer = BackgroundWriter(self.save_settings, delay=save_delay, name="SettingsWriter",
+                                        error_message="Ошибка сохранения настроек")
+        self._subscribers: Dict[str, List[SettingsCallback]] = {}
+        # Изменения, ещё не доставленные подписчикам: ключ → (исходное, новое)
+        self._pending: Dict[str, Tuple[Any, Any]] = {}
+        self._dispatcher: Optional[Callable[[Callable[[], None]], Any]] = None
+        self._dispatch_scheduled = False
         self.load_settings()
     
     def load_settings(self) -> None:
@@ -55,13 +90,17 @@ class SettingsManager:
             print(f"Ошибка загрузки настроек: {e}")
             self.settings = AppSettings()
     
+    @timed("settings.save")
     def save_settings(self) -> None:
-        """Сохраняет настройки в файл."""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings.to_dict(), f, indent=2, ensure_ascii=False)
-        except (IOError, OSError) as e:
-            print(f"Ошибка сохранения настроек: {e}")
+        """Сохраняет настройки в файл (атомарно).
+
+        Ошибку записи не перехватывает: поток записи печатает её и
+        запоминает, чтобы flush() и force_save() вернули False.
+        """
+        # Снимок берётся под блокировкой, сериализация и запись идут без неё
+        with self._lock:
+            data = self.settings.to_dict()
+        atomic_write_text(self.config_file, json.dumps(data, indent=2, ensure_ascii=False))
     
     def get(self, key: str, default: Any = None) -> Any:
         """Получает значение настройки."""
@@ -70,34 +109,115 @@ class SettingsManager:
     def set(self, key: str, value: Any) -> None:
         """Оптимизированное установка значения настройки."""
         if hasattr(self.settings, key):
-            old_value = getattr(self.settings, key)
-            if old_value != value:  # Сохраняем только при изменении
+            with self._lock:
+                old_value = getattr(self.settings, key)
+                if old_value == value:  # Сохраняем только при изменении
+                    return
                 setattr(self.settings, key, value)
-                self._delayed_save()
+                self._queue_change(key, old_value, value)
+            self._delayed_save()
+            self._schedule_dispatch()
         else:
             print(f"Неизвестная настройка: {key}")
     
+    def subscribe(self, keys: Union[str, Iterable[str]], callback: SettingsCallback) -> Callable[[], None]:
+        """Подписывает callback(key, old, new) на изменения ключей.
+        
+        Args:
+            keys: Ключ или несколько ключей
+            callback: Вызывается один раз за проход цикла событий на ключ,
+                если значение в итоге изменилось
+        
+        Returns:
+            Функция отписки
+        """
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        for key in keys:
+            if not hasattr(self.settings, key):
+                raise KeyError(f"Неизвестная настройка: {key}")
+            self._subscribers.setdefault(key, []).append(callback)
+        
+        def unsubscribe() -> None:
+            for key in keys:
+                self.unsubscribe(key, callback)
+        return unsubscribe
+    
+    def unsubscribe(self, key: str, callback: SettingsCallback) -> None:
+        callbacks = self._subscribers.get(key)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+    
+    def set_dispatcher(self, schedule: Optional[Callable[[Callable[[], None]], Any]]) -> None:
+        """Задаёт отложенную доставку уведомлений (например, root.after_idle).
+        
+        Без диспетчера подписчики уведомляются сразу внутри set().
+        """
+        self._dispatcher = schedule
+    
+    def dispatch_pending(self) -> None:
+        """Доставляет накопленные изменения подписчикам."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._dispatch_scheduled = False
+        for key, (old, new) in pending.items():
+            for callback in list(self._subscribers.get(key, ())):
+                try:
+                    callback(key, old, new)
+                except Exception as e:
+                    print(f"Ошибка в обработчике настройки {key}: {e}")
+    
+    def _queue_change(self, key: str, old: Any, new: Any) -> None:
+        # Вызывается под блокировкой; старым остаётся значение до первого set за проход
+        if key not in self._subscribers or not self._subscribers[key]:
+            return
+        if key in self._pending:
+            old = self._pending[key][0]
+            if old == new:
+                # Значение вернулось к исходному: уведомлять не о чем
+                del self._pending[key]
+                return
+        self._pending[key] = (old, new)
+    
+    def _schedule_dispatch(self) -> None:
+        with self._lock:
+            if not self._pending or self._dispatch_scheduled:
+                return
+            if self._dispatcher is not None:
+                self._dispatch_scheduled = True
+        if self._dispatcher is None:
+            self.dispatch_pending()
+        else:
+            self._dispatcher(self.dispatch_pending)
+    
     def _delayed_save(self) -> None:
-        """Отложенное сохранение для производительности."""
-        if not self._save_pending:
-            self._save_pending = True
-            # Отлагаем сохранение на 500мс для батчинга
-            import threading
-            threading.Timer(0.5, self._perform_save).start()
-    
-    def _perform_save(self) -> None:
-        """Выполняет фактическое сохранение."""
-        self._save_pending = False
-        self.save_settings()
+        """Отложенное сохранение: поток записи объединит серию изменений."""
+        self._writer.mark_dirty()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Дожидается записи накопленных изменений.
+        
+        Returns:
+            True, если всё записано без ошибок за timeout
+        """
+        return self._writer.flush(timeout)
+    
+    def get_write_stats(self) -> Dict[str, object]:
+        """Статистика записи настроек: число записей, задержка, очередь."""
+        return self._writer.stats()
     
     def reset_to_defaults(self) -> None:
         """Сбрасывает настройки к значениям по умолчанию."""
-        self.settings = AppSettings()
-        self.save_settings()
+        defaults = AppSettings()
+        with self._lock:
+            for key, value in defaults.to_dict().items():
+                old_value = getattr(self.settings, key)
+                if old_value != value:
+                    setattr(self.settings, key, value)
+                    self._queue_change(key, old_value, value)
+        self.force_save()
+        self._schedule_dispatch()
     
-    def force_save(self) -> None:
+    def force_save(self, timeout: Optional[float] = 5.0) -> bool:
         """Принудительное сохранение (например, при выходе)."""
-        if self._save_pending:
-            self._perform_save()
-        else:
-            self.save_settings()
\ No newline at end of file
+        self._writer.mark_dirty()
+        return self._writer.flush(timeout)
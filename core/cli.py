@@ -0,0 +1,271 @@
+"""Командная строка для заметок без графического интерфейса.
+
+    python -m core.cli add "Дыши глубже" --category Поддержка
+    python -m core.cli list --favorites --format jsonl
+    python -m core.cli search дыхание
+    python -m core.cli favorite <id>
+    python -m core.cli delete <id>
+    python -m core.cli import notes.jsonl      # или "-" для stdin
+    python -m core.cli export -o backup.jsonl
+
+Модуль использует только core и config и никогда не импортирует tkinter
+или customtkinter, поэтому пакетные операции запускаются за десятки
+миллисекунд. Импорт и экспорт потоковые: записи читаются и пишутся по
+одной, в памяти держится только пачка импортируемых заметок.
+"""
+
+import argparse
+import json
+import sys
+import uuid
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from core.models.note import Note
+from core.services.note_loader import iter_json_array
+from core.services.note_query import SORT_KEYS, NoteQuery
+
+DEFAULT_CATEGORY = "Поддержка"
+IMPORT_BATCH = 1000
+TEXT_PREVIEW = 80
+
+
+def open_service(backend: str, path: Optional[str] = None):
+    """Создаёт хранилище заметок без общего экземпляра интерфейса.
+
+    Отдельная база (path) не переносит в себя data/notes.json приложения:
+    миграция из JSON выполняется только для базы по умолчанию.
+    """
+    if backend == "sqlite":
+        from core.services.sqlite_note_service import SqliteNoteService
+        return SqliteNoteService(path, json_file=None) if path else SqliteNoteService()
+    from core.services.note_service import NoteService
+    return NoteService(path) if path else NoteService()
+
+
+def record_to_note(record: dict) -> Note:
+    """Запись импорта → заметка.
+
+    Полная запись (как в notes.json) сохраняет id и даты; для короткой
+    {"text": ..., "category": ...} создаётся новая заметка.
+    """
+    if not isinstance(record, dict):
+        raise TypeError("ожидался объект JSON")
+    if 'id' in record and 'created_at' in record:
+        return Note.from_dict(record)
+    text = record['text']
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("пустой текст")
+    created_at = record.get('created_at')
+    return Note(
+        id=str(uuid.uuid4()),
+        text=text,
+        category=record.get('category') or DEFAULT_CATEGORY,
+        created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+        is_favorite=bool(record.get('is_favorite', False))
+    )
+
+
+def iter_batches(items: Iterable[Note], size: int) -> Iterator[List[Note]]:
+    batch: List[Note] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_stream(service, f: TextIO, batch_size: int = IMPORT_BATCH,
+                  errors: Optional[TextIO] = None) -> tuple:
+    """Импортирует JSON Lines или JSON-массив заметок из потока.
+
+    Returns:
+        (импортировано, пропущено)
+    """
+    skipped = 0
+
+    def notes() -> Iterator[Note]:
+        nonlocal skipped
+        for number, (value, raw) in enumerate(iter_json_array(f), 1):
+            try:
+                if raw is not None:
+                    raise ValueError("некорректный JSON")
+                yield record_to_note(value)
+            except (KeyError, TypeError, ValueError) as e:
+                skipped += 1
+                if errors is not None:
+                    print(f"Запись {number} пропущена: {e}", file=errors)
+
+    imported = 0
+    for batch in iter_batches(notes(), batch_size):
+        imported += service.insert_notes(batch)
+    return imported, skipped
+
+
+def format_note(note: Note) -> str:
+    text = " ".join(note.text.split())
+    if len(text) > TEXT_PREVIEW:
+        text = text[:TEXT_PREVIEW - 1] + "…"
+    star = "★" if note.is_favorite else " "
+    return f"{note.id}  {star} {note.created_at:%Y-%m-%d %H:%M}  [{note.category}]  {text}"
+
+
+def write_notes(notes: Iterable[Note], out: TextIO, fmt: str) -> int:
+    count = 0
+    for note in notes:
+        if fmt == "jsonl":
+            out.write(json.dumps(note.to_dict(), ensure_ascii=False))
+            out.write("\n")
+        else:
+            out.write(format_note(note) + "\n")
+        count += 1
+    return count
+
+
+def build_query(args) -> NoteQuery:
+    favorite = True if args.favorites else None
+    return NoteQuery(category=args.category, favorite=favorite,
+                     sort=args.sort, descending=not args.asc)
+
+
+def cmd_add(service, args, out: TextIO) -> int:
+    note = service.add_note(args.text, args.category)
+    if args.favorite:
+        service.toggle_favorite(note.id)
+    out.write(note.id + "\n")
+    return 0
+
+
+def cmd_list(service, args, out: TextIO) -> int:
+    notes = service.iter_notes(build_query(args))
+    if args.limit:
+        notes = (note for _, note in zip(range(args.limit), notes))
+    write_notes(notes, out, args.format)
+    return 0
+
+
+def cmd_search(service, args, out: TextIO) -> int:
+    if args.fuzzy:
+        service.prepare_fuzzy_search(wait=True)
+    search = service.fuzzy_search if args.fuzzy else service.search
+    results = search(args.query, category=args.category, limit=args.limit)
+    write_notes((result.note for result in results), out, args.format)
+    return 0 if results else 1
+
+
+def cmd_favorite(service, args, out: TextIO) -> int:
+    if not service.toggle_favorite(args.id):
+        print(f"Заметка не найдена: {args.id}", file=sys.stderr)
+        return 1
+    note = service.get_note(args.id)
+    out.write(("★ в избранном" if note.is_favorite else "убрана из избранного") + "\n")
+    return 0
+
+
+def cmd_delete(service, args, out: TextIO) -> int:
+    if not service.delete_note(args.id):
+        print(f"Заметка не найдена: {args.id}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def cmd_import(service, args, out: TextIO) -> int:
+    if args.file == "-":
+        imported, skipped = import_stream(service, sys.stdin, args.batch, sys.stderr)
+    else:
+        with open(args.file, "r", encoding="utf-8") as f:
+            imported, skipped = import_stream(service, f, args.batch, sys.stderr)
+    out.write(f"Импортировано: {imported}, пропущено: {skipped}\n")
+    return 0 if not skipped else 1
+
+
+def cmd_export(service, args, out: TextIO) -> int:
+    notes = service.iter_notes(build_query(args))
+    if args.output and args.output != "-":
+        with open(args.output, "w", encoding="utf-8") as f:
+            count = write_notes(notes, f, "jsonl")
+        print(f"Экспортировано: {count}", file=sys.stderr)
+    else:
+        write_notes(notes, out, "jsonl")
+    return 0
+
+
+def _add_query_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--category", help="только эта категория")
+    parser.add_argument("--favorites", action="store_true", help="только избранные")
+    parser.add_argument("--sort", choices=SORT_KEYS, default=SORT_KEYS[0], help="порядок")
+    parser.add_argument("--asc", action="store_true", help="от старых к новым")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m core.cli", description="Заметки Relieve Stress")
+    parser.add_argument("--backend", choices=("json", "sqlite"),
+                        help="хранилище (по умолчанию из config/settings.json)")
+    parser.add_argument("--data", help="файл заметок (notes.json или notes.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="добавить заметку")
+    add.add_argument("text")
+    add.add_argument("--category", default=DEFAULT_CATEGORY)
+    add.add_argument("--favorite", action="store_true")
+    add.set_defaults(handler=cmd_add)
+
+    list_ = commands.add_parser("list", help="показать заметки")
+    _add_query_options(list_)
+    list_.add_argument("--limit", type=int, default=0, help="не больше N (0 — все)")
+    list_.add_argument("--format", choices=("text", "jsonl"), default="text")
+    list_.set_defaults(handler=cmd_list)
+
+    search = commands.add_parser("search", help="полнотекстовый поиск")
+    search.add_argument("query")
+    search.add_argument("--category")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--fuzzy", action="store_true", help="нечёткий поиск по триграммам")
+    search.add_argument("--format", choices=("text", "jsonl"), default="text")
+    search.set_defaults(handler=cmd_search)
+
+    favorite = commands.add_parser("favorite", help="переключить избранное")
+    favorite.add_argument("id")
+    favorite.set_defaults(handler=cmd_favorite)
+
+    delete = commands.add_parser("delete", help="удалить заметку")
+    delete.add_argument("id")
+    delete.set_defaults(handler=cmd_delete)
+
+    import_ = commands.add_parser("import", help="импорт из JSON Lines или JSON-массива")
+    import_.add_argument("file", help='файл или "-" для stdin')
+    import_.add_argument("--batch", type=int, default=IMPORT_BATCH, help="заметок в одной пачке")
+    import_.set_defaults(handler=cmd_import)
+
+    export = commands.add_parser("export", help="экспорт в JSON Lines")
+    _add_query_options(export)
+    export.add_argument("-o", "--output", help='файл или "-" для stdout')
+    export.set_defaults(handler=cmd_export)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, out: Optional[TextIO] = None) -> int:
+    args = build_parser().parse_args(argv)
+    out = out or sys.stdout
+    backend = args.backend
+    if backend is None:
+        from config.settings import SettingsManager
+        backend = SettingsManager().get('notes_backend', 'json')
+    service = open_service(backend, args.data)
+    try:
+        return args.handler(service, args, out)
+    except BrokenPipeError:
+        # Вывод оборван (например, | head): это не ошибка
+        return 0
+    finally:
+        # Изменения должны оказаться на диске до выхода процесса
+        service.flush(timeout=30.0)
+        close = getattr(service, 'close', None)
+        if close is not None:
+            close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
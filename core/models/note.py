@@ -1,16 +1,81 @@
-from dataclasses import dataclass
+import sys
+from datetime import datetime, timedelta
 from typing import Optional
-from datetime import datetime
 
-@dataclass
+# Отметки времени хранятся целым числом микросекунд от этой даты: без
+# перевода через часовой пояс, поэтому преобразование туда и обратно точное.
+# Даты заметок — локальное время без tzinfo; даты с часовым поясом
+# отвергаются, иначе to_dict вернул бы не то, что получил from_dict
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_ts(value: datetime) -> int:
+    if value.tzinfo is not None:
+        raise ValueError(f"Дата с часовым поясом не поддерживается: {value.isoformat()}")
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def ts_to_datetime(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
 class Note:
-    id: str
-    text: str
-    category: str
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-    is_favorite: bool = False
-    
+    """Заметка в компактном представлении.
+
+    Вместо __dict__ используются __slots__, категория интернируется, а
+    даты хранятся целыми числами и превращаются в datetime только при
+    обращении к created_at/updated_at.
+    """
+    __slots__ = ('id', 'text', '_category', 'created_ts', 'updated_ts', 'is_favorite')
+
+    def __init__(self, id: str, text: str, category: str, created_at: datetime,
+                 updated_at: Optional[datetime] = None, is_favorite: bool = False):
+        self.id = id
+        self.text = text
+        self.category = category
+        self.created_ts = datetime_to_ts(created_at)
+        self.updated_ts = datetime_to_ts(updated_at) if updated_at else None
+        self.is_favorite = is_favorite
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @category.setter
+    def category(self, value: str) -> None:
+        # Категорий мало, а заметок много: все экземпляры делят одну строку
+        self._category = sys.intern(value)
+
+    @property
+    def created_at(self) -> datetime:
+        return ts_to_datetime(self.created_ts)
+
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self.created_ts = datetime_to_ts(value)
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        return ts_to_datetime(self.updated_ts) if self.updated_ts is not None else None
+
+    @updated_at.setter
+    def updated_at(self, value: Optional[datetime]) -> None:
+        self.updated_ts = datetime_to_ts(value) if value else None
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Note):
+            return NotImplemented
+        return (self.id, self.text, self._category, self.created_ts, self.updated_ts, self.is_favorite) == \
+               (other.id, other.text, other._category, other.created_ts, other.updated_ts, other.is_favorite)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"Note(id={self.id!r}, text={self.text!r}, category={self.category!r}, "
+                f"created_at={self.created_at!r}, updated_at={self.updated_at!r}, "
+                f"is_favorite={self.is_favorite!r})")
+
     def to_dict(self) -> dict:
         return {
             'id': self.id,
@@ -20,7 +85,7 @@ class Note:
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'is_favorite': self.is_favorite
         }
-    
+
     @classmethod
     def from_dict(cls, data: dict) -> 'Note':
         return cls(
@@ -30,4 +95,4 @@ class Note:
             created_at=datetime.fromisoformat(data['created_at']),
             updated_at=datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else None,
             is_favorite=data.get('is_favorite', False)
-        )
\ No newline at end of file
+        )
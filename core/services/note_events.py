@@ -0,0 +1,54 @@
+"""Уведомления об изменениях заметок.
+
+Хранилища заметок сообщают подписчикам, какие заметки были добавлены,
+удалены или изменены, чтобы представления обновлялись по дельтам, а не
+перечитывали все данные.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+from core.utils.metrics import timed
+
+
+@dataclass(frozen=True)
+class NoteChange:
+    """Описание одного изменения набора заметок."""
+    added: Tuple[str, ...] = ()      # id добавленных заметок
+    removed: Tuple[str, ...] = ()    # id удалённых заметок
+    updated: Tuple[str, ...] = ()    # id изменённых заметок
+    reset: bool = False              # Данные полностью перечитаны
+
+    @property
+    def ids(self) -> Tuple[str, ...]:
+        """Все затронутые id."""
+        return self.added + self.removed + self.updated
+
+
+NoteListener = Callable[[NoteChange], None]
+
+
+class NoteChangeNotifier:
+    """Примесь с API подписки на изменения заметок."""
+
+    def _init_listeners(self) -> None:
+        self._listeners: List[NoteListener] = []
+
+    def subscribe(self, callback: NoteListener) -> None:
+        """Подписывает обработчик на изменения."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback: NoteListener) -> None:
+        """Отписывает обработчик."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @timed("notes.notify")
+    def _emit(self, change: NoteChange) -> None:
+        """Уведомляет подписчиков об изменении."""
+        for callback in list(self._listeners):
+            try:
+                callback(change)
+            except Exception as e:
+                print(f"Ошибка в обработчике изменений заметок: {e}")
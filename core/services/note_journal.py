@@ -0,0 +1,94 @@
+"""Журнал операций над заметками.
+
+Каждая операция (add/update/delete/favorite) дописывается в конец файла
+одной компактной JSON-строкой, поэтому стоимость записи не зависит от
+количества заметок. Полный снимок хранится отдельно и периодически
+пересобирается сервисом заметок (компактизация). На время записи снимка
+журнал переименовывается в ``*.old`` и удаляется только после того, как
+снимок оказался на диске.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+
+class NoteJournal:
+    """Append-only журнал операций в формате JSON Lines."""
+
+    def __init__(self, path: Path, fsync: bool = False):
+        """Инициализирует журнал.
+
+        Args:
+            path: Путь к файлу журнала
+            fsync: Вызывать fsync после каждой записи (надёжнее, но медленнее)
+        """
+        self.path = Path(path)
+        self.rotated_path = self.path.with_suffix(self.path.suffix + '.old')
+        self.fsync = fsync
+        self.records = 0  # Количество записей с момента последнего снимка
+        self._file: Optional[TextIO] = None
+
+    def append(self, op: str, **fields: Any) -> None:
+        """Дописывает одну операцию в журнал."""
+        record = {"op": op, **fields}
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(line + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.records += 1
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """Последовательно возвращает записи журнала.
+
+        Сначала читается журнал, оставшийся от незавершённого снимка.
+        Оборванная последняя строка (сбой во время записи) пропускается.
+        """
+        self.records = 0
+        for path in (self.rotated_path, self.path):
+            if not path.exists():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(record, dict) and "op" in record:
+                        self.records += 1
+                        yield record
+
+    def rotate(self) -> None:
+        """Откладывает текущий журнал в сторону перед записью снимка.
+
+        Новые операции пишутся в чистый файл. Если предыдущий снимок не
+        удался, текущие записи дописываются к уже отложенному журналу.
+        """
+        self.close()
+        if self.path.exists():
+            if self.rotated_path.exists():
+                with open(self.path, "r", encoding="utf-8") as src, \
+                        open(self.rotated_path, "a", encoding="utf-8") as dst:
+                    dst.write(src.read())
+                self.path.unlink()
+            else:
+                os.replace(self.path, self.rotated_path)
+        self.records = 0
+
+    def discard_rotated(self) -> None:
+        """Удаляет отложенный журнал после успешной записи снимка."""
+        if self.rotated_path.exists():
+            self.rotated_path.unlink()
+
+    def close(self) -> None:
+        """Закрывает файл журнала."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
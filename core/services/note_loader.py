@@ -0,0 +1,176 @@
+"""Потоковая загрузка файла заметок.
+
+Файл читается блоками, записи массива разбираются по одной, поэтому
+память ограничена размером блока и одной записи. Повреждённые записи не
+обнуляют всю коллекцию, а пропускаются и сохраняются в отдельный файл.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Set, TextIO, Tuple
+
+from core.models.note import Note
+
+_SEPARATORS = " \t\r\n,"
+_CHUNK_SIZE = 64 * 1024
+_MAX_RECORD_SIZE = 1024 * 1024  # Больше этого запись считается повреждённой
+
+
+@dataclass
+class LoadReport:
+    """Результат загрузки заметок."""
+    load_ms: float = 0.0          # Время загрузки
+    records: int = 0              # Загружено записей из снимка
+    rejected: int = 0             # Отброшено повреждённых записей
+    journal_records: int = 0      # Применено записей журнала
+    errors: List[str] = field(default_factory=list)
+
+
+def iter_json_array(f: TextIO, chunk_size: int = _CHUNK_SIZE) -> Iterator[Tuple[Any, Optional[str]]]:
+    """Последовательно разбирает элементы JSON-массива.
+
+    Yields:
+        (значение, None) для корректного элемента или (None, исходный текст)
+        для фрагмента, который не удалось разобрать
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        # Буфер растёт геометрически, чтобы длинная запись не копировалась много раз
+        chunk = f.read(max(chunk_size, len(buf) - pos))
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    while True:
+        while pos < len(buf) and buf[pos] in _SEPARATORS:
+            pos += 1
+        if pos >= len(buf):
+            if fill():
+                continue
+            return
+
+        char = buf[pos]
+        if char == "[" and not started:
+            started = True
+            pos += 1
+            continue
+        if char == "]":
+            return
+
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # Запись может быть просто не дочитана: для незакрытой строки
+            # ошибка указывает на её начало и не сдвигается после догрузки,
+            # поэтому дочитываем, пока запись не превысит предел или файл
+            # не кончится, и только тогда считаем её повреждённой
+            if len(buf) - pos < _MAX_RECORD_SIZE and fill():
+                continue
+            # Запись повреждена: пропускаем до начала следующей
+            next_start = buf.find("{", pos + 1)
+            while next_start == -1 and not eof and len(buf) - pos < _MAX_RECORD_SIZE and fill():
+                next_start = buf.find("{", pos + 1)
+            end = next_start if next_start != -1 else len(buf)
+            yield None, buf[pos:end]
+            pos = end
+            continue
+
+        started = True
+        yield value, None
+        pos = end
+
+
+def load_notes_file(path: Path, on_note: Callable[[Note], None],
+                    quarantine_path: Optional[Path] = None) -> LoadReport:
+    """Загружает заметки из JSON-файла, передавая их по одной в on_note.
+
+    Args:
+        path: Файл заметок
+        on_note: Обработчик каждой корректной заметки
+        quarantine_path: Файл для повреждённых записей (JSON Lines)
+    """
+    report = LoadReport()
+    started = time.perf_counter()
+    rejected = []
+
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for value, raw in iter_json_array(f):
+                    if raw is not None:
+                        rejected.append({"error": "invalid JSON", "raw": raw.strip()})
+                        continue
+                    try:
+                        note = Note.from_dict(value)
+                    except (KeyError, TypeError, ValueError, AttributeError) as e:
+                        rejected.append({"error": f"{type(e).__name__}: {e}", "record": value})
+                        continue
+                    on_note(note)
+                    report.records += 1
+        except (OSError, UnicodeDecodeError) as e:
+            report.errors.append(str(e))
+
+    report.rejected = len(rejected)
+    if rejected and quarantine_path is not None:
+        _quarantine(quarantine_path, rejected)
+    report.load_ms = (time.perf_counter() - started) * 1000
+    return report
+
+
+def _digest(entry: dict) -> str:
+    """Отпечаток отброшенной записи: одинаков при каждой загрузке того же файла."""
+    content = entry["raw"] if "raw" in entry else json.dumps(entry["record"], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def _quarantined_digests(path: Path) -> Set[str]:
+    digests = set()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    digest = json.loads(line).get("digest")
+                except (ValueError, AttributeError):
+                    continue
+                if digest:
+                    digests.add(digest)
+    except FileNotFoundError:
+        pass
+    return digests
+
+
+def _quarantine(path: Path, entries: List[dict]) -> None:
+    """Дописывает отброшенные записи в файл карантина.
+
+    Пока файл заметок не перезаписан, те же повреждённые записи находятся
+    при каждой загрузке; уже сохранённые (по отпечатку) не дописываются.
+    """
+    rejected_at = datetime.now().isoformat()
+    try:
+        known = _quarantined_digests(path)
+        with open(path, "a", encoding="utf-8") as f:
+            for entry in entries:
+                digest = _digest(entry)
+                if digest in known:
+                    continue
+                known.add(digest)
+                entry["digest"] = digest
+                entry["rejected_at"] = rejected_at
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Ошибка сохранения повреждённых заметок: {e}")
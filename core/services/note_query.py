@@ -0,0 +1,98 @@
+"""Постраничные выборки заметок.
+
+Запрос описывает фильтры и порядок сортировки, а результат возвращается
+страницами. Следующая страница запрашивается по курсору — ключу
+сортировки последней заметки, поэтому добавление и удаление заметок
+между запросами не сдвигает страницы, как это происходит со смещением.
+"""
+
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from core.models.note import Note, datetime_to_ts
+
+SORT_CREATED = "created_at"
+SORT_UPDATED = "updated_at"
+SORT_FAVORITES = "favorites"  # Сначала избранные, внутри групп — по дате создания
+SORT_KEYS = (SORT_CREATED, SORT_UPDATED, SORT_FAVORITES)
+
+
+@dataclass(frozen=True)
+class NoteQuery:
+    """Фильтры и порядок выборки заметок."""
+    category: Optional[str] = None
+    favorite: Optional[bool] = None         # True/False — только (не)избранные
+    created_from: Optional[datetime] = None  # Включительно
+    created_to: Optional[datetime] = None    # Не включительно
+    sort: str = SORT_CREATED
+    descending: bool = False
+
+    def __post_init__(self):
+        if self.sort not in SORT_KEYS:
+            raise ValueError(f"Неизвестный порядок сортировки: {self.sort!r}")
+
+    def matches(self) -> Callable[[Note], bool]:
+        """Возвращает проверку заметки на соответствие фильтрам (кроме категории)."""
+        favorite = self.favorite
+        start = datetime_to_ts(self.created_from) if self.created_from else None
+        end = datetime_to_ts(self.created_to) if self.created_to else None
+
+        def check(note: Note) -> bool:
+            if favorite is not None and note.is_favorite != favorite:
+                return False
+            if start is not None and note.created_ts < start:
+                return False
+            if end is not None and note.created_ts >= end:
+                return False
+            return True
+
+        return check
+
+    def sort_key(self) -> Callable[[Note], Tuple]:
+        """Ключ сортировки, общий для упорядочивания и курсоров.
+
+        Ключ всегда сравнивается по возрастанию: убывание достигается
+        сменой знака у даты, а id в конце делает порядок однозначным.
+        """
+        sign = -1 if self.descending else 1
+        if self.sort == SORT_UPDATED:
+            return lambda note: (sign * (note.updated_ts if note.updated_ts is not None
+                                         else note.created_ts), note.id)
+        if self.sort == SORT_FAVORITES:
+            return lambda note: (0 if note.is_favorite else 1, sign * note.created_ts, note.id)
+        return lambda note: (sign * note.created_ts, note.id)
+
+
+@dataclass
+class NotePage:
+    """Одна страница выборки."""
+    notes: List[Note] = field(default_factory=list)
+    next_cursor: Optional[str] = None  # None — страница последняя
+
+    def __iter__(self) -> Iterator[Note]:
+        return iter(self.notes)
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(key: Tuple) -> str:
+    """Упаковывает ключ сортировки в непрозрачную для вызывающего строку."""
+    return json.dumps(list(key), ensure_ascii=False, separators=(',', ':'))
+
+
+def decode_cursor(cursor: str) -> Tuple:
+    """Распаковывает курсор; некорректный курсор вызывает ValueError."""
+    try:
+        key = json.loads(cursor)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Некорректный курсор: {cursor!r}") from e
+    if not isinstance(key, list):
+        raise ValueError(f"Некорректный курсор: {cursor!r}")
+    return tuple(key)
@@ -0,0 +1,37 @@
+"""Общий для всего процесса экземпляр хранилища заметок.
+
+Представления получают хранилище через конструктор; этот модуль создаёт
+его один раз, чтобы переходы между экранами не перечитывали файл заметок.
+"""
+
+from typing import Optional, Union
+
+from core.services.note_service import NoteService
+from core.services.sqlite_note_service import SqliteNoteService
+
+NoteRepository = Union[NoteService, SqliteNoteService]
+
+_repository: Optional[NoteRepository] = None
+
+
+def get_note_service(backend: str = "json") -> NoteRepository:
+    """Возвращает общий экземпляр хранилища, создавая его при первом вызове.
+
+    Args:
+        backend: "json" (журнал + снимок) или "sqlite"
+    """
+    global _repository
+    if _repository is None:
+        if backend == "sqlite":
+            _repository = SqliteNoteService()
+        else:
+            if backend != "json":
+                print(f"Неизвестное хранилище заметок: {backend}, используется json")
+            _repository = NoteService()
+    return _repository
+
+
+def set_note_service(repository: Optional[NoteRepository]) -> None:
+    """Подменяет общий экземпляр (например, в скриптах или при смене хранилища)."""
+    global _repository
+    _repository = repository
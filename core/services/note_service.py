@@ -1,30 +1,173 @@
+import bisect
+import heapq
 import json
+import threading
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 from core.models.note import Note
+from core.services.note_journal import NoteJournal
+from core.services.note_events import NoteChange, NoteChangeNotifier
+from core.services.note_loader import LoadReport, load_notes_file
+from core.services.note_query import NotePage, NoteQuery, decode_cursor, encode_cursor
+from core.services.search_index import SearchIndex, SearchResult
+from core.services.trigram_index import BackgroundTrigramIndex
+from core.utils.background_writer import BackgroundWriter, atomic_write_text
+from core.utils.metrics import timed
 
-class NoteService:
-    def __init__(self, data_file: str = "data/notes.json"):
+class NoteService(NoteChangeNotifier):
+    # После стольких записей в журнале делается снимок и журнал очищается
+    COMPACT_THRESHOLD = 1000
+    # Лимит памяти триграммного индекса (суммарное число вхождений)
+    FUZZY_MAX_POSTINGS = 2_000_000
+    # Сколько отсортированных выборок держать для постраничного просмотра
+    QUERY_CACHE_SIZE = 4
+
+    def __init__(self, data_file: str = "data/notes.json", journal: bool = True,
+                 write_delay: float = 0.5):
         self.data_file = Path(data_file)
         self.data_file.parent.mkdir(exist_ok=True)
-        self._notes: List[Note] = []
+        self._init_listeners()
+        # Защищает данные и журнал от одновременного доступа потока записи
+        self._lock = threading.RLock()
+        # Снимок пишется в фоне; серия изменений за write_delay объединяется в одну запись
+        self._writer = BackgroundWriter(self._write_snapshot, delay=write_delay, name="NoteWriter",
+                                        error_message="Ошибка сохранения заметок")
+        # Первичный индекс по id (порядок вставки сохраняется) и вторичный по категориям
+        self._notes: Dict[str, Note] = {}
+        self._by_category: Dict[str, Dict[str, Note]] = {}
+        self._search: Optional[SearchIndex] = None
+        self._fuzzy: Optional[BackgroundTrigramIndex] = None
+        # Отсортированные выборки (ключи и заметки) для листания по курсору;
+        # сбрасываются при любом изменении
+        self._query_cache: Dict[NoteQuery, Tuple[List[tuple], List[Note]]] = {}
+        # Журнал операций: каждая мутация дописывает одну строку вместо перезаписи файла
+        self._journal = NoteJournal(self.data_file.with_suffix('.journal')) if journal else None
+        # Повреждённые записи не теряются, а откладываются в отдельный файл
+        self.quarantine_file = self.data_file.with_suffix('.rejected.jsonl')
+        self.last_load_report = LoadReport()
         self.load_notes()
-    
+
+    @timed("notes.load_notes")
     def load_notes(self) -> None:
-        if self.data_file.exists():
-            try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self._notes = [Note.from_dict(note_data) for note_data in data]
-            except (json.JSONDecodeError, KeyError):
-                self._notes = []
-    
+        with self._lock:
+            self._clear()
+            # Потоковый разбор: записи читаются по одной, битые откладываются в карантин
+            report = load_notes_file(self.data_file, self._index, self.quarantine_file)
+
+            if self._journal is not None:
+                self._journal.close()
+                for record in self._journal.replay():
+                    self._apply(record)
+                report.journal_records = self._journal.records
+                if self._journal.records >= self.COMPACT_THRESHOLD:
+                    self.compact()
+            self.last_load_report = report
+        if report.rejected:
+            print(f"Пропущено повреждённых заметок: {report.rejected} (см. {self.quarantine_file})")
+        self._emit(NoteChange(reset=True))
+
     def save_notes(self) -> None:
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump([note.to_dict() for note in self._notes], f, ensure_ascii=False, indent=2)
-    
+        # Запись выполняется в фоновом потоке, см. flush()
+        self._writer.mark_dirty()
+
+    def compact(self) -> None:
+        """Планирует запись полного снимка с последующей очисткой журнала."""
+        self.save_notes()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Дожидается записи всех изменений на диск (например, при выходе)."""
+        return self._writer.flush(timeout)
+
+    def get_write_stats(self) -> Dict[str, object]:
+        """Статистика фоновой записи: число записей, задержка, глубина очереди."""
+        return self._writer.stats()
+
+    def _emit(self, change: NoteChange) -> None:
+        # Любое изменение может сдвинуть заметку в отсортированной выборке
+        self._query_cache = {}
+        super()._emit(change)
+
+    @timed("notes.write_snapshot")
+    def _write_snapshot(self) -> None:
+        # Вызывается из потока записи: данные копируются под блокировкой,
+        # сериализация и запись на диск идут без неё
+        with self._lock:
+            payload = [note.to_dict() for note in self._notes.values()]
+            if self._journal is not None:
+                self._journal.rotate()
+        atomic_write_text(self.data_file, json.dumps(payload, ensure_ascii=False, indent=2))
+        if self._journal is not None:
+            self._journal.discard_rotated()
+
+    def _persist(self, op: str, **fields) -> None:
+        if self._journal is None:
+            self.save_notes()
+            return
+        self._journal.append(op, **fields)
+        if self._journal.records >= self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def _apply(self, record: dict) -> None:
+        # Операции идемпотентны: повторное применение после снимка ничего не ломает
+        op = record.get('op')
+        try:
+            if op == 'add':
+                note = Note.from_dict(record['note'])
+                self._unindex(note.id)
+                self._index(note)
+            elif op == 'delete':
+                self._unindex(record['id'])
+            elif op in ('update', 'favorite'):
+                note = self._notes.get(record['id'])
+                if note is None:
+                    return
+                if op == 'update':
+                    self._set_text(note, record['text'])
+                else:
+                    note.is_favorite = record['value']
+                note.updated_at = datetime.fromisoformat(record['updated_at'])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    def _clear(self) -> None:
+        self._notes = {}
+        self._by_category = {}
+        # Поисковый индекс строится при первом поиске, триграммный — в фоне
+        # (prepare_fuzzy_search); затем оба обновляются вместе с данными
+        self._search = None
+        self._fuzzy = None
+
+    def _index(self, note: Note) -> None:
+        self._notes[note.id] = note
+        self._by_category.setdefault(note.category, {})[note.id] = note
+        for index in self._text_indexes():
+            index.add(note)
+
+    def _text_indexes(self) -> list:
+        return [index for index in (self._search, self._fuzzy) if index is not None]
+
+    def _set_text(self, note: Note, text: str) -> None:
+        note.text = text
+        for index in self._text_indexes():
+            index.update(note)
+
+    def _unindex(self, note_id: str) -> Optional[Note]:
+        note = self._notes.pop(note_id, None)
+        if note is None:
+            return None
+        for index in self._text_indexes():
+            index.remove(note_id)
+        bucket = self._by_category.get(note.category)
+        if bucket is not None:
+            bucket.pop(note_id, None)
+            if not bucket:
+                # Пустые категории не показываются в списке
+                del self._by_category[note.category]
+        return note
+
+    @timed("notes.add_note")
     def add_note(self, text: str, category: str) -> Note:
         note = Note(
             id=str(uuid.uuid4()),
@@ -32,31 +175,186 @@ class NoteService:
             category=category,
             created_at=datetime.now()
         )
-        self._notes.append(note)
-        self.save_notes()
+        with self._lock:
+            self._index(note)
+            self._persist('add', note=note.to_dict())
+        self._emit(NoteChange(added=(note.id,)))
         return note
-    
+
+    @timed("notes.insert_notes")
+    def insert_notes(self, notes: List[Note]) -> int:
+        """Добавляет готовые заметки пачкой (импорт); заметка с тем же id заменяется."""
+        with self._lock:
+            for note in notes:
+                self._unindex(note.id)
+                self._index(note)
+            if self._journal is not None and len(notes) < self.COMPACT_THRESHOLD:
+                for note in notes:
+                    self._journal.append('add', note=note.to_dict())
+                if self._journal.records >= self.COMPACT_THRESHOLD:
+                    self.compact()
+            else:
+                # Большую пачку дешевле записать одним снимком, чем построчно в журнал
+                self.compact()
+        self._emit(NoteChange(added=tuple(note.id for note in notes)))
+        return len(notes)
+
+    def get_note(self, note_id: str) -> Optional[Note]:
+        return self._notes.get(note_id)
+
+    @timed("notes.get_notes")
     def get_notes(self, category: Optional[str] = None) -> List[Note]:
         if category:
-            return [note for note in self._notes if note.category == category]
-        return self._notes.copy()
-    
+            return list(self._by_category.get(category, {}).values())
+        return list(self._notes.values())
+
+    @timed("notes.query_notes")
+    def query_notes(self, query: Optional[NoteQuery] = None, limit: int = 50,
+                    cursor: Optional[str] = None, offset: int = 0) -> NotePage:
+        """Возвращает одну страницу выборки.
+
+        Заметки не копируются и не сортируются целиком: из подходящих
+        выбираются только offset + limit первых по ключу сортировки.
+
+        Args:
+            query: Фильтры и порядок (по умолчанию все заметки по дате создания)
+            limit: Размер страницы
+            cursor: next_cursor предыдущей страницы
+            offset: Сколько заметок пропустить (после курсора)
+        """
+        query = query or NoteQuery()
+        if limit <= 0:
+            return NotePage()
+        key = query.sort_key()
+        after = decode_cursor(cursor) if cursor is not None else None
+        with self._lock:
+            cached = self._query_cache.get(query)
+            if cached is None and after is None and offset == 0:
+                # Первая страница: частичный отбор без полной сортировки
+                head = heapq.nsmallest(limit + 1, self._candidates(query), key=key)
+            else:
+                # Листание: выборка сортируется один раз, дальше страницы ищутся бинарным поиском
+                if cached is None:
+                    cached = self._sorted(query)
+                keys, notes = cached
+                start = bisect.bisect_right(keys, after) if after is not None else 0
+                # Лишняя заметка показывает, есть ли следующая страница
+                head = notes[start + offset:start + offset + limit + 1]
+        if len(head) <= limit:
+            return NotePage(notes=head)
+        page = head[:limit]
+        return NotePage(notes=page, next_cursor=encode_cursor(key(page[-1])))
+
+    def iter_notes(self, query: Optional[NoteQuery] = None, page_size: int = 200) -> Iterator[Note]:
+        """Лениво перебирает выборку, запрашивая страницы по мере надобности."""
+        cursor = None
+        while True:
+            page = self.query_notes(query, limit=page_size, cursor=cursor)
+            yield from page.notes
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    def count_notes(self, query: Optional[NoteQuery] = None) -> int:
+        query = query or NoteQuery()
+        with self._lock:
+            if query.favorite is None and query.created_from is None and query.created_to is None:
+                return len(self._by_category.get(query.category, {}) if query.category else self._notes)
+            return sum(1 for _ in self._candidates(query))
+
+    def _sorted(self, query: NoteQuery) -> Tuple[List[tuple], List[Note]]:
+        key = query.sort_key()
+        decorated = sorted((key(note), note) for note in self._candidates(query))
+        cached = ([item[0] for item in decorated], [item[1] for item in decorated])
+        if len(self._query_cache) >= self.QUERY_CACHE_SIZE:
+            self._query_cache.pop(next(iter(self._query_cache)))
+        self._query_cache[query] = cached
+        return cached
+
+    def _candidates(self, query: NoteQuery) -> Iterator[Note]:
+        source = self._by_category.get(query.category, {}) if query.category else self._notes
+        check = query.matches()
+        return (note for note in source.values() if check(note))
+
     def get_categories(self) -> List[str]:
-        return list(set(note.category for note in self._notes))
-    
+        return list(self._by_category)
+
+    def get_category_counts(self) -> Dict[str, int]:
+        return {category: len(notes) for category, notes in self._by_category.items()}
+
+    @timed("notes.search")
+    def search(self, query: str, category: Optional[str] = None, limit: int = 20) -> List[SearchResult]:
+        """Полнотекстовый поиск с ранжированием и позициями совпадений."""
+        if self._search is None:
+            self._search = SearchIndex(self._notes.values())
+        allowed = self._by_category.get(category, {}) if category else None
+        return self._search.search(query, self._notes, limit=limit, allowed=allowed)
+
+    def prepare_fuzzy_search(self, wait: bool = False) -> None:
+        """Запускает фоновое построение триграммного индекса (при загрузке приложения).
+
+        Args:
+            wait: Дождаться готовности индекса (для консольных команд)
+        """
+        if self._fuzzy is None:
+            self._fuzzy = BackgroundTrigramIndex(self._snapshot_notes, max_postings=self.FUZZY_MAX_POSTINGS)
+            self._fuzzy.start()
+        if wait:
+            self._fuzzy.wait()
+
+    @property
+    def fuzzy_ready(self) -> bool:
+        return self._fuzzy is not None and self._fuzzy.ready
+
+    def _snapshot_notes(self) -> List[Note]:
+        with self._lock:
+            return list(self._notes.values())
+
+    @timed("notes.fuzzy_search")
+    def fuzzy_search(self, query: str, category: Optional[str] = None, limit: int = 20,
+                     threshold: float = 0.3) -> List[SearchResult]:
+        """Нечёткий поиск по триграммам: находит заметки и при опечатках в запросе.
+
+        Пока индекс строится в фоне, выполняется обычный поиск.
+        """
+        self.prepare_fuzzy_search()
+        allowed = self._by_category.get(category, {}) if category else None
+        results = self._fuzzy.search(query, self._notes.get, limit=limit,
+                                     threshold=threshold, allowed=allowed)
+        if results is None:
+            return self.search(query, category=category, limit=limit)
+        return results
+
+    @timed("notes.update_note")
+    def update_note(self, note_id: str, text: str) -> bool:
+        with self._lock:
+            note = self._notes.get(note_id)
+            if note is None:
+                return False
+            self._set_text(note, text)
+            note.updated_at = datetime.now()
+            self._persist('update', id=note_id, text=text, updated_at=note.updated_at.isoformat())
+        self._emit(NoteChange(updated=(note_id,)))
+        return True
+
+    @timed("notes.delete_note")
     def delete_note(self, note_id: str) -> bool:
-        for i, note in enumerate(self._notes):
-            if note.id == note_id:
-                del self._notes[i]
-                self.save_notes()
-                return True
-        return False
-    
+        with self._lock:
+            if self._unindex(note_id) is None:
+                return False
+            self._persist('delete', id=note_id)
+        self._emit(NoteChange(removed=(note_id,)))
+        return True
+
+    @timed("notes.toggle_favorite")
     def toggle_favorite(self, note_id: str) -> bool:
-        for note in self._notes:
-            if note.id == note_id:
-                note.is_favorite = not note.is_favorite
-                note.updated_at = datetime.now()
-                self.save_notes()
-                return True
-        return False
\ No newline at end of file
+        with self._lock:
+            note = self._notes.get(note_id)
+            if note is None:
+                return False
+            note.is_favorite = not note.is_favorite
+            note.updated_at = datetime.now()
+            self._persist('favorite', id=note_id, value=note.is_favorite,
+                          updated_at=note.updated_at.isoformat())
+        self._emit(NoteChange(updated=(note_id,)))
+        return True
@@ -0,0 +1,131 @@
+"""Полнотекстовый поиск по заметкам.
+
+Инвертированный индекс «терм → заметки» обновляется при каждом
+изменении, поэтому поиск не просматривает все заметки, а пересекает
+списки вхождений и ранжирует только найденных кандидатов (BM25).
+"""
+
+import heapq
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.models.note import Note
+from core.utils.text import iter_tokens, tokenize
+
+_K1 = 1.2
+_B = 0.75
+
+
+@dataclass
+class SearchResult:
+    """Найденная заметка с оценкой и позициями совпадений в тексте."""
+    note: Note
+    score: float
+    matches: List[Tuple[int, int]] = field(default_factory=list)  # (начало, конец) в note.text
+
+
+def match_offsets(text: str, terms: Set[str]) -> List[Tuple[int, int]]:
+    """Находит позиции слов текста, совпавших с термами запроса."""
+    return [(start, end) for term, start, end in iter_tokens(text) if term in terms]
+
+
+class SearchIndex:
+    """Инвертированный индекс по тексту заметок."""
+
+    def __init__(self, notes: Iterable[Note] = ()):
+        self._postings: Dict[str, Dict[str, int]] = {}   # терм -> {id заметки: частота}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}  # id -> термы (для удаления)
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+        for note in notes:
+            self.add(note)
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def add(self, note: Note) -> None:
+        """Индексирует заметку (повторный вызов переиндексирует её)."""
+        if note.id in self._doc_len:
+            self.remove(note.id)
+        terms = tokenize(note.text)
+        counts = Counter(terms)
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[note.id] = count
+        self._doc_terms[note.id] = tuple(counts)
+        self._doc_len[note.id] = len(terms)
+        self._total_len += len(terms)
+
+    def remove(self, note_id: str) -> None:
+        """Удаляет заметку из индекса."""
+        terms = self._doc_terms.pop(note_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(note_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(note_id)
+
+    def update(self, note: Note) -> None:
+        """Переиндексирует заметку после изменения текста."""
+        self.add(note)
+
+    def search(self, query: str, notes: Dict[str, Note], limit: int = 20,
+               allowed: Optional[Dict[str, Note]] = None) -> List[SearchResult]:
+        """Ищет заметки, содержащие все слова запроса.
+
+        Args:
+            query: Строка запроса
+            notes: Заметки по id (для построения результатов)
+            limit: Максимальное количество результатов
+            allowed: Ограничение набора заметок (например, одной категорией)
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        postings = [self._postings.get(term) for term in terms]
+        if not all(postings):
+            return []
+
+        # Пересекаем, начиная с самого короткого списка вхождений
+        postings.sort(key=len)
+        candidates = postings[0].keys()
+        if allowed is not None and len(allowed) < len(candidates):
+            candidates = allowed.keys() & candidates
+        for other in postings[1:]:
+            candidates = [doc_id for doc_id in candidates if doc_id in other]
+        if allowed is not None:
+            candidates = [doc_id for doc_id in candidates if doc_id in allowed]
+
+        doc_count = len(self._doc_len)
+        avg_len = self._total_len / doc_count if doc_count else 0.0
+        weights = [
+            (posting, math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5)))
+            for posting in postings
+        ]
+
+        # Нормировка по длине: K1 * (1 - B + B * len / avg_len) = base + scale * len
+        base = _K1 * (1 - _B)
+        scale = _K1 * _B / avg_len if avg_len else 0.0
+        doc_len = self._doc_len
+        candidates = list(candidates)
+        norms = [base + scale * doc_len[doc_id] for doc_id in candidates]
+        scores = [0.0] * len(candidates)
+        for posting, idf in weights:
+            factor = idf * (_K1 + 1)
+            scores = [
+                total + factor * tf / (tf + norm)
+                for total, tf, norm in zip(scores, map(posting.__getitem__, candidates), norms)
+            ]
+
+        top = heapq.nlargest(limit, zip(scores, candidates))
+        term_set = set(terms)
+        return [
+            SearchResult(note=notes[doc_id], score=doc_score,
+                         matches=match_offsets(notes[doc_id].text, term_set))
+            for doc_score, doc_id in top
+        ]
@@ -0,0 +1,423 @@
+"""Хранилище заметок на SQLite.
+
+Реализует тот же API, что и NoteService, но не загружает все заметки в
+память: выборки по категории и избранному выполняются по индексам.
+Полнотекстовый поиск идёт по таблице FTS5 с термами заметок (те же
+нормализация и стемминг, что и в SearchIndex) и ранжируется через bm25().
+"""
+
+import sqlite3
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.models.note import Note, datetime_to_ts, ts_to_datetime
+from core.services.note_service import NoteService
+from core.services.note_query import (
+    SORT_FAVORITES, SORT_UPDATED, NotePage, NoteQuery, decode_cursor, encode_cursor,
+)
+from core.services.note_events import NoteChange, NoteChangeNotifier
+from core.services.search_index import SearchResult, match_offsets
+from core.services.trigram_index import BackgroundTrigramIndex
+from core.utils.text import tokenize
+from core.utils.metrics import timed
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id          TEXT PRIMARY KEY,
+    text        TEXT NOT NULL,
+    category    TEXT NOT NULL,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT,
+    is_favorite INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_notes_category ON notes(category);
+CREATE INDEX IF NOT EXISTS idx_notes_category_created_at ON notes(category, created_at);
+CREATE INDEX IF NOT EXISTS idx_notes_is_favorite ON notes(is_favorite);
+CREATE INDEX IF NOT EXISTS idx_notes_created_at ON notes(created_at);
+-- Термы текста заметки (tokenize) под тем же rowid, что и строка notes
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    terms, tokenize = 'unicode61 remove_diacritics 0'
+);
+"""
+
+# PRAGMA user_version базы. Ставится в той же транзакции, что и сами
+# изменения, поэтому прерванный перенос или построение индекса повторяются
+_VERSION_MIGRATED = 1   # Заметки из JSON перенесены
+_VERSION_FTS = 2        # Вдобавок построен полнотекстовый индекс notes_fts
+
+# Параметризованные запросы: sqlite3 кэширует их подготовленные версии
+_COLUMNS = "id, text, category, created_at, updated_at, is_favorite"
+_SQL_INSERT = f"INSERT OR REPLACE INTO notes ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)"
+_SQL_SELECT_ALL = f"SELECT {_COLUMNS} FROM notes ORDER BY created_at"
+_SQL_SELECT_BY_CATEGORY = f"SELECT {_COLUMNS} FROM notes WHERE category = ? ORDER BY created_at"
+_SQL_IDS_BY_CATEGORY = "SELECT id FROM notes WHERE category = ?"
+_SQL_SELECT_BY_ID = f"SELECT {_COLUMNS} FROM notes WHERE id = ?"
+_SQL_CATEGORIES = "SELECT DISTINCT category FROM notes"
+_SQL_CATEGORY_COUNTS = "SELECT category, COUNT(*) FROM notes GROUP BY category"
+_SQL_SEARCH = (
+    "SELECT " + ", ".join(f"notes.{column.strip()}" for column in _COLUMNS.split(","))
+    + ", bm25(notes_fts) AS score FROM notes_fts JOIN notes ON notes.rowid = notes_fts.rowid"
+    + " WHERE notes_fts MATCH ?"
+)
+_SQL_SEARCH_CATEGORY = " AND notes.category = ?"
+_SQL_SEARCH_ORDER = " ORDER BY score LIMIT ?"
+_SQL_COUNT = "SELECT COUNT(*) FROM notes"
+_SQL_HAS_NOTES = "SELECT 1 FROM notes LIMIT 1"
+_SQL_DELETE = "DELETE FROM notes WHERE id = ?"
+_SQL_UPDATE_TEXT = "UPDATE notes SET text = ?, updated_at = ? WHERE id = ?"
+# Строка FTS следует за rowid строки notes (INSERT OR REPLACE выдаёт новый rowid)
+_SQL_FTS_DELETE = "DELETE FROM notes_fts WHERE rowid = (SELECT rowid FROM notes WHERE id = ?)"
+_SQL_FTS_INSERT = "INSERT INTO notes_fts (rowid, terms) SELECT rowid, ? FROM notes WHERE id = ?"
+_SQL_FTS_UPDATE = "UPDATE notes_fts SET terms = ? WHERE rowid = (SELECT rowid FROM notes WHERE id = ?)"
+_SQL_FTS_CLEAR = "DELETE FROM notes_fts"
+_SQL_FTS_FILL = "INSERT INTO notes_fts (rowid, terms) SELECT rowid, note_terms(text) FROM notes"
+_SQL_TOGGLE_FAVORITE = "UPDATE notes SET is_favorite = 1 - is_favorite, updated_at = ? WHERE id = ?"
+
+
+def _row_to_note(row: tuple) -> Note:
+    note_id, text, category, created_at, updated_at, is_favorite = row
+    return Note(
+        id=note_id,
+        text=text,
+        category=category,
+        created_at=datetime.fromisoformat(created_at),
+        updated_at=datetime.fromisoformat(updated_at) if updated_at else None,
+        is_favorite=bool(is_favorite)
+    )
+
+
+def _iso(value: datetime) -> str:
+    # Та же проверка, что и в модели: даты с часовым поясом отвергаются
+    return ts_to_datetime(datetime_to_ts(value)).isoformat()
+
+
+def _filter_sql(query: NoteQuery) -> Tuple[List[str], list]:
+    conditions, params = [], []
+    if query.category:
+        conditions.append("category = ?")
+        params.append(query.category)
+    if query.favorite is not None:
+        conditions.append("is_favorite = ?")
+        params.append(int(query.favorite))
+    if query.created_from is not None:
+        conditions.append("created_at >= ?")
+        params.append(_iso(query.created_from))
+    if query.created_to is not None:
+        conditions.append("created_at < ?")
+        params.append(_iso(query.created_to))
+    return conditions, params
+
+
+def _sort_columns(query: NoteQuery) -> List[Tuple[str, bool]]:
+    """Выражения ключа сортировки и признак убывания для каждого."""
+    if query.sort == SORT_UPDATED:
+        columns = [("COALESCE(updated_at, created_at)", query.descending)]
+    elif query.sort == SORT_FAVORITES:
+        columns = [("1 - is_favorite", False), ("created_at", query.descending)]
+    else:
+        columns = [("created_at", query.descending)]
+    return columns + [("id", False)]
+
+
+def _after_sql(columns: List[Tuple[str, bool]], key: Tuple) -> Tuple[str, list]:
+    """Условие «строка идёт после ключа» для лексикографического порядка."""
+    if len(key) != len(columns):
+        raise ValueError("Курсор не соответствует порядку сортировки")
+    (column, descending), value = columns[0], key[0]
+    op = "<" if descending else ">"
+    if len(columns) == 1:
+        return f"{column} {op} ?", [value]
+    rest_sql, rest_params = _after_sql(columns[1:], key[1:])
+    return f"({column} {op} ? OR ({column} = ? AND {rest_sql}))", [value, value] + rest_params
+
+
+def _note_terms(text: str) -> str:
+    """Термы текста для notes_fts: слова уже нормализованы и сведены к основам."""
+    return " ".join(tokenize(text))
+
+
+def _match_query(terms: List[str]) -> str:
+    """Запрос FTS5: все термы обязательны, каждый — отдельная фраза."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _note_to_row(note: Note) -> tuple:
+    return (
+        note.id,
+        note.text,
+        note.category,
+        note.created_at.isoformat(),
+        note.updated_at.isoformat() if note.updated_at else None,
+        int(note.is_favorite)
+    )
+
+
+class SqliteNoteService(NoteChangeNotifier):
+    """Сервис заметок с хранением в SQLite (WAL, индексы по категории, избранному и дате)."""
+
+    def __init__(self, db_file: str = "data/notes.db", json_file: Optional[str] = "data/notes.json"):
+        """Открывает базу и при первом запуске переносит заметки из JSON.
+
+        Args:
+            db_file: Путь к файлу базы данных
+            json_file: Старый JSON-файл заметок для однократной миграции
+        """
+        self.db_file = Path(db_file)
+        self.db_file.parent.mkdir(exist_ok=True)
+        self._init_listeners()
+        self._fuzzy: Optional[BackgroundTrigramIndex] = None
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Стемминг кириллицы SQLite не умеет, поэтому термы строятся на стороне Python
+        self._conn.create_function("note_terms", 1, _note_terms, deterministic=True)
+        if self._user_version() < _VERSION_MIGRATED:
+            self._finish_migration(json_file)
+        if self._user_version() < _VERSION_FTS:
+            self._build_fts()
+
+    def _user_version(self) -> int:
+        return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _finish_migration(self, json_file: Optional[str]) -> None:
+        """Переносит заметки из JSON, если перенос ещё не завершён.
+
+        После сбоя переноса (повреждённая запись, нет места на диске)
+        транзакция откатывается и база остаётся пустой и без признака, так
+        что следующий запуск повторит перенос. Заметки без признака бывают
+        только в базе, созданной до его появления: она уже перенесена.
+        """
+        if json_file and self._conn.execute(_SQL_HAS_NOTES).fetchone() is None:
+            migrate_json_to_sqlite(json_file, self)
+        else:
+            self._conn.execute(f"PRAGMA user_version = {_VERSION_MIGRATED}")
+
+    def _build_fts(self) -> None:
+        """Строит notes_fts по всем заметкам базы, созданной до его появления."""
+        with self._conn:
+            self._conn.execute(_SQL_FTS_CLEAR)
+            self._conn.execute(_SQL_FTS_FILL)
+            self._conn.execute(f"PRAGMA user_version = {_VERSION_FTS}")
+
+    @timed("notes.load_notes")
+    def load_notes(self) -> None:
+        # Данные читаются по запросу, загружать заранее нечего
+        pass
+
+    def save_notes(self) -> None:
+        self._conn.commit()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # Каждая операция уже закоммичена, ждать нечего
+        self._conn.commit()
+        return True
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @timed("notes.insert_notes")
+    def insert_notes(self, notes: List[Note]) -> int:
+        return self._insert_notes(notes)
+
+    def _insert_notes(self, notes: List[Note], migration: bool = False) -> int:
+        # Повтор id в пакете дал бы две строки FTS на одну заметку: остаётся последняя версия
+        notes = list({note.id: note for note in notes}.values())
+        with self._conn:
+            self._conn.executemany(_SQL_FTS_DELETE, ((note.id,) for note in notes))
+            self._conn.executemany(_SQL_INSERT, (_note_to_row(note) for note in notes))
+            self._conn.executemany(_SQL_FTS_INSERT, ((_note_terms(note.text), note.id) for note in notes))
+            if migration:
+                # Перенос идёт уже с индексом, строить его заново не нужно
+                self._conn.execute(f"PRAGMA user_version = {_VERSION_FTS}")
+        self._emit(NoteChange(added=tuple(note.id for note in notes)))
+        return len(notes)
+
+    @timed("notes.add_note")
+    def add_note(self, text: str, category: str) -> Note:
+        note = Note(
+            id=str(uuid.uuid4()),
+            text=text,
+            category=category,
+            created_at=datetime.now()
+        )
+        with self._conn:
+            self._conn.execute(_SQL_INSERT, _note_to_row(note))
+            self._conn.execute(_SQL_FTS_INSERT, (_note_terms(note.text), note.id))
+        self._emit(NoteChange(added=(note.id,)))
+        return note
+
+    def get_note(self, note_id: str) -> Optional[Note]:
+        row = self._conn.execute(_SQL_SELECT_BY_ID, (note_id,)).fetchone()
+        return _row_to_note(row) if row else None
+
+    @timed("notes.get_notes")
+    def get_notes(self, category: Optional[str] = None) -> List[Note]:
+        if category:
+            rows = self._conn.execute(_SQL_SELECT_BY_CATEGORY, (category,))
+        else:
+            rows = self._conn.execute(_SQL_SELECT_ALL)
+        return [_row_to_note(row) for row in rows]
+
+    @timed("notes.query_notes")
+    def query_notes(self, query: Optional[NoteQuery] = None, limit: int = 50,
+                    cursor: Optional[str] = None, offset: int = 0) -> NotePage:
+        """Одна страница выборки: фильтры и курсор превращаются в WHERE, страница — в LIMIT."""
+        query = query or NoteQuery()
+        if limit <= 0:
+            return NotePage()
+        conditions, params = _filter_sql(query)
+        columns = _sort_columns(query)
+        if cursor is not None:
+            after_sql, after_params = _after_sql(columns, decode_cursor(cursor))
+            conditions.append(after_sql)
+            params.extend(after_params)
+        keys = ", ".join(column for column, _ in columns)
+        sql = f"SELECT {_COLUMNS}, {keys} FROM notes"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY " + ", ".join(
+            f"{column} DESC" if descending else column for column, descending in columns
+        )
+        sql += " LIMIT ? OFFSET ?"
+        rows = self._conn.execute(sql, params + [limit + 1, offset]).fetchall()
+
+        width = len(_COLUMNS.split(","))
+        notes = [_row_to_note(row[:width]) for row in rows[:limit]]
+        if len(rows) <= limit:
+            return NotePage(notes=notes)
+        return NotePage(notes=notes, next_cursor=encode_cursor(rows[limit - 1][width:]))
+
+    def iter_notes(self, query: Optional[NoteQuery] = None, page_size: int = 200) -> Iterator[Note]:
+        cursor = None
+        while True:
+            page = self.query_notes(query, limit=page_size, cursor=cursor)
+            yield from page.notes
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    def count_notes(self, query: Optional[NoteQuery] = None) -> int:
+        conditions, params = _filter_sql(query or NoteQuery())
+        sql = _SQL_COUNT + (" WHERE " + " AND ".join(conditions) if conditions else "")
+        return self._conn.execute(sql, params).fetchone()[0]
+
+    def get_categories(self) -> List[str]:
+        return [row[0] for row in self._conn.execute(_SQL_CATEGORIES)]
+
+    def get_category_counts(self) -> Dict[str, int]:
+        return dict(self._conn.execute(_SQL_CATEGORY_COUNTS).fetchall())
+
+    @timed("notes.search")
+    def search(self, query: str, category: Optional[str] = None, limit: int = 20) -> List[SearchResult]:
+        """Заметки, содержащие все слова запроса, по убыванию BM25 (через notes_fts)."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        sql, params = _SQL_SEARCH, [_match_query(terms)]
+        if category:
+            sql += _SQL_SEARCH_CATEGORY
+            params.append(category)
+        rows = self._conn.execute(sql + _SQL_SEARCH_ORDER, params + [limit])
+
+        term_set = set(terms)
+        results = []
+        for row in rows:
+            note = _row_to_note(row[:-1])
+            # bm25() в SQLite отрицательна: чем меньше, тем лучше совпадение
+            results.append(SearchResult(note=note, score=-row[-1], matches=match_offsets(note.text, term_set)))
+        return results
+
+    def prepare_fuzzy_search(self, wait: bool = False) -> None:
+        """Запускает фоновое построение триграммного индекса (см. NoteService)."""
+        if self._fuzzy is None:
+            if str(self.db_file) == ":memory:":
+                # Вторым соединением базу в памяти не открыть: снимок берётся сразу
+                notes = self.get_notes()
+                load = lambda: notes
+            else:
+                load = self._snapshot_notes
+            self._fuzzy = BackgroundTrigramIndex(load, max_postings=NoteService.FUZZY_MAX_POSTINGS)
+            self._fuzzy.start()
+        if wait:
+            self._fuzzy.wait()
+
+    @property
+    def fuzzy_ready(self) -> bool:
+        return self._fuzzy is not None and self._fuzzy.ready
+
+    def _snapshot_notes(self) -> List[Note]:
+        """Читает все заметки через отдельное соединение (вызывается в фоновом потоке)."""
+        conn = sqlite3.connect(str(self.db_file))
+        try:
+            return [_row_to_note(row) for row in conn.execute(_SQL_SELECT_ALL)]
+        finally:
+            conn.close()
+
+    @timed("notes.fuzzy_search")
+    def fuzzy_search(self, query: str, category: Optional[str] = None, limit: int = 20,
+                     threshold: float = 0.3) -> List[SearchResult]:
+        """Нечёткий поиск; пока триграммный индекс строится в фоне — обычный поиск."""
+        self.prepare_fuzzy_search()
+        allowed = None
+        if category:
+            allowed = {row[0] for row in self._conn.execute(_SQL_IDS_BY_CATEGORY, (category,))}
+        results = self._fuzzy.search(query, self.get_note, limit=limit,
+                                     threshold=threshold, allowed=allowed)
+        if results is None:
+            return self.search(query, category=category, limit=limit)
+        return results
+
+    def _update_fuzzy(self, change: NoteChange) -> None:
+        if self._fuzzy is None:
+            return
+        for note_id in change.removed:
+            self._fuzzy.remove(note_id)
+        for note_id in change.added + change.updated:
+            note = self.get_note(note_id)
+            if note is not None:
+                self._fuzzy.update(note)
+
+    @timed("notes.update_note")
+    def update_note(self, note_id: str, text: str) -> bool:
+        with self._conn:
+            cursor = self._conn.execute(_SQL_UPDATE_TEXT, (text, datetime.now().isoformat(), note_id))
+            self._conn.execute(_SQL_FTS_UPDATE, (_note_terms(text), note_id))
+        return self._changed(cursor, NoteChange(updated=(note_id,)))
+
+    @timed("notes.delete_note")
+    def delete_note(self, note_id: str) -> bool:
+        with self._conn:
+            self._conn.execute(_SQL_FTS_DELETE, (note_id,))
+            cursor = self._conn.execute(_SQL_DELETE, (note_id,))
+        return self._changed(cursor, NoteChange(removed=(note_id,)))
+
+    @timed("notes.toggle_favorite")
+    def toggle_favorite(self, note_id: str) -> bool:
+        with self._conn:
+            cursor = self._conn.execute(_SQL_TOGGLE_FAVORITE, (datetime.now().isoformat(), note_id))
+        return self._changed(cursor, NoteChange(updated=(note_id,)))
+
+    def _emit(self, change: NoteChange) -> None:
+        self._update_fuzzy(change)
+        super()._emit(change)
+
+    def _changed(self, cursor: sqlite3.Cursor, change: NoteChange) -> bool:
+        if cursor.rowcount > 0:
+            self._emit(change)
+            return True
+        return False
+
+
+def migrate_json_to_sqlite(json_file: str, target: SqliteNoteService) -> int:
+    """Переносит заметки из JSON-снимка (с учётом журнала) в SQLite.
+
+    Returns:
+        Количество перенесённых заметок
+    """
+    source = NoteService(json_file)
+    # Признак завершения переноса пишется той же транзакцией, что и заметки
+    return target._insert_notes(source.get_notes(), migration=True)
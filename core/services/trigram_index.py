@@ -0,0 +1,323 @@
+"""Нечёткий поиск по триграммам.
+
+Каждая заметка раскладывается на символьные триграммы слов текста и
+категории. Запрос с опечаткой всё равно делит с нужной заметкой большую
+часть триграмм, поэтому находится по доле совпавших триграмм. Ни одна
+триграмма запроса не отбрасывается: частые только досчитываются у
+кандидатов, найденных по редким.
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Container, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from core.models.note import Note
+from core.services.search_index import SearchResult
+from core.utils.text import normalize
+
+_WORD_RE = re.compile(r"[^\W_]+")
+_SAMPLE_RANGE = 2 ** 32  # Значения _sample_key
+_SAMPLE_MASK = _SAMPLE_RANGE - 1
+
+
+def trigrams(text: str) -> Set[str]:
+    """Возвращает множество триграмм слов (с отступами по краям слова)."""
+    result = set()
+    for word in _WORD_RE.findall(normalize(text)):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def similarity(query_grams: Set[str], grams: Set[str]) -> float:
+    """Доля триграмм запроса, найденных в тексте."""
+    if not query_grams:
+        return 0.0
+    return len(query_grams & grams) / len(query_grams)
+
+
+def _sample_key(doc_id: str) -> int:
+    """Псевдослучайное число заметки для выборки из длинных списков.
+
+    Хэш строки кэшируется в самом объекте id и постоянен в пределах
+    процесса, а индекс живёт только в памяти.
+    """
+    return hash(doc_id) & _SAMPLE_MASK
+
+
+class TrigramIndex:
+    """Индекс «триграмма → заметки» с ограничением по памяти.
+
+    При переполнении длинные списки частых триграмм не выбрасываются, а
+    урезаются до выборки: в списке остаются заметки, у которых
+    _sample_key меньше порога триграммы. Ключ у заметки один для всех
+    триграмм, поэтому выборки согласованы: заметка из самой узкой выборки
+    слова есть и во всех остальных его триграммах и набирает полное число
+    совпадений.
+    """
+
+    def __init__(self, notes: Iterable[Note] = (), max_postings: int = 2_000_000,
+                 max_chars: int = 2000):
+        """Инициализирует индекс.
+
+        Args:
+            notes: Начальный набор заметок
+            max_postings: Максимальное суммарное число вхождений в индексе
+                (триграммы в списках заметок и в наборах триграмм самих заметок)
+            max_chars: Сколько первых символов текста заметки индексировать
+        """
+        self.max_postings = max_postings
+        self.max_chars = max_chars
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_grams: Dict[str, FrozenSet[str]] = {}
+        self._size = 0       # Вхождений в _postings
+        self._doc_size = 0   # Триграмм в _doc_grams
+        # Порог _sample_key для урезанных списков: в список попадают заметки ниже него
+        self._limits: Dict[str, int] = {}
+        for note in notes:
+            self.add(note)
+
+    def __len__(self) -> int:
+        return len(self._doc_grams)
+
+    @property
+    def size(self) -> int:
+        """Текущее число вхождений в обеих структурах (мера занимаемой памяти)."""
+        return self._size + self._doc_size
+
+    def _note_grams(self, note: Note) -> FrozenSet[str]:
+        grams = trigrams(note.text[:self.max_chars]) | trigrams(note.category)
+        if self._limits:
+            key = _sample_key(note.id)
+            limits = self._limits
+            grams = {gram for gram in grams if key < limits.get(gram, key + 1)}
+        return frozenset(grams)
+
+    def add(self, note: Note) -> None:
+        if note.id in self._doc_grams:
+            self.remove(note.id)
+        grams = self._note_grams(note)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(note.id)
+        self._doc_grams[note.id] = grams
+        self._size += len(grams)
+        self._doc_size += len(grams)
+        if self.size > self.max_postings:
+            self._prune()
+
+    def remove(self, note_id: str) -> None:
+        grams = self._doc_grams.pop(note_id, None)
+        if grams is None:
+            return
+        self._doc_size -= len(grams)
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings is not None and note_id in postings:
+                postings.discard(note_id)
+                self._size -= 1
+                if not postings:
+                    del self._postings[gram]
+
+    def update(self, note: Note) -> None:
+        self.add(note)
+
+    def _prune(self) -> None:
+        """Урезает самые длинные списки до общей длины cap, пока индекс не влезет в лимит."""
+        # Каждое убранное вхождение освобождает место в обеих структурах
+        excess = (self.size - self.max_postings * 0.8) / 2
+        lengths = sorted((len(postings) for postings in self._postings.values()), reverse=True)
+        cap, removed = lengths[0], 0
+        for i, length in enumerate(lengths):
+            # Урезание первых i списков до length освобождает removed вхождений
+            removed += i * (cap - length)
+            cap = length
+            if removed >= excess:
+                break
+        cap = max(1, cap)
+
+        keys = {doc_id: _sample_key(doc_id) for doc_id in self._doc_grams}
+        dropped: Dict[str, Set[str]] = {}
+        for gram, postings in self._postings.items():
+            if len(postings) <= cap:
+                continue
+            ranked = sorted(postings, key=keys.__getitem__)
+            self._limits[gram] = keys[ranked[cap]]
+            for doc_id in ranked[cap:]:
+                postings.discard(doc_id)
+                dropped.setdefault(doc_id, set()).add(gram)
+            self._size -= len(ranked) - cap
+            self._doc_size -= len(ranked) - cap
+        # Наборы триграмм заметок тоже избавляются от убранных (каждый — за один проход)
+        for doc_id, grams in dropped.items():
+            self._doc_grams[doc_id] = self._doc_grams[doc_id] - grams
+
+    def _frequency(self, gram: str) -> float:
+        """Оценка числа заметок с триграммой (для урезанного списка — по доле выборки)."""
+        count = len(self._postings[gram])
+        limit = self._limits.get(gram)
+        return count if limit is None else count * _SAMPLE_RANGE / max(1, limit)
+
+    def search(self, query: str, get_note: Callable[[str], Optional[Note]], limit: int = 20,
+               threshold: float = 0.3, allowed: Optional[Container[str]] = None) -> List[SearchResult]:
+        """Ищет заметки, похожие на запрос.
+
+        Кандидаты берутся только из списков самых редких триграмм запроса
+        (префиксный фильтр): заметка, набравшая долю threshold, обязательно
+        содержит хотя бы одну из них. Частые триграммы лишь досчитываются у
+        кандидатов, поэтому опечатка в частом слове находит заметки так же,
+        как в редком, а время не растёт с частотой слова.
+
+        Args:
+            query: Строка запроса (возможно, с опечатками)
+            get_note: Получение заметки по id
+            limit: Максимальное количество результатов
+            threshold: Минимальная доля совпавших триграмм запроса
+            allowed: Допустимые id заметок (например, заметки одной категории)
+        """
+        query_grams = trigrams(query)
+        if not query_grams or limit <= 0:
+            return []
+        total = len(query_grams)
+        min_hits = max(1, math.ceil(threshold * total - 1e-9))
+        known = sorted((gram for gram in query_grams if gram in self._postings), key=self._frequency)
+        if len(known) < min_hits:
+            return []
+        split = len(known) - min_hits + 1
+        rare, frequent = known[:split], known[split:]
+
+        hits = Counter()
+        for gram in rare:
+            hits.update(self._postings[gram])
+        if allowed is not None:
+            hits = Counter({doc_id: count for doc_id, count in hits.items() if doc_id in allowed})
+        for gram in frequent:
+            postings = self._postings[gram]
+            if len(postings) < len(hits):
+                hits.update(doc_id for doc_id in postings if doc_id in hits)
+            else:
+                hits.update(doc_id for doc_id in hits if doc_id in postings)
+
+        # Верхушка через кучу, без сортировки всех кандидатов; при равной доле
+        # совпадений выше короткие заметки (ближе к запросу)
+        top = heapq.nsmallest(limit, (
+            (-count, len(self._doc_grams[doc_id]), doc_id)
+            for doc_id, count in hits.items() if count >= min_hits
+        ))
+        results = []
+        for neg_count, _, doc_id in top:
+            note = get_note(doc_id)
+            if note is not None:
+                results.append(SearchResult(note=note, score=-neg_count / total,
+                                            matches=self._match_offsets(note.text, query)))
+        return results
+
+    def _match_offsets(self, text: str, query: str) -> List[Tuple[int, int]]:
+        """Находит слова текста, похожие хотя бы на одно слово запроса."""
+        query_words = [trigrams(word) for word in _WORD_RE.findall(query)]
+        matches = []
+        for match in _WORD_RE.finditer(text[:self.max_chars]):
+            grams = trigrams(match.group())
+            if any(similarity(word, grams) >= 0.5 for word in query_words):
+                matches.append((match.start(), match.end()))
+        return matches
+
+
+class BackgroundTrigramIndex:
+    """Триграммный индекс, который строится в фоновом потоке.
+
+    Построение по десяткам тысяч заметок занимает секунды, поэтому идёт не
+    в потоке Tk. Изменения заметок, пришедшие во время построения,
+    копятся и применяются к готовому индексу перед тем, как он станет
+    доступен; до этого search возвращает None.
+    """
+
+    def __init__(self, load: Callable[[], Iterable[Note]], max_postings: int = 2_000_000,
+                 name: str = "TrigramIndexBuilder"):
+        """Инициализирует построитель.
+
+        Args:
+            load: Снимок заметок; вызывается в фоновом потоке
+            max_postings: Лимит памяти индекса (см. TrigramIndex)
+            name: Имя потока
+        """
+        self._load = load
+        self.max_postings = max_postings
+        self._name = name
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._index: Optional[TrigramIndex] = None
+        # Изменения во время построения: ("add", заметка) или ("remove", id)
+        self._pending: List[Tuple[str, Any]] = []
+        self.build_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._index is not None
+
+    def start(self) -> None:
+        """Запускает построение (повторный вызов ничего не делает)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._build, name=self._name, daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Запускает построение и ждёт его окончания; True, если индекс готов."""
+        self.start()
+        self._done.wait(timeout)
+        return self.ready
+
+    def _build(self) -> None:
+        started = time.perf_counter()
+        try:
+            index = TrigramIndex(self._load(), max_postings=self.max_postings)
+            with self._lock:
+                for op, value in self._pending:
+                    if op == "remove":
+                        index.remove(value)
+                    else:
+                        index.add(value)
+                self._pending = []
+                self._index = index
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"Ошибка построения индекса нечёткого поиска: {e}")
+        finally:
+            self.build_ms = (time.perf_counter() - started) * 1000
+            self._done.set()
+
+    def add(self, note: Note) -> None:
+        self._change("add", note)
+
+    def update(self, note: Note) -> None:
+        self._change("add", note)
+
+    def remove(self, note_id: str) -> None:
+        self._change("remove", note_id)
+
+    def _change(self, op: str, value: Any) -> None:
+        with self._lock:
+            if self._index is None:
+                # Изменения до запуска попадут в снимок сами, после сбоя индекса не будет
+                if self._thread is not None and not self._done.is_set():
+                    self._pending.append((op, value))
+                return
+            if op == "remove":
+                self._index.remove(value)
+            else:
+                self._index.add(value)
+
+    def search(self, query: str, get_note: Callable[[str], Optional[Note]], limit: int = 20,
+               threshold: float = 0.3, allowed: Optional[Container[str]] = None) -> Optional[List[SearchResult]]:
+        """Результаты TrigramIndex.search или None, пока индекс не готов."""
+        index = self._index
+        if index is None:
+            return None
+        return index.search(query, get_note, limit=limit, threshold=threshold, allowed=allowed)
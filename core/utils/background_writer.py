@@ -0,0 +1,136 @@
+"""Фоновая запись на диск.
+
+Отдельный поток получает сигналы «данные изменились» и объединяет серию
+изменений в одну запись в пределах окна ожидания, чтобы медленный диск не
+блокировал главный поток Tk. Используется и для заметок, и для настроек.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Атомарно записывает текст: временный файл, fsync, rename."""
+    path = Path(path)
+    tmp_file = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+class BackgroundWriter:
+    """Поток записи, объединяющий серии изменений в одну операцию."""
+
+    def __init__(self, write: Callable[[], None], delay: float = 0.5, name: str = "BackgroundWriter",
+                 error_message: str = "Ошибка записи"):
+        """Инициализирует поток записи.
+
+        Args:
+            write: Функция, выполняющая фактическую запись; ошибку она
+                пробрасывает, чтобы flush() вернул False
+            delay: Окно объединения изменений в секундах
+            name: Имя потока
+            error_message: Начало сообщения, печатаемого при ошибке записи
+        """
+        self._write = write
+        self.delay = delay
+        self._name = name
+        self._error_message = error_message
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pending = 0          # Сигналов с момента последней записи
+        self._writing = False
+        self._urgent = False       # flush() просит писать без ожидания
+        self._stopped = False
+        self._writes = 0
+        self._last_write_ms = 0.0
+        self._max_write_ms = 0.0
+        self._last_error: Optional[str] = None
+
+    def mark_dirty(self) -> None:
+        """Сообщает, что данные изменились и их нужно записать."""
+        with self._cond:
+            self._pending += 1
+            self._ensure_started()
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Немедленно записывает накопленные изменения и ждёт завершения.
+
+        Returns:
+            True, если всё записано без ошибок
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._thread is None:
+                return self._last_error is None
+            self._urgent = True
+            self._cond.notify_all()
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._urgent = False
+            return self._last_error is None
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """Записывает остаток и останавливает поток."""
+        result = self.flush(timeout)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        return result
+
+    def stats(self) -> Dict[str, object]:
+        """Возвращает статистику записи: задержку и глубину очереди."""
+        with self._cond:
+            return {
+                "writes": self._writes,
+                "queue_depth": self._pending,
+                "last_write_ms": round(self._last_write_ms, 3),
+                "max_write_ms": round(self._max_write_ms, 3),
+                "last_error": self._last_error,
+            }
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped and not self._pending:
+                    return
+                # Окно объединения: ждём новых изменений, пока не попросят flush
+                if not self._urgent:
+                    self._cond.wait_for(lambda: self._urgent or self._stopped, self.delay)
+                self._pending = 0
+                self._urgent = False
+                self._writing = True
+
+            started = time.perf_counter()
+            error = None
+            try:
+                self._write()
+            except Exception as e:
+                error = str(e)
+                print(f"{self._error_message}: {e}")
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            with self._cond:
+                self._writing = False
+                self._writes += 1
+                self._last_write_ms = elapsed_ms
+                self._max_write_ms = max(self._max_write_ms, elapsed_ms)
+                self._last_error = error
+                self._cond.notify_all()
@@ -0,0 +1,247 @@
+"""Счётчики, таймеры и гистограммы для горячих путей.
+
+Метрики собираются в общем реестре и показывают, куда уходит время при
+переходах между экранами и изменениях заметок. По умолчанию сбор
+выключен: декоратор timed и контекстный менеджер timer тогда сводятся к
+одной проверке флага. Включается переменной окружения
+RELIEVE_STRESS_METRICS=1 или настройкой metrics_enabled; снимок можно
+выгрузить в JSON (dump_json).
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Callable, Dict, Sequence, TypeVar
+
+METRICS_ENV = "RELIEVE_STRESS_METRICS"
+TIMER_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Флаг из переменной окружения; если она не задана — default."""
+    value = os.environ.get(name)
+    if value is None:
+        return bool(default)
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
+
+
+class Counter:
+    """Монотонный счётчик."""
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+    def snapshot(self) -> int:
+        return self.value
+
+
+class Histogram:
+    """Распределение значений по корзинам с фиксированными границами."""
+
+    def __init__(self, bounds: Sequence[float] = TIMER_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Корзины вида "<=50": число и сводные значения."""
+        labels = [f"<={bound:g}" for bound in self.bounds] + [f">{self.bounds[-1]:g}"]
+        return {
+            'buckets': dict(zip(labels, self.counts)),
+            'count': self.count,
+            'mean': round(self.total / self.count, 3) if self.count else 0.0,
+            'max': round(self.max, 3),
+        }
+
+
+class Timer(Histogram):
+    """Гистограмма длительностей в миллисекундах."""
+
+    def record(self, seconds: float) -> None:
+        self.add(seconds * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = super().snapshot()
+        data['total_ms'] = round(self.total, 3)
+        return data
+
+
+class _TimerContext:
+    __slots__ = ('registry', 'name', 'started')
+
+    def __init__(self, registry: 'MetricsRegistry', name: str):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.registry.record(self.name, time.perf_counter() - self.started)
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class MetricsRegistry:
+    """Именованные метрики процесса."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Counter] = {}
+        self._timers: Dict[str, Timer] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def counter(self, name: str) -> Counter:
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = Counter()
+            return counter
+
+    def timer(self, name: str) -> Timer:
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = Timer()
+            return timer
+
+    def histogram(self, name: str, bounds: Sequence[float] = TIMER_BUCKETS_MS) -> Histogram:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(bounds)
+            return histogram
+
+    def inc(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            with self._lock:
+                counter = self._counters.get(name)
+                if counter is None:
+                    counter = self._counters[name] = Counter()
+                counter.inc(amount)
+
+    def record(self, name: str, seconds: float) -> None:
+        if self.enabled:
+            with self._lock:
+                timer = self._timers.get(name)
+                if timer is None:
+                    timer = self._timers[name] = Timer()
+                timer.record(seconds)
+
+    def observe(self, name: str, value: float) -> None:
+        if self.enabled:
+            with self._lock:
+                histogram = self._histograms.get(name)
+                if histogram is None:
+                    histogram = self._histograms[name] = Histogram()
+                histogram.add(value)
+
+    def time(self, name: str):
+        """Контекстный менеджер, замеряющий длительность блока."""
+        return _TimerContext(self, name) if self.enabled else _NULL_CONTEXT
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'counters': {name: c.snapshot() for name, c in sorted(self._counters.items())},
+                'timers': {name: t.snapshot() for name, t in sorted(self._timers.items())},
+                'histograms': {name: h.snapshot() for name, h in sorted(self._histograms.items())},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+            self._histograms.clear()
+
+    def dump_json(self, path: str) -> Path:
+        """Сохраняет снимок метрик в JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"), **self.snapshot()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return path
+
+
+registry = MetricsRegistry(enabled=env_flag(METRICS_ENV))
+
+
+def configure(setting: bool = False) -> bool:
+    """Включает сбор по настройке; переменная окружения важнее настройки."""
+    registry.enabled = env_flag(METRICS_ENV, setting)
+    return registry.enabled
+
+
+def is_enabled() -> bool:
+    return registry.enabled
+
+
+def timer(name: str):
+    """with timer("notes.add"): ... — замер блока кода."""
+    return registry.time(name)
+
+
+def inc(name: str, amount: int = 1) -> None:
+    registry.inc(name, amount)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Декоратор: замеряет каждый вызов функции и считает вызовы."""
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.record(name, time.perf_counter() - started)
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+
+def counted(name: str) -> Callable[[F], F]:
+    """Декоратор: считает вызовы функции."""
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if registry.enabled:
+                registry.inc(name)
+            return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
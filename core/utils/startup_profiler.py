@@ -0,0 +1,152 @@
+"""Профилирование холодного старта (python main.py --profile-startup).
+
+Показывает, сколько заняли импорты модулей (с вложенными и без), фазы
+инициализации окна и сколько прошло до первой отрисовки и до появления
+содержимого. Без флага модуль ничего не делает: phase() и mark()
+возвращаются сразу.
+"""
+
+import importlib.abc
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_profiler: Optional['StartupProfiler'] = None
+
+
+class _TimedLoader:
+    """Обёртка загрузчика, замеряющая выполнение модуля."""
+
+    def __init__(self, loader, name: str, profiler: 'StartupProfiler'):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter_import(self._name)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(self._name)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Находит модуль остальными поисковиками и подменяет загрузчик на замеряющий."""
+
+    def __init__(self, profiler: 'StartupProfiler'):
+        self.profiler = profiler
+
+    def find_spec(self, name, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, name, self.profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """Собирает времена импортов, фаз и отметок от начала запуска."""
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.imports: Dict[str, Tuple[float, float]] = {}   # модуль → (всего, без вложенных), с
+        self.phases: List[Tuple[str, float]] = []
+        self.marks: List[Tuple[str, float]] = []
+        self._stack: List[List[Any]] = []    # [модуль, начало, время вложенных]
+        self._finder = _TimingFinder(self)
+        self.reported = False
+
+    def install(self) -> None:
+        if self._finder not in sys.meta_path:
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self) -> None:
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def mark(self, name: str) -> None:
+        """Отмечает событие (например, первую отрисовку) временем от начала."""
+        if name not in dict(self.marks):
+            self.marks.append((name, time.perf_counter() - self.origin))
+
+    def _enter_import(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit_import(self, name: str) -> None:
+        _, started, nested = self._stack.pop()
+        total = time.perf_counter() - started
+        self.imports[name] = (total, total - nested)
+        if self._stack:
+            self._stack[-1][2] += total
+
+    def report(self, top: int = 15) -> str:
+        """Текстовый отчёт: самые дорогие импорты, фазы и отметки."""
+        lines = ["Профиль запуска", "", f"Импорты (топ {top} по собственному времени), мс:"]
+        top_imports = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        for name, (total, own) in top_imports:
+            lines.append(f"  {own * 1000:8.1f} собств. {total * 1000:8.1f} всего  {name}")
+        roots = sum(total for name, (total, _) in self.imports.items() if '.' not in name)
+        lines.append(f"  Итого импортов верхнего уровня: {roots * 1000:.1f} мс ({len(self.imports)} модулей)")
+        lines += ["", "Фазы инициализации, мс:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {seconds * 1000:8.1f}  {name}")
+        lines += ["", "С начала запуска, мс:"]
+        for name, seconds in self.marks:
+            lines.append(f"  {seconds * 1000:8.1f}  {name}")
+        return "\n".join(lines)
+
+
+def start(origin: Optional[float] = None) -> StartupProfiler:
+    """Включает профилирование; импорты замеряются с этого момента."""
+    global _profiler
+    _profiler = StartupProfiler(origin)
+    _profiler.install()
+    return _profiler
+
+
+def active() -> Optional[StartupProfiler]:
+    return _profiler
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    if _profiler is None:
+        yield
+        return
+    with _profiler.phase(name):
+        yield
+
+
+def mark(name: str) -> None:
+    if _profiler is not None:
+        _profiler.mark(name)
+
+
+def finish() -> Optional[str]:
+    """Снимает замер импортов и печатает отчёт (один раз)."""
+    if _profiler is None or _profiler.reported:
+        return None
+    _profiler.uninstall()
+    _profiler.reported = True
+    text = _profiler.report()
+    print(text)
+    return text
@@ -0,0 +1,54 @@
+"""Нормализация и токенизация текста заметок.
+
+Учитывает кириллицу: приводит к нижнему регистру, заменяет «ё» на «е» и
+отрезает типичные окончания, чтобы «заметки» и «заметкой» совпадали.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterator, List, Tuple
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+# Окончания от длинных к коротким; отрезается самое длинное подходящее
+_RU_ENDINGS = sorted((
+    "иями", "ями", "ами", "иях", "ях", "ах", "ией", "ей", "ой", "ий", "ый", "ая", "яя",
+    "ое", "ее", "ие", "ые", "ого", "его", "ому", "ему", "ыми", "ими", "ую", "юю",
+    "ом", "ем", "ам", "ям", "ов", "ев", "ть", "ться", "тся", "ешь", "ет",
+    "ете", "ют", "ут", "ит", "им", "ите", "ят", "ла", "ло", "ли", "ся", "сь",
+    "ия", "ью", "ию", "а", "я", "о", "е", "ы", "и", "у", "ю", "ь", "й",
+), key=len, reverse=True)
+_EN_ENDINGS = ("ing", "ed", "s")
+_MIN_STEM = 3
+
+
+def normalize(text: str) -> str:
+    """Приводит текст к нижнему регистру и заменяет «ё» на «е»."""
+    return text.lower().replace("ё", "е")
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Упрощённый стемминг: отрезает окончание, оставляя основу от 3 букв."""
+    endings = _EN_ENDINGS if word.isascii() else _RU_ENDINGS
+    for ending in endings:
+        if word.endswith(ending) and len(word) - len(ending) >= _MIN_STEM:
+            return word[:-len(ending)]
+    return word
+
+
+@lru_cache(maxsize=131072)
+def term(word: str) -> str:
+    """Превращает слово в терм индекса (нормализация + стемминг)."""
+    return stem(normalize(word))
+
+
+def iter_tokens(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Возвращает термы вместе с позициями слов в исходном тексте."""
+    for match in _WORD_RE.finditer(text):
+        yield term(match.group()), match.start(), match.end()
+
+
+def tokenize(text: str) -> List[str]:
+    """Разбивает текст на нормализованные термы."""
+    return [term(word) for word in _WORD_RE.findall(text)]
@@ -3,35 +3,44 @@
 Запускает приложение для снятия стресса с настройкой темы и иконки.
 """
 
-from ui.main_window import MainWindow
-import customtkinter as ctk
+import time
 
+_STARTED = time.perf_counter()
 
-def start_app() -> None:
-    """Оптимизированный запуск приложения."""
+import argparse
+import sys
+
+from core.utils import startup_profiler
+
+
+def start_app(profile_startup: bool = False) -> None:
+    """Оптимизированный запуск приложения.
+    
+    Args:
+        profile_startup: Замерить импорты, фазы инициализации и время до
+            первой отрисовки и вывести отчёт
+    """
     try:
+        if profile_startup:
+            startup_profiler.start(origin=_STARTED)
+        
+        # Окно и CustomTkinter импортируются здесь, чтобы их импорт попал в профиль
+        with startup_profiler.phase("import customtkinter"):
+            import customtkinter as ctk
+        with startup_profiler.phase("import ui.main_window"):
+            from ui.main_window import MainWindow
+        
         # Оптимизированная настройка CustomTkinter
         ctk.set_appearance_mode("light")  # Фиксированная тема для стабильности
         ctk.set_default_color_theme("blue")
         
-        # Создание и запуск главного окна
-        app = MainWindow()
-        
-        # Обработка закрытия приложения
-        def on_closing():
-            try:
-                # Принудительное сохранение настроек
-                if hasattr(app, 'settings_manager'):
-                    app.settings_manager.force_save()
-                # Очистка анимаций
-                from ui.animations.transitions import AnimationManager
-                AnimationManager.clear_animations()
-            except Exception as e:
-                print(f"Ошибка при закрытии: {e}")
-            finally:
-                app.destroy()
+        # Создание и запуск главного окна; заметки и первый экран загружаются
+        # после первой отрисовки (см. MainWindow._finish_startup)
+        with startup_profiler.phase("MainWindow()"):
+            app = MainWindow()
         
-        app.protocol("WM_DELETE_WINDOW", on_closing)
+        # Закрытие окна завершает работу так же, как кнопка «Выход»
+        app.protocol("WM_DELETE_WINDOW", app.shutdown)
         app.mainloop()
         
     except Exception as e:
@@ -40,5 +49,15 @@ def start_app() -> None:
         traceback.print_exc()
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Relieve Stress")
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="вывести время импортов, фаз инициализации и до первой отрисовки"
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    start_app()
+    args = parse_args(sys.argv[1:])
+    start_app(profile_startup=args.profile_startup)
@@ -0,0 +1,32 @@
+"""Консольная утилита заметок (core.cli)."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.cli import open_service
+
+
+class OpenServiceTest(unittest.TestCase):
+    def test_separate_sqlite_db_does_not_import_app_notes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            data = Path(tmp) / "data"
+            data.mkdir()
+            (data / "notes.json").write_text(json.dumps([{
+                "id": "app", "text": "заметка приложения", "category": "Поддержка",
+                "created_at": "2024-01-01T12:00:00", "is_favorite": False,
+            }], ensure_ascii=False), encoding="utf-8")
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                service = open_service("sqlite", str(Path(tmp) / "scratch.db"))
+                self.assertEqual(service.get_notes(), [])
+                service.close()
+            finally:
+                os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Потоковый разбор файла заметок (core.services.note_loader)."""
+
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.services.note_loader import iter_json_array, load_notes_file
+
+
+def _record(note_id: str, text: str) -> dict:
+    return {
+        "id": note_id,
+        "text": text,
+        "category": "Поддержка",
+        "created_at": "2024-01-01T12:00:00",
+        "is_favorite": False,
+    }
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    def test_long_note_is_not_treated_as_corrupt(self):
+        # Незакрытая строка длиннее нескольких блоков чтения — не повреждение
+        for size in (200 * 1024, 300 * 1024):
+            records = [_record("a", "x" * size), _record("b", "короткая")]
+            items = list(iter_json_array(io.StringIO(json.dumps(records, ensure_ascii=False))))
+            self.assertEqual([raw for _, raw in items], [None, None])
+            self.assertEqual(len(items[0][0]["text"]), size)
+            self.assertEqual(items[1][0]["id"], "b")
+
+    def test_corrupt_record_is_skipped(self):
+        text = '[{"id": "a", "text": "ok"}, {"id": "b", "text": }, {"id": "c", "text": "ok"}]'
+        items = list(iter_json_array(io.StringIO(text), chunk_size=16))
+        self.assertEqual([value["id"] for value, raw in items if raw is None], ["a", "c"])
+        self.assertEqual(sum(1 for _, raw in items if raw is not None), 1)
+
+
+class LoadNotesFileTest(unittest.TestCase):
+    def test_long_note_survives_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "notes.json"
+            quarantine = Path(tmp) / "rejected.jsonl"
+            path.write_text(json.dumps([_record("a", "x" * (256 * 1024))]), encoding="utf-8")
+            notes = []
+            report = load_notes_file(path, notes.append, quarantine)
+            self.assertEqual(report.records, 1)
+            self.assertEqual(report.rejected, 0)
+            self.assertFalse(quarantine.exists())
+            self.assertEqual(len(notes[0].text), 256 * 1024)
+
+    def test_rejected_records_are_quarantined_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "notes.json"
+            quarantine = Path(tmp) / "rejected.jsonl"
+            path.write_text(
+                '[' + json.dumps(_record("a", "ok")) + ', {"id": "b", "text": }, {"id": "c"}]',
+                encoding="utf-8",
+            )
+            for _ in range(3):
+                report = load_notes_file(path, lambda note: None, quarantine)
+                self.assertEqual(report.rejected, 2)
+            lines = quarantine.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(len(lines), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
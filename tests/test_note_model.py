@@ -0,0 +1,28 @@
+"""Модель заметки (core.models.note)."""
+
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from core.models.note import Note
+
+
+class NoteDatesTest(unittest.TestCase):
+    def test_naive_dates_round_trip(self):
+        record = {
+            "id": "a", "text": "текст", "category": "Поддержка",
+            "created_at": "2024-03-01T12:30:45.123456",
+            "updated_at": "2024-03-02T08:00:00", "is_favorite": True,
+        }
+        self.assertEqual(Note.from_dict(record).to_dict(), record)
+
+    def test_aware_dates_are_rejected(self):
+        with self.assertRaises(ValueError):
+            Note.from_dict({"id": "a", "text": "текст", "category": "Поддержка",
+                            "created_at": "2024-03-01T12:30:00+03:00"})
+        note = Note("a", "текст", "Поддержка", datetime(2024, 3, 1))
+        with self.assertRaises(ValueError):
+            note.updated_at = datetime(2024, 3, 1, tzinfo=timezone(timedelta(hours=3)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""Планировщик задач интерфейса (ui.scheduler)."""
+
+import contextlib
+import io
+import unittest
+
+from ui.scheduler import UIScheduler
+
+
+class FakeRoot:
+    """Вместо цикла событий Tk: отложенные вызовы копятся и запускаются вручную."""
+
+    def __init__(self):
+        self.jobs = {}
+        self._next = 0
+
+    def after(self, delay, callback):
+        self._next += 1
+        self.jobs[self._next] = callback
+        return self._next
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_pending(self, limit=100):
+        for _ in range(limit):
+            if not self.jobs:
+                return
+            job = min(self.jobs)
+            self.jobs.pop(job)()
+
+
+class UISchedulerTest(unittest.TestCase):
+    def test_failing_on_done_does_not_stall_queue(self):
+        root = FakeRoot()
+        scheduler = UIScheduler(root, budget_ms=0)
+        finished = []
+
+        def fail():
+            raise RuntimeError("обработчик упал")
+
+        first = scheduler.submit(iter([1]), on_done=fail)
+        second = scheduler.submit(iter([1, 2]), on_done=lambda: finished.append("second"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            root.run_pending()
+
+        self.assertTrue(first.done)
+        self.assertIsInstance(first.error, RuntimeError)
+        self.assertEqual(finished, ["second"])
+        self.assertEqual(scheduler.pending(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
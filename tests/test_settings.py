@@ -0,0 +1,29 @@
+"""Запись настроек (config.settings)."""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from config.settings import SettingsManager
+
+
+class SettingsWriteTest(unittest.TestCase):
+    def test_failed_write_is_reported_by_force_save(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manager = SettingsManager(str(Path(tmp) / "settings.json"), save_delay=0)
+            output = io.StringIO()
+            with mock.patch("config.settings.atomic_write_text", side_effect=OSError("диск заполнен")), \
+                    contextlib.redirect_stdout(output):
+                self.assertFalse(manager.force_save())
+            self.assertIn("Ошибка сохранения настроек: диск заполнен", output.getvalue())
+            self.assertEqual(manager.get_write_stats()["last_error"], "диск заполнен")
+
+            self.assertTrue(manager.force_save())
+            self.assertTrue((Path(tmp) / "settings.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Хранилище заметок на SQLite (core.services.sqlite_note_service)."""
+
+import json
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core.services import sqlite_note_service
+from core.services.sqlite_note_service import SqliteNoteService
+
+
+def _write_json_notes(path: Path, count: int) -> None:
+    path.write_text(json.dumps([{
+        "id": f"note-{i}", "text": f"заметка {i}", "category": "Поддержка",
+        "created_at": "2024-01-01T12:00:00", "is_favorite": False,
+    } for i in range(count)], ensure_ascii=False), encoding="utf-8")
+
+
+class MigrationTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.dir = Path(self._tmp.name)
+        self.db_file = str(self.dir / "notes.db")
+        self.json_file = str(self.dir / "notes.json")
+        _write_json_notes(Path(self.json_file), 3)
+
+    def test_interrupted_migration_is_retried(self):
+        real = sqlite_note_service._note_to_row
+        calls = []
+
+        def failing(note):
+            calls.append(note)
+            if len(calls) == 2:
+                raise OSError("нет места на диске")
+            return real(note)
+
+        with mock.patch.object(sqlite_note_service, "_note_to_row", side_effect=failing):
+            with self.assertRaises(OSError):
+                SqliteNoteService(self.db_file, self.json_file)
+        conn = sqlite3.connect(self.db_file)
+        self.assertEqual(conn.execute("PRAGMA user_version").fetchone()[0], 0)
+        conn.close()
+
+        service = SqliteNoteService(self.db_file, self.json_file)
+        self.assertEqual(len(service.get_notes()), 3)
+        service.close()
+
+    def test_completed_migration_is_not_repeated(self):
+        service = SqliteNoteService(self.db_file, self.json_file)
+        service.delete_note("note-0")
+        service.close()
+
+        service = SqliteNoteService(self.db_file, self.json_file)
+        self.assertEqual(sorted(note.id for note in service.get_notes()), ["note-1", "note-2"])
+        service.close()
+
+
+class FullTextSearchTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.db_file = str(Path(self._tmp.name) / "notes.db")
+        self.service = SqliteNoteService(self.db_file, json_file=None)
+        self.addCleanup(lambda: self.service.close())
+
+    def _ids(self, query, **kwargs):
+        return [result.note.id for result in self.service.search(query, **kwargs)]
+
+    def test_matches_word_forms_and_ranks_by_bm25(self):
+        once = self.service.add_note("Дыхательная практика и заметки на день", "Поддержка")
+        twice = self.service.add_note("Заметка о заметках", "Мотивация")
+        self.service.add_note("Прогулка в парке", "Поддержка")
+        self.assertEqual(self._ids("заметки"), [twice.id, once.id])
+        self.assertEqual(self._ids("заметки", category="Поддержка"), [once.id])
+        self.assertEqual(self._ids("заметки", limit=1), [twice.id])
+        self.assertEqual(self._ids("заметки парк"), [])
+        result = self.service.search("прогулки")[0]
+        self.assertEqual(result.matches, [(0, 8)])
+
+    def test_index_follows_changes(self):
+        note = self.service.add_note("Старый текст", "Поддержка")
+        self.service.update_note(note.id, "Новый текст")
+        self.assertEqual(self._ids("старый"), [])
+        self.assertEqual(self._ids("новый"), [note.id])
+        # INSERT OR REPLACE меняет rowid строки: индекс не должен раздвоиться
+        self.service.insert_notes([self.service.get_note(note.id)])
+        self.assertEqual(self._ids("текст"), [note.id])
+        self.service.delete_note(note.id)
+        self.assertEqual(self._ids("текст"), [])
+
+    def test_index_is_built_for_existing_database(self):
+        note = self.service.add_note("Спокойное утро", "Поддержка")
+        self.service._conn.execute("DELETE FROM notes_fts")
+        self.service._conn.execute("PRAGMA user_version = 1")
+        self.service._conn.commit()
+        self.service.close()
+        self.service = SqliteNoteService(self.db_file, json_file=None)
+        self.assertEqual(self._ids("утро"), [note.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Триграммный индекс нечёткого поиска (core.services.trigram_index)."""
+
+import threading
+import unittest
+from datetime import datetime
+
+from core.models.note import Note
+from core.services.trigram_index import BackgroundTrigramIndex, TrigramIndex
+
+
+def _note(note_id: str, text: str, category: str = "Поддержка") -> Note:
+    return Note(id=note_id, text=text, category=category, created_at=datetime(2024, 1, 1))
+
+
+class TrigramIndexTest(unittest.TestCase):
+    def test_prune_keeps_note_grams_in_sync_with_postings(self):
+        notes = [_note(str(i), f"общий текст заметки номер {i} слово{i}") for i in range(200)]
+        index = TrigramIndex(notes, max_postings=4000)
+        self.assertLessEqual(index.size, index.max_postings)
+        postings = sum(len(ids) for ids in index._postings.values())
+        doc_grams = sum(len(grams) for grams in index._doc_grams.values())
+        self.assertEqual(index.size, postings + doc_grams)
+        self.assertEqual(postings, doc_grams)
+        for doc_id, grams in index._doc_grams.items():
+            for gram in grams:
+                self.assertIn(doc_id, index._postings[gram])
+
+        index.remove("0")
+        self.assertEqual(index.size, sum(len(ids) for ids in index._postings.values())
+                         + sum(len(grams) for grams in index._doc_grams.values()))
+
+    def test_typo_in_frequent_word_is_found_after_prune(self):
+        # Частые слова есть в каждой заметке: их списки урезаются первыми
+        notes = [_note(str(i), f"дыхание и медитация перед сном, запись {i} про слово{i}")
+                 for i in range(3000)]
+        notes.append(_note("rare", "прогулка по набережной"))
+        index = TrigramIndex(notes, max_postings=60000)
+        self.assertLessEqual(index.size, index.max_postings)
+        self.assertTrue(index._limits)
+        get = {note.id: note for note in notes}.get
+        for typo, word in (("дыхане", "дыхание"), ("медитацыя", "медитация"),
+                           ("набережнйо", "набережной")):
+            results = index.search(typo, get, limit=10)
+            self.assertTrue(results, typo)
+            self.assertTrue(all(word in result.note.text for result in results), typo)
+
+    def test_allowed_limits_results_before_top(self):
+        notes = [_note(str(i), "привет мир", "Работа") for i in range(50)]
+        notes.append(_note("home", "привет мир", "Дом"))
+        index = TrigramIndex(notes)
+        results = index.search("привет", {note.id: note for note in notes}.get,
+                               limit=5, allowed={"home"})
+        self.assertEqual([result.note.id for result in results], ["home"])
+
+
+
+class BackgroundTrigramIndexTest(unittest.TestCase):
+    def test_search_waits_for_build_and_replays_changes(self):
+        loading = threading.Event()
+        release = threading.Event()
+        notes = [_note("1", "прогулка по набережной"), _note("2", "дыхательная гимнастика")]
+
+        def load():
+            loading.set()
+            release.wait(5)
+            return list(notes)
+
+        index = BackgroundTrigramIndex(load)
+        get = {note.id: note for note in notes}.get
+        self.assertIsNone(index.search("набережнйо", get))
+        index.start()
+        self.assertTrue(loading.wait(5))
+        # Изменения во время построения применяются к готовому индексу
+        added = _note("3", "медитация перед сном")
+        notes.append(added)
+        index.add(added)
+        index.remove("2")
+        self.assertIsNone(index.search("набережнйо", get))
+        release.set()
+        self.assertTrue(index.wait(5))
+
+        get = {note.id: note for note in notes}.get
+        self.assertEqual([r.note.id for r in index.search("набережнйо", get)], ["1"])
+        self.assertEqual([r.note.id for r in index.search("медитацыя", get)], ["3"])
+        self.assertEqual(index.search("гимнастика", get), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Сторож зависаний цикла событий (ui.watchdog)."""
+
+import time
+import unittest
+
+from ui.watchdog import StallWatchdog
+
+
+class FakeRoot:
+    """Вместо цикла событий Tk: сердцебиение запускается тестом вручную."""
+
+    def __init__(self):
+        self.jobs = {}
+        self._next = 0
+
+    def after(self, delay, callback):
+        self._next += 1
+        self.jobs[self._next] = callback
+        return self._next
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_pending(self):
+        jobs, self.jobs = self.jobs, {}
+        for callback in jobs.values():
+            callback()
+
+
+class StallWatchdogTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.watchdog = StallWatchdog(self.root, interval_ms=10, threshold_ms=200, log_path=None)
+        self.addCleanup(self.watchdog.stop)
+
+    def _stall(self, seconds):
+        # Главный поток занят: сердцебиение не приходит, пока он не освободится
+        time.sleep(seconds)
+
+    def test_stall_is_counted_and_its_stack_sampled(self):
+        self.watchdog.start()
+        time.sleep(0.01)
+        self.root.run_pending()
+        self._stall(0.3)
+        self.root.run_pending()
+
+        stats = self.watchdog.stats()
+        self.assertEqual(stats['beats'], 2)
+        self.assertEqual(stats['stalls'], 1)
+        self.assertEqual(stats['latency']['buckets']['<=500'], 1)
+        self.assertEqual(stats['stack_samples'], 1)
+        stall = self.watchdog.stalls()[0]
+        self.assertGreaterEqual(stall.duration_ms, 200)
+        self.assertIn("_stall", stall.stack)
+
+    def test_stop_cancels_heartbeat(self):
+        self.watchdog.start()
+        self.watchdog.stop()
+        self.assertFalse(self.watchdog.running)
+        self.assertEqual(self.root.jobs, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Кривые сглаживания и интерполяция значений для анимаций.
+
+Кривая получает долю прошедшего времени от 0 до 1 и возвращает долю
+пути; интерполятор переводит долю пути в значение свойства (число,
+цвет "#rrggbb", координаты).
+"""
+
+import math
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
+
+Easing = Callable[[float], float]
+
+
+def linear(t: float) -> float:
+    return t
+
+
+def ease_in_quad(t: float) -> float:
+    return t * t
+
+
+def ease_out_quad(t: float) -> float:
+    return t * (2 - t)
+
+
+def ease_in_out_quad(t: float) -> float:
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+def ease_out_cubic(t: float) -> float:
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_cubic(t: float) -> float:
+    return 4 * t ** 3 if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+
+def ease_out_back(t: float) -> float:
+    # Небольшой перелёт за конечное значение и возврат
+    c1 = 1.70158
+    c3 = c1 + 1
+    return 1 + c3 * (t - 1) ** 3 + c1 * (t - 1) ** 2
+
+
+def wave(cycles: int = 1) -> Easing:
+    """Туда и обратно cycles раз: 0 → 1 → 0 (для пульсации)."""
+    def curve(t: float) -> float:
+        return abs(math.sin(math.pi * cycles * t))
+    return curve
+
+
+EASINGS: Dict[str, Easing] = {
+    "linear": linear,
+    "ease_in": ease_in_quad,
+    "ease_out": ease_out_quad,
+    "ease_in_out": ease_in_out_quad,
+    "ease_out_cubic": ease_out_cubic,
+    "ease_in_out_cubic": ease_in_out_cubic,
+    "ease_out_back": ease_out_back,
+}
+
+
+def get_easing(easing: Union[str, Easing, None]) -> Easing:
+    """Кривая по имени из EASINGS или сама функция."""
+    if easing is None:
+        return ease_out_cubic
+    if callable(easing):
+        return easing
+    try:
+        return EASINGS[easing]
+    except KeyError:
+        raise ValueError(f"Неизвестная кривая анимации: {easing}") from None
+
+
+def lerp(start: float, end: float, t: float) -> float:
+    return start + (end - start) * t
+
+
+def lerp_int(start: int, end: int, t: float) -> int:
+    return int(round(lerp(start, end, t)))
+
+
+def lerp_point(start: Sequence[float], end: Sequence[float], t: float) -> Tuple[int, ...]:
+    return tuple(lerp_int(a, b, t) for a, b in zip(start, end))
+
+
+def parse_hex(color: str) -> Optional[Tuple[int, int, int]]:
+    """"#rrggbb" или "#rgb" → (r, g, b); None для прочих значений ("transparent", имена)."""
+    if not isinstance(color, str) or not color.startswith("#"):
+        return None
+    digits = color[1:]
+    if len(digits) == 3:
+        digits = "".join(c * 2 for c in digits)
+    if len(digits) != 6:
+        return None
+    try:
+        return int(digits[0:2], 16), int(digits[2:4], 16), int(digits[4:6], 16)
+    except ValueError:
+        return None
+
+
+def to_hex(rgb: Sequence[int]) -> str:
+    return "#{:02x}{:02x}{:02x}".format(*(max(0, min(255, c)) for c in rgb))
+
+
+def color_interpolator(start: str, end: str) -> Optional[Callable[[float], str]]:
+    """Интерполятор между двумя цветами; None, если цвета не в формате "#rrggbb"."""
+    a, b = parse_hex(start), parse_hex(end)
+    if a is None or b is None:
+        return None
+
+    def interpolate(t: float) -> str:
+        return to_hex(lerp_point(a, b, t))
+    return interpolate
@@ -0,0 +1,250 @@
+"""Общие часы кадров для анимаций.
+
+Все активные анимации окна продвигаются одним обратным вызовом after,
+а не собственными цепочками таймеров. Прогресс считается по реальному
+времени, поэтому пропущенный или запоздавший кадр не растягивает
+анимацию — она просто делает более длинный шаг. Если кадр обходится
+дороже бюджета, часы снижают частоту (60 → 30 → 15 кадров в секунду),
+а при стабильно дешёвых кадрах возвращают её обратно. Когда анимаций
+нет, часы останавливаются и не нагружают цикл событий.
+"""
+
+import time
+import weakref
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ui.animations.easing import Easing, get_easing
+
+_clocks: "weakref.WeakSet[FrameClock]" = weakref.WeakSet()
+
+
+class Animation:
+    """Одна анимация: по доле пути вызывает apply, в конце — on_done."""
+
+    def __init__(self, widget: Any, duration: float, apply: Callable[[float], None],
+                 easing: Optional[Easing] = None, on_done: Optional[Callable[[], None]] = None,
+                 channel: Hashable = None):
+        """Инициализирует анимацию.
+
+        Args:
+            widget: Виджет; анимация снимается, когда он уничтожен
+            duration: Длительность в секундах
+            apply: Применяет к виджету состояние для доли пути (после кривой)
+            easing: Кривая сглаживания (по умолчанию ease_out_cubic)
+            on_done: Вызывается после последнего кадра
+            channel: Анимируемое свойство; новая анимация того же виджета
+                и свойства завершает предыдущую
+        """
+        self.widget = widget
+        self.duration = max(0.0, duration)
+        self.apply = apply
+        self.easing = get_easing(easing)
+        self.on_done = on_done
+        self.channel = channel
+        self.started: Optional[float] = None
+        self.done = False
+        self.cancelled = False
+
+    @property
+    def active(self) -> bool:
+        return not (self.done or self.cancelled)
+
+    def step(self, now: float) -> bool:
+        """Применяет кадр для момента now; True, если анимация закончилась."""
+        if self.started is None:
+            self.started = now
+        elapsed = now - self.started
+        progress = 1.0 if self.duration <= 0 else min(1.0, elapsed / self.duration)
+        self.apply(self.easing(progress))
+        return progress >= 1.0
+
+    def finish(self) -> None:
+        """Сразу переводит виджет в конечное состояние."""
+        if not self.active:
+            return
+        self.done = True
+        self.apply(self.easing(1.0))
+        if self.on_done is not None:
+            self.on_done()
+
+    def cancel(self) -> None:
+        """Останавливает анимацию там, где она есть, без on_done."""
+        self.cancelled = True
+
+
+class FrameClock:
+    """Продвигает все анимации окна одним таймером."""
+
+    FPS_LEVELS = (60, 30, 15)
+
+    def __init__(self, root, fps: int = 60, budget_ratio: float = 0.5):
+        """Инициализирует часы.
+
+        Args:
+            root: Виджет, через after которого идут кадры (обычно корневое окно)
+            fps: Целевая частота кадров
+            budget_ratio: Какую долю интервала кадра могут занимать анимации
+        """
+        self.root = root
+        self.levels = tuple(level for level in self.FPS_LEVELS if level <= fps) or (fps,)
+        self._level = 0
+        self.budget_ratio = budget_ratio
+        self._animations: Dict[Tuple[Any, Hashable], Animation] = {}
+        self._job = None
+        self._last_tick: Optional[float] = None
+        self._cost_ms = 0.0       # Сглаженная стоимость кадра
+        self._cheap_ticks = 0
+        self.ticks = 0
+        self.skipped_frames = 0
+        self.max_tick_ms = 0.0
+        _clocks.add(self)
+
+    @property
+    def fps(self) -> int:
+        return self.levels[self._level]
+
+    @property
+    def interval_ms(self) -> int:
+        return max(1, int(1000 / self.fps))
+
+    def start(self, animation: Animation) -> Animation:
+        """Запускает анимацию; первый кадр (доля 0) применяется сразу."""
+        key = (animation.widget, animation.channel if animation.channel is not None else id(animation))
+        previous = self._animations.pop(key, None)
+        if previous is not None:
+            # Новая анимация стартует от конечного состояния прежней
+            previous.finish()
+        animation.started = time.perf_counter()
+        animation.apply(animation.easing(0.0))
+        self._animations[key] = animation
+        self._schedule()
+        return animation
+
+    def finish(self, widget: Any, channel: Hashable) -> bool:
+        """Доводит до конца анимацию свойства channel, чтобы прочитать его итоговое значение."""
+        animation = self._animations.pop((widget, channel), None)
+        if animation is None:
+            return False
+        animation.finish()
+        return True
+
+    def cancel_widget(self, widget: Any) -> int:
+        """Останавливает все анимации виджета."""
+        keys = [key for key in self._animations if key[0] is widget]
+        for key in keys:
+            self._animations.pop(key).cancel()
+        return len(keys)
+
+    def cancel_all(self) -> None:
+        for animation in self._animations.values():
+            animation.cancel()
+        self._animations.clear()
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        self._last_tick = None
+
+    def active(self) -> int:
+        return len(self._animations)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'active': self.active(),
+            'fps': self.fps,
+            'ticks': self.ticks,
+            'skipped_frames': self.skipped_frames,
+            'tick_ms': round(self._cost_ms, 3),
+            'max_tick_ms': round(self.max_tick_ms, 3),
+        }
+
+    def _schedule(self) -> None:
+        if self._job is not None or not self._animations:
+            return
+        self._job = self.root.after(self.interval_ms, self._tick)
+
+    def _tick(self) -> None:
+        self._job = None
+        now = time.perf_counter()
+        interval = self.interval_ms / 1000
+        if self._last_tick is not None:
+            # Кадры, которые цикл событий не успел дать (он был занят)
+            late = now - self._last_tick - interval
+            if late > interval:
+                self.skipped_frames += int(late / interval)
+        self._last_tick = now
+
+        finished: List[Tuple[Tuple[Any, Hashable], Animation]] = []
+        for key, animation in list(self._animations.items()):
+            if not self._widget_alive(animation.widget):
+                animation.cancel()
+                finished.append((key, animation))
+                continue
+            try:
+                if animation.step(now):
+                    finished.append((key, animation))
+            except Exception as e:
+                # Виджет уничтожен между проверкой и кадром или не поддерживает свойство
+                animation.cancel()
+                finished.append((key, animation))
+                print(f"Ошибка анимации: {e}")
+        for key, animation in finished:
+            # on_done предыдущей анимации мог уже запустить новую с тем же ключом
+            if self._animations.get(key) is animation:
+                del self._animations[key]
+            if animation.active:
+                animation.done = True
+                if animation.on_done is not None:
+                    animation.on_done()
+
+        cost_ms = (time.perf_counter() - now) * 1000
+        self.ticks += 1
+        self.max_tick_ms = max(self.max_tick_ms, cost_ms)
+        self._adapt(cost_ms)
+        if self._animations:
+            self._schedule()
+        else:
+            self._last_tick = None
+
+    def _adapt(self, cost_ms: float) -> None:
+        self._cost_ms = cost_ms if self.ticks == 1 else self._cost_ms * 0.8 + cost_ms * 0.2
+        budget_ms = 1000 / self.fps * self.budget_ratio
+        if self._cost_ms > budget_ms and self._level < len(self.levels) - 1:
+            self._level += 1
+            self._cheap_ticks = 0
+        elif self._cost_ms < budget_ms / 4 and self._level > 0:
+            # Частота возвращается, только если кадры дёшевы долго, а не один раз
+            self._cheap_ticks += 1
+            if self._cheap_ticks >= 30:
+                self._level -= 1
+                self._cheap_ticks = 0
+        else:
+            self._cheap_ticks = 0
+
+    @staticmethod
+    def _widget_alive(widget: Any) -> bool:
+        exists = getattr(widget, 'winfo_exists', None)
+        if exists is None:
+            return True
+        try:
+            return bool(exists())
+        except Exception:
+            return False
+
+
+def get_frame_clock(widget) -> FrameClock:
+    """Общие часы кадров окна, которому принадлежит widget."""
+    root = widget._root()
+    clock = getattr(root, '_frame_clock', None)
+    if clock is None:
+        clock = FrameClock(root)
+        root._frame_clock = clock
+    return clock
+
+
+def cancel_all_animations() -> None:
+    """Останавливает анимации во всех окнах (например, при закрытии приложения)."""
+    for clock in list(_clocks):
+        clock.cancel_all()
@@ -1,115 +1,230 @@
 """Оптимизированный менеджер анимаций.
 
-Обеспечивает плавные анимации без блокировки UI.
+Обеспечивает плавные анимации без блокировки UI: все эффекты
+продвигаются общими часами кадров окна (см. frame_clock).
 """
 
+import tkinter
+import weakref
 import customtkinter as ctk
-from typing import Callable, Optional, Literal, Set
-import threading
-import time
+from typing import Any, Callable, Literal, Optional, Tuple
+
+from ui.animations.easing import color_interpolator, ease_out_cubic, lerp_int, lerp_point, wave
+from ui.animations.frame_clock import Animation, cancel_all_animations, get_frame_clock
 
 
 class AnimationManager:
     """Оптимизированный менеджер анимаций."""
-    
-    # Оптимизированные константы
-    _DEFAULT_STEPS = 10  # Уменьшено для производительности
-    _SCALE_STEPS = 8     # Уменьшено для производительности
-    _MIN_STEP_TIME = 0.016  # ~60 FPS
-    _active_animations: Set[str] = set()  # Отслеживание активных анимаций
-    
+
+    _SLIDE_DISTANCE = 40   # Смещение в начале slide_in, пикселей
+    _PULSE_RADIUS = 4      # На сколько растёт скругление при пульсации
+    _enabled = True
+    # Исходный размер виджетов, которые сейчас масштабированы
+    _base_sizes: "weakref.WeakKeyDictionary[Any, Tuple[int, int]]" = weakref.WeakKeyDictionary()
+
     @staticmethod
-    def fade_in(widget: ctk.CTkBaseClass, duration: float = 0.2, 
+    def set_enabled(enabled: bool) -> None:
+        """Включает или отключает анимации (настройка animations_enabled)."""
+        AnimationManager._enabled = bool(enabled)
+        if not enabled:
+            cancel_all_animations()
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return AnimationManager._enabled
+
+    @staticmethod
+    def fade_in(widget: ctk.CTkBaseClass, duration: float = 0.2,
                 callback: Optional[Callable] = None) -> None:
-        """Оптимизированная анимация появления."""
-        widget_id = str(id(widget))
-        if widget_id in AnimationManager._active_animations:
+        """Появление: цвета виджета переходят от фона родителя к своим."""
+        AnimationManager._settle(widget, "fade")
+        channels = []
+        background = AnimationManager._parent_color(widget)
+        for option in ("fg_color", "text_color"):
+            target = AnimationManager._color(widget, option)
+            interpolate = color_interpolator(background, target) if background and target else None
+            if interpolate is not None:
+                channels.append((option, interpolate))
+        if not channels or not AnimationManager._enabled:
+            if callback:
+                callback()
             return
-            
-        def animate() -> None:
-            AnimationManager._active_animations.add(widget_id)
-            try:
-                if not widget.winfo_exists():
-                    return
-                    
-                # Простое появление без сложных вычислений
-                widget.configure(corner_radius=8)
-                if callback:
-                    callback()
-            except Exception:
-                pass
-            finally:
-                AnimationManager._active_animations.discard(widget_id)
-        
-        widget.after(10, animate)  # Используем after вместо threading
-    
+
+        def apply(t: float) -> None:
+            widget.configure(**{option: interpolate(t) for option, interpolate in channels})
+
+        AnimationManager._run(widget, duration, apply, channel="fade", on_done=callback)
+
     @staticmethod
-    def slide_in(widget: ctk.CTkBaseClass, 
-                 direction: Literal["left", "right", "up", "down"] = "left", 
+    def slide_in(widget: ctk.CTkBaseClass,
+                 direction: Literal["left", "right", "up", "down"] = "left",
                  duration: float = 0.15) -> None:
-        """Упрощенная анимация скольжения."""
-        widget_id = str(id(widget))
-        if widget_id in AnimationManager._active_animations:
+        """Скольжение: виджет движется в направлении direction к своему месту.
+
+        Размещённые через place сдвигаются по координатам, упакованные через
+        pack — временным отступом со стороны, откуда они приходят.
+        """
+        if not AnimationManager._enabled or not widget.winfo_exists():
             return
-            
-        def animate() -> None:
-            AnimationManager._active_animations.add(widget_id)
-            try:
-                if widget.winfo_exists():
-                    # Простое появление без сложной анимации позиции
-                    widget.configure(corner_radius=8)
-            except Exception:
-                pass
-            finally:
-                AnimationManager._active_animations.discard(widget_id)
-        
-        widget.after(10, animate)
-    
+        AnimationManager._settle(widget, "position")
+        distance = AnimationManager._SLIDE_DISTANCE
+        manager = widget.winfo_manager()
+        if manager == "place":
+            info = widget.place_info()
+            end = (AnimationManager._int(info.get("x")), AnimationManager._int(info.get("y")))
+            dx, dy = {"left": (distance, 0), "right": (-distance, 0),
+                      "up": (0, distance), "down": (0, -distance)}[direction]
+            start = (end[0] + dx, end[1] + dy)
+
+            def apply(t: float) -> None:
+                x, y = lerp_point(start, end, t)
+                # Координаты из place_info уже в пикселях экрана, без масштабирования CTk
+                tkinter.Place.place_configure(widget, x=x, y=y)
+        elif manager == "pack":
+            info = widget.pack_info()
+            end_x = AnimationManager._pad(info.get("padx"))
+            end_y = AnimationManager._pad(info.get("pady"))
+            index = {"left": 0, "right": 1, "up": 0, "down": 1}[direction]
+            horizontal = direction in ("left", "right")
+            start_pad = list(end_x if horizontal else end_y)
+            start_pad[index] += distance
+            start_pad = tuple(start_pad)
+            end_pad = end_x if horizontal else end_y
+            option = "padx" if horizontal else "pady"
+
+            def apply(t: float) -> None:
+                tkinter.Pack.pack_configure(widget, **{option: lerp_point(start_pad, end_pad, t)})
+        else:
+            return
+        AnimationManager._run(widget, duration, apply, channel="position")
+
     @staticmethod
-    def scale_in(widget: ctk.CTkBaseClass, duration: float = 0.1, 
+    def scale_in(widget: ctk.CTkBaseClass, duration: float = 0.1,
                  scale_from: float = 0.8, scale_to: float = 1.0) -> None:
-        """Упрощенная анимация масштабирования."""
-        widget_id = str(id(widget))
-        if widget_id in AnimationManager._active_animations:
+        """Масштабирование: размер меняется от scale_from до scale_to исходного.
+
+        Применимо только к виджетам, размещённым через place без width,
+        height, relwidth и relheight в самом place: их размер задаётся
+        configure(width=..., height=...) и не влияет на раскладку родителя.
+        У упакованных (pack/grid) каждый кадр перестраивал бы родителя и
+        сдвигал соседей, поэтому для них вызов ничего не делает — им
+        подходит pulse.
+        """
+        if not AnimationManager._enabled or not widget.winfo_exists():
             return
-            
-        def animate() -> None:
-            AnimationManager._active_animations.add(widget_id)
-            try:
-                if widget.winfo_exists():
-                    # Простое изменение без сложных вычислений
-                    widget.configure(corner_radius=8)
-            except Exception:
-                pass
-            finally:
-                AnimationManager._active_animations.discard(widget_id)
-        
-        widget.after(5, animate)
-    
+        if not AnimationManager._free_size(widget):
+            return
+        AnimationManager._settle(widget, "size")
+        base = AnimationManager._base_sizes.get(widget) or AnimationManager._size(widget)
+        if base is None:
+            return
+        start = tuple(round(side * scale_from) for side in base)
+        end = tuple(round(side * scale_to) for side in base)
+        if scale_to == 1.0:
+            AnimationManager._base_sizes.pop(widget, None)
+        else:
+            AnimationManager._base_sizes[widget] = base
+
+        def apply(t: float) -> None:
+            width, height = lerp_point(start, end, t)
+            widget.configure(width=width, height=height)
+
+        # Без перелёта за конечный размер: виджет не бывает больше итогового
+        AnimationManager._run(widget, duration, apply, channel="size", easing=ease_out_cubic)
+
     @staticmethod
-    def pulse(widget: ctk.CTkBaseClass, duration: float = 0.3, 
+    def pulse(widget: ctk.CTkBaseClass, duration: float = 0.3,
               pulses: int = 1) -> None:
-        """Упрощенная анимация пульсации."""
-        widget_id = str(id(widget))
-        if widget_id in AnimationManager._active_animations:
+        """Пульсация: скругление углов увеличивается и возвращается pulses раз."""
+        if not AnimationManager._enabled:
             return
-            
-        def animate() -> None:
-            AnimationManager._active_animations.add(widget_id)
-            try:
-                if widget.winfo_exists():
-                    # Простой эффект без сложной анимации
-                    original_radius = widget.cget('corner_radius')
-                    widget.configure(corner_radius=12)
-                    widget.after(100, lambda: widget.configure(corner_radius=original_radius) if widget.winfo_exists() else None)
-            except Exception:
-                pass
-            finally:
-                AnimationManager._active_animations.discard(widget_id)
-        
-        widget.after(5, animate)
-    
+        AnimationManager._settle(widget, "corner_radius")
+        try:
+            base = int(widget.cget('corner_radius'))
+        except (ValueError, TypeError, tkinter.TclError):
+            return
+        peak = base + AnimationManager._PULSE_RADIUS
+
+        def apply(t: float) -> None:
+            widget.configure(corner_radius=lerp_int(base, peak, t))
+
+        AnimationManager._run(widget, duration, apply, channel="corner_radius", easing=wave(max(1, pulses)))
+
     @staticmethod
     def clear_animations() -> None:
-        """Очищает все активные анимации."""
-        AnimationManager._active_animations.clear()
\ No newline at end of file
+        """Останавливает все активные анимации."""
+        cancel_all_animations()
+        AnimationManager._base_sizes.clear()
+
+    @staticmethod
+    def _run(widget, duration: float, apply: Callable[[float], None], channel: str,
+             on_done: Optional[Callable] = None, easing=None) -> None:
+        if not widget.winfo_exists():
+            return
+        get_frame_clock(widget).start(
+            Animation(widget, duration, apply, easing=easing, on_done=on_done, channel=channel)
+        )
+
+    @staticmethod
+    def _settle(widget, channel: str) -> None:
+        # Незаконченная анимация того же свойства доводится до конца, иначе
+        # исходным значением новой стало бы промежуточное
+        clock = getattr(widget._root(), '_frame_clock', None)
+        if clock is not None:
+            clock.finish(widget, channel)
+
+    @staticmethod
+    def _color(widget, option: str) -> Optional[str]:
+        """Цвет опции для текущего режима оформления ("#rrggbb") или None."""
+        try:
+            value = widget.cget(option)
+        except (ValueError, tkinter.TclError):
+            return None
+        if isinstance(value, (tuple, list)):
+            value = value[0] if ctk.get_appearance_mode() == "Light" else value[-1]
+        return value if isinstance(value, str) and value.startswith("#") else None
+
+    @staticmethod
+    def _parent_color(widget) -> Optional[str]:
+        # Прозрачные родители берут цвет у своих родителей
+        parent = widget.master
+        while parent is not None:
+            color = AnimationManager._color(parent, "fg_color")
+            if color is not None:
+                return color
+            parent = getattr(parent, 'master', None)
+        return None
+
+    @staticmethod
+    def _size(widget) -> Optional[Tuple[int, int]]:
+        try:
+            width, height = int(widget.cget('width')), int(widget.cget('height'))
+        except (ValueError, TypeError, tkinter.TclError):
+            return None
+        return (width, height) if width > 0 and height > 0 else None
+
+    @staticmethod
+    def _free_size(widget) -> bool:
+        """Размер виджета задаётся его width/height и не влияет на соседей."""
+        if widget.winfo_manager() != "place":
+            return False
+        # Размер из place (width, relwidth...) перекрывает configure(width=...)
+        info = widget.place_info()
+        return not any(info.get(option) not in (None, "") for option in ("width", "height", "relwidth", "relheight"))
+
+    @staticmethod
+    def _int(value: Any) -> int:
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def _pad(value: Any) -> Tuple[int, int]:
+        """Отступ pack_info ("10", 10, "10 20" или (10, 20)) → (до, после)."""
+        if isinstance(value, str):
+            value = value.split()
+        elif not isinstance(value, (tuple, list)):
+            value = [value]
+        parts = [AnimationManager._int(part) for part in value] or [0]
+        return parts[0], parts[-1]
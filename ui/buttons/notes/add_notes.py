@@ -5,12 +5,13 @@ from ui.widgets.navigation_bar import NavigationBar
 from ui.components.label import Label
 from ui.components.frame import Frame
 from ui.style import get_color, get_font
-from core.services.note_service import NoteService
+from ui.themes.theme_bindings import bind_theme, set_theme_tokens
+from core.services.note_repository import get_note_service
 from ui.animations.transitions import AnimationManager
 
 class Add_Note(BaseView):
-    def __init__(self, master, on_note_added=None, on_back=None, on_home=None, **kwargs):
-        self.note_service = NoteService()
+    def __init__(self, master, note_service=None, on_note_added=None, on_back=None, on_home=None, **kwargs):
+        self.note_service = note_service or get_note_service()
         self.on_note_added = on_note_added
         self.on_back = on_back
         self.on_home = on_home
@@ -18,6 +19,7 @@ class Add_Note(BaseView):
 
     def setup_ui(self):
         self.configure(fg_color=get_color("COLOR_FRAME_BG"))
+        bind_theme(self, fg_color="COLOR_FRAME_BG")
 
         # Панель навигации
         if self.on_back or self.on_home:
@@ -37,6 +39,7 @@ class Add_Note(BaseView):
             border_width=1,
             border_color=get_color("COLOR_DIVIDER")
         )
+        bind_theme(self.main_frame, fg_color="COLOR_FRAME_BG", border_color="COLOR_DIVIDER")
         self.main_frame.pack(fill="both", expand=True, padx=20, pady=15)
 
         # Поле для ввода текста
@@ -46,6 +49,7 @@ class Add_Note(BaseView):
             font=get_font("FONT_SUBTITLE"),
             text_color=get_color("COLOR_TEXT")
         )
+        bind_theme(self.text_label, text_color="COLOR_TEXT", font="FONT_SUBTITLE")
         self.text_label.pack(pady=(15, 8), padx=15, anchor="w")
 
         self.textbox = ctk.CTkTextbox(
@@ -58,6 +62,13 @@ class Add_Note(BaseView):
             font=get_font("FONT_NORMAL"),
             corner_radius=8
         )
+        bind_theme(
+            self.textbox,
+            fg_color="COLOR_INPUT_BG",
+            text_color="COLOR_TEXT",
+            border_color="COLOR_INPUT_BORDER",
+            font="FONT_NORMAL"
+        )
         self.textbox.pack(pady=8, padx=15, fill="both", expand=True)
         self.textbox.bind("<FocusIn>", self.on_textbox_focus)
         self.textbox.bind("<Control-v>", self.on_paste)
@@ -71,6 +82,7 @@ class Add_Note(BaseView):
             font=get_font("FONT_SUBTITLE"),
             text_color=get_color("COLOR_TEXT")
         )
+        bind_theme(self.category_label, text_color="COLOR_TEXT", font="FONT_SUBTITLE")
         self.category_label.pack(pady=(15, 8), padx=15, anchor="w")
 
         self.category_option = ctk.CTkOptionMenu(
@@ -85,6 +97,15 @@ class Add_Note(BaseView):
             corner_radius=8,
             height=35
         )
+        bind_theme(
+            self.category_option,
+            fg_color="COLOR_BUTTON_BG",
+            button_color="COLOR_BUTTON_BG",
+            button_hover_color="COLOR_BUTTON_HOVER",
+            text_color="COLOR_TEXT",
+            font="FONT_NORMAL",
+            dropdown_font="FONT_NORMAL"
+        )
         self.category_option.pack(pady=8, padx=15, fill="x")
 
         # Кнопки
@@ -100,6 +121,7 @@ class Add_Note(BaseView):
             height=45,
             font=get_font("FONT_SUBTITLE")
         )
+        bind_theme(self.save_button, fg_color="COLOR_SUCCESS", font="FONT_SUBTITLE")
         self.save_button.pack(side="right", padx=5, fill="x", expand=True)
 
         self.clear_button = EnhancedButton(
@@ -111,6 +133,7 @@ class Add_Note(BaseView):
             height=45,
             width=120
         )
+        bind_theme(self.clear_button, fg_color="COLOR_WARNING")
         self.clear_button.pack(side="left", padx=5)
 
         # Статус
@@ -120,11 +143,11 @@ class Add_Note(BaseView):
             font=get_font("FONT_NORMAL"),
             text_color=get_color("COLOR_TEXT_SECONDARY")
         )
+        bind_theme(self.status_label, text_color="COLOR_TEXT_SECONDARY", font="FONT_NORMAL")
         self.status_label.pack(pady=10)
 
     def on_textbox_focus(self, event):
-        self.textbox.configure(border_color=get_color("COLOR_INPUT_FOCUS"))
-        AnimationManager.scale_in(self.textbox, duration=0.1)
+        set_theme_tokens(self.textbox, border_color="COLOR_INPUT_FOCUS")
     
     def on_paste(self, event):
         """Ctrl+V - вставка."""
@@ -153,86 +176,38 @@ class Add_Note(BaseView):
     def clear_form(self):
         self.textbox.delete("0.0", "end")
         self.category_option.set("Поддержка")
-        self.status_label.configure(text="Форма очищена", text_color=get_color("COLOR_INFO"))
-        AnimationManager.scale_in(self.main_frame, duration=0.2)
+        self._set_status("Форма очищена", "COLOR_INFO")
 
     def save_note(self):
         note_text = self.textbox.get("0.0", "end").strip()
         category = self.category_option.get()
 
         if not note_text:
-            self.status_label.configure(
-                text="⚠️ Пустая заметка не будет сохранена!",
-                text_color=get_color("COLOR_ERROR")
-            )
-            AnimationManager.scale_in(self.textbox, duration=0.2)
+            self._set_status("⚠️ Пустая заметка не будет сохранена!", "COLOR_ERROR")
+            # Пульсация скругления не меняет размер поля и не сдвигает форму
+            AnimationManager.pulse(self.textbox, duration=0.3)
             return
 
         try:
             self.note_service.add_note(note_text, category)
             self.textbox.delete("0.0", "end")
-            self.status_label.configure(
-                text="✓ Заметка успешно сохранена!",
-                text_color=get_color("COLOR_SUCCESS")
-            )
+            self._set_status("✓ Заметка успешно сохранена!", "COLOR_SUCCESS")
             
             # Анимация успеха
-            AnimationManager.scale_in(self.save_button, duration=0.2)
+            AnimationManager.pulse(self.save_button, duration=0.3)
             
             if self.on_note_added:
                 self.on_note_added()
 
         except Exception as e:
-            self.status_label.configure(
-                text=f"❌ Ошибка при сохранении: {str(e)}",
-                text_color=get_color("COLOR_ERROR")
-            )
+            self._set_status(f"❌ Ошибка при сохранении: {str(e)}", "COLOR_ERROR")
+
+    def _set_status(self, text, color_token):
+        self.status_label.configure(text=text)
+        set_theme_tokens(self.status_label, text_color=color_token)
 
     def update_theme(self):
-        self.configure(fg_color=get_color("COLOR_FRAME_BG"))
-        
-        # Обновляем навигацию
+        # Собственные виджеты экрана привязаны к токенам темы (bind_theme) и
+        # перекрашиваются по разнице тем; панель навигации обновляет себя сама
         if hasattr(self, 'nav_bar'):
             self.nav_bar.update_theme()
-        
-        if hasattr(self, 'title_label'):
-            self.title_label.configure(
-                text_color=get_color("COLOR_TEXT"),
-                font=get_font("FONT_TITLE")
-            )
-        
-        self.main_frame.configure(
-            fg_color=get_color("COLOR_FRAME_BG"),
-            border_color=get_color("COLOR_DIVIDER")
-        )
-        
-        self.text_label.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_SUBTITLE")
-        )
-        
-        self.category_label.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_SUBTITLE")
-        )
-        
-        self.textbox.configure(
-            fg_color=get_color("COLOR_INPUT_BG"),
-            text_color=get_color("COLOR_TEXT"),
-            border_color=get_color("COLOR_INPUT_BORDER")
-        )
-        
-        self.category_option.configure(
-            fg_color=get_color("COLOR_BUTTON_BG"),
-            button_color=get_color("COLOR_BUTTON_BG"),
-            button_hover_color=get_color("COLOR_BUTTON_HOVER"),
-            text_color=get_color("COLOR_TEXT")
-        )
-        
-        self.save_button.update_theme()
-        self.clear_button.update_theme()
-        
-        self.status_label.configure(
-            text_color=get_color("COLOR_TEXT_SECONDARY"),
-            font=get_font("FONT_NORMAL")
-        )
\ No newline at end of file
@@ -1,27 +1,140 @@
+import math
+
 import customtkinter as ctk
 from ui.views.base_view import BaseView
 from ui.widgets.enhanced_button import EnhancedButton
 from ui.widgets.note_card import NoteCard
 from ui.widgets.navigation_bar import NavigationBar
+from ui.widgets.virtual_list import VirtualList
+from ui.scheduler import get_scheduler
+from ui.themes.theme_bindings import bind_theme, set_theme_tokens
 from ui.components.label import Label
 from ui.components.frame import Frame
-from ui.style import get_color, get_font
-from core.services.note_service import NoteService
+from ui.style import get_color, get_font, get_font_registry
+from core.services.note_repository import get_note_service
 from ui.animations.transitions import AnimationManager
 
+class _NoteRow(Frame):
+    """Строка списка заметок; при прокрутке переиспользуется для других заметок."""
+
+    HEIGHT = 110         # Высота без реестра шрифтов (вместе с отступом)
+    GAP = 10             # Отступ между строками
+    TEXT_LIMIT = 150
+    WRAP_LENGTH = 400
+    BUTTON_SIZE = 30
+
+    @classmethod
+    def row_height(cls) -> int:
+        """Высота строки с отступом под текущий шрифт текста.
+
+        Текст обрезается до TEXT_LIMIT символов, поэтому число его строк
+        оценивается по ширине TEXT_LIMIT символов средней ширины.
+        """
+        fonts = get_font_registry()
+        if fonts is None:
+            return cls.HEIGHT
+        lines = max(1, math.ceil(fonts.measure("FONT_NORMAL", "о" * cls.TEXT_LIMIT) / cls.WRAP_LENGTH))
+        # Отступ над текстом, текст, кнопки с отступом под ними и промежуток до следующей строки
+        return 10 + lines * fonts.linespace("FONT_NORMAL") + cls.BUTTON_SIZE + 10 + cls.GAP
+
+    def __init__(self, master, view, height: int):
+        super().__init__(
+            master,
+            height=height - self.GAP,
+            fg_color=get_color("COLOR_FRAME_BG"),
+            corner_radius=8,
+            border_width=1,
+            border_color=get_color("COLOR_DIVIDER")
+        )
+        bind_theme(self, fg_color="COLOR_FRAME_BG", border_color="COLOR_DIVIDER")
+        # Высота строки фиксирована, иначе список не сможет вычислять позиции
+        self.pack_propagate(False)
+        self.note = None
+
+        self.text_label = Label(
+            self,
+            text="",
+            font=get_font("FONT_NORMAL"),
+            text_color=get_color("COLOR_TEXT"),
+            wraplength=self.WRAP_LENGTH,
+            justify="left",
+            anchor="w"
+        )
+        bind_theme(self.text_label, text_color="COLOR_TEXT", font="FONT_NORMAL")
+        self.text_label.pack(pady=(10, 0), padx=15, fill="x")
+
+        buttons_frame = Frame(self, fg_color="transparent")
+        buttons_frame.pack(side="bottom", fill="x", padx=10, pady=(0, 10))
+
+        self.edit_btn = EnhancedButton(
+            buttons_frame,
+            text="✏️",
+            width=self.BUTTON_SIZE,
+            height=self.BUTTON_SIZE,
+            command=lambda: view.start_edit(self.note),
+            fg_color=get_color("COLOR_INFO"),
+            hover_animation=True
+        )
+        bind_theme(self.edit_btn, fg_color="COLOR_INFO")
+        self.edit_btn.pack(side="left", padx=2)
+
+        self.delete_btn = EnhancedButton(
+            buttons_frame,
+            text="🗑️",
+            width=self.BUTTON_SIZE,
+            height=self.BUTTON_SIZE,
+            command=lambda: view.delete_note(self.note),
+            fg_color=get_color("COLOR_ERROR"),
+            hover_animation=True
+        )
+        bind_theme(self.delete_btn, fg_color="COLOR_ERROR")
+        self.delete_btn.pack(side="right", padx=2)
+
+        self.favorite_btn = EnhancedButton(
+            buttons_frame,
+            text="☆",
+            width=self.BUTTON_SIZE,
+            height=self.BUTTON_SIZE,
+            command=lambda: view.toggle_favorite(self.note),
+            fg_color=get_color("COLOR_BUTTON_BG"),
+            hover_animation=True
+        )
+        self.favorite_btn.pack(side="right", padx=2)
+
+    def resize(self, height: int) -> None:
+        self.configure(height=height - self.GAP)
+
+    def bind_note(self, note):
+        self.note = note
+        text = note.text
+        if len(text) > self.TEXT_LIMIT:
+            text = text[:self.TEXT_LIMIT] + "..."
+        self.text_label.configure(text=text)
+        self._update_favorite_button()
+
+    def _update_favorite_button(self):
+        is_favorite = self.note is not None and self.note.is_favorite
+        token = "COLOR_WARNING" if is_favorite else "COLOR_BUTTON_BG"
+        self.favorite_btn.configure(text="★" if is_favorite else "☆", fg_color=get_color(token))
+        bind_theme(self.favorite_btn, fg_color=token)
+
+
 class ManageNotes(BaseView):
-    def __init__(self, master, on_update=None, on_add_note=None, on_back=None, on_home=None, **kwargs):
-        self.note_service = NoteService()
+    def __init__(self, master, note_service=None, on_update=None, on_add_note=None, on_back=None, on_home=None, **kwargs):
+        self.note_service = note_service or get_note_service()
         self.on_update = on_update
         self.on_add_note = on_add_note
         self.on_back = on_back
         self.on_home = on_home
         self.selected_category = None
         self.current_edit_note_id = None
+        self._search_job = None
         super().__init__(master, **kwargs)
+        self.note_service.subscribe(self._on_notes_changed)
 
     def setup_ui(self):
         self.configure(fg_color=get_color("COLOR_FRAME_BG"))
+        bind_theme(self, fg_color="COLOR_FRAME_BG")
 
         # Панель навигации
         if self.on_back or self.on_home:
@@ -44,6 +157,7 @@ class ManageNotes(BaseView):
             fg_color=get_color("COLOR_SUCCESS"),
             hover_animation=True
         )
+        bind_theme(self.add_btn, fg_color="COLOR_SUCCESS")
         self.add_btn.pack(side="left", padx=5)
 
         # Панель категорий
@@ -56,32 +170,48 @@ class ManageNotes(BaseView):
             font=get_font("FONT_SUBTITLE"),
             text_color=get_color("COLOR_TEXT")
         )
+        bind_theme(self.category_label, text_color="COLOR_TEXT", font="FONT_SUBTITLE")
         self.category_label.pack(anchor="w", pady=(0, 10))
 
         self.category_buttons_frame = Frame(self.category_frame, fg_color="transparent")
         self.category_buttons_frame.pack(fill="x")
 
-        categories = self.note_service.get_categories()
         self.category_buttons = []
-        
-        for cat in categories:
-            btn = EnhancedButton(
-                self.category_buttons_frame,
-                text=cat,
-                command=lambda c=cat: self.select_category(c),
-                fg_color=get_color("COLOR_BUTTON_BG"),
-                hover_animation=True
-            )
-            btn.pack(side="left", padx=5, expand=True, fill="x")
-            self.category_buttons.append(btn)
+        self._build_category_buttons(self.note_service.get_categories())
+
+        # Поиск по тексту заметок (в выбранной категории, если она есть)
+        self.search_entry = ctk.CTkEntry(
+            self.category_frame,
+            placeholder_text="🔍 Поиск по заметкам...",
+            fg_color=get_color("COLOR_INPUT_BG"),
+            text_color=get_color("COLOR_TEXT"),
+            border_color=get_color("COLOR_INPUT_BORDER"),
+            font=get_font("FONT_NORMAL"),
+            height=35
+        )
+        bind_theme(
+            self.search_entry,
+            fg_color="COLOR_INPUT_BG",
+            text_color="COLOR_TEXT",
+            border_color="COLOR_INPUT_BORDER",
+            font="FONT_NORMAL"
+        )
+        self.search_entry.pack(fill="x", pady=(10, 0))
+        self.search_entry.bind("<KeyRelease>", self.on_search_changed)
 
-        # Область прокрутки для заметок
-        self.scrollable_frame = ctk.CTkScrollableFrame(
+        # Список заметок: виджеты создаются только для видимых строк
+        self.note_list = VirtualList(
             self,
-            fg_color=get_color("COLOR_FRAME_BG"),
-            corner_radius=0
+            row_height=_NoteRow.row_height(),
+            create_row=lambda parent: _NoteRow(parent, self, self.note_list.row_height),
+            bind_row=lambda row, note: row.bind_note(note),
+            # Строки согласуются по id: после изменения перепривязываются только затронутые
+            key=lambda note: note.id,
+            signature=lambda note: (note.text, note.is_favorite),
+            # Строки создаются порциями: первые видны сразу, остальные - в следующих кадрах
+            scheduler=get_scheduler(self)
         )
-        self.scrollable_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        self.note_list.pack(fill="both", expand=True, padx=20, pady=20)
 
         # Область редактирования
         self.edit_frame = Frame(
@@ -92,12 +222,14 @@ class ManageNotes(BaseView):
             border_color=get_color("COLOR_INFO")
         )
         
+        bind_theme(self.edit_frame, fg_color="COLOR_FRAME_BG", border_color="COLOR_INFO")
         self.edit_title = Label(
             self.edit_frame,
             text="✏️ Редактирование заметки",
             font=get_font("FONT_SUBTITLE"),
             text_color=get_color("COLOR_TEXT")
         )
+        bind_theme(self.edit_title, text_color="COLOR_TEXT", font="FONT_SUBTITLE")
         self.edit_title.pack(pady=15)
         
         self.edit_textbox = ctk.CTkTextbox(
@@ -110,6 +242,13 @@ class ManageNotes(BaseView):
             font=get_font("FONT_NORMAL"),
             corner_radius=8
         )
+        bind_theme(
+            self.edit_textbox,
+            fg_color="COLOR_INPUT_BG",
+            text_color="COLOR_TEXT",
+            border_color="COLOR_INPUT_BORDER",
+            font="FONT_NORMAL"
+        )
         self.edit_textbox.pack(padx=20, pady=10, fill="both", expand=True)
         self.edit_textbox.bind("<Control-v>", self.on_paste)
         self.edit_textbox.bind("<Control-c>", self.on_copy)
@@ -125,6 +264,7 @@ class ManageNotes(BaseView):
             fg_color=get_color("COLOR_SUCCESS"),
             hover_animation=True
         )
+        bind_theme(self.save_edit_btn, fg_color="COLOR_SUCCESS")
         self.save_edit_btn.pack(side="right", padx=5)
         
         self.cancel_edit_btn = EnhancedButton(
@@ -134,6 +274,7 @@ class ManageNotes(BaseView):
             fg_color=get_color("COLOR_WARNING"),
             hover_animation=True
         )
+        bind_theme(self.cancel_edit_btn, fg_color="COLOR_WARNING")
         self.cancel_edit_btn.pack(side="right", padx=5)
 
         # Статус
@@ -143,101 +284,79 @@ class ManageNotes(BaseView):
             font=get_font("FONT_NORMAL"),
             text_color=get_color("COLOR_TEXT_SECONDARY")
         )
+        bind_theme(self.status_label, text_color="COLOR_TEXT_SECONDARY", font="FONT_NORMAL")
         self.status_label.pack(pady=10)
 
+    def _build_category_buttons(self, categories):
+        for btn in self.category_buttons:
+            btn.destroy()
+        self.category_buttons = []
+        
+        for cat in categories:
+            token = "COLOR_ACCENT" if cat == self.selected_category else "COLOR_BUTTON_BG"
+            btn = EnhancedButton(
+                self.category_buttons_frame,
+                text=cat,
+                command=lambda c=cat: self.select_category(c),
+                fg_color=get_color(token),
+                hover_animation=True
+            )
+            bind_theme(btn, fg_color=token)
+            btn.pack(side="left", padx=5, expand=True, fill="x")
+            self.category_buttons.append(btn)
+
     def select_category(self, category):
         self.selected_category = category
         
         # Обновляем кнопки категорий
         for btn in self.category_buttons:
             is_active = btn.cget("text") == category
-            btn.configure(
-                fg_color=get_color("COLOR_ACCENT") if is_active else get_color("COLOR_BUTTON_BG")
-            )
+            set_theme_tokens(btn, fg_color="COLOR_ACCENT" if is_active else "COLOR_BUTTON_BG")
             if is_active:
-                AnimationManager.scale_in(btn, duration=0.2)
+                AnimationManager.pulse(btn, duration=0.2)
         
+        if self.search_entry.get().strip():
+            self.run_search()
+            return
         self.show_notes_for_category(category)
-        self.status_label.configure(
-            text=f"Категория: {category}",
-            text_color=get_color("COLOR_INFO")
-        )
+        self._set_status(f"Категория: {category}", "COLOR_INFO")
 
-    def show_notes_for_category(self, category):
-        # Очищаем текущие заметки
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
-        notes = self.note_service.get_notes(category)
-        
-        if not notes:
-            no_notes_label = Label(
-                self.scrollable_frame,
-                text=f"Нет заметок в категории '{category}'",
-                font=get_font("FONT_NORMAL"),
-                text_color=get_color("COLOR_TEXT_SECONDARY")
-            )
-            no_notes_label.pack(pady=50)
+    def on_search_changed(self, event=None):
+        # Поиск по мере ввода с небольшой задержкой, чтобы не искать на каждую букву
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(150, self.run_search)
+
+    def run_search(self):
+        self._search_job = None
+        query = self.search_entry.get().strip()
+        if not query:
+            if self.selected_category:
+                self.show_notes_for_category(self.selected_category)
+            else:
+                self._render_notes([], "Выберите категорию или введите запрос")
             return
         
-        # Создаем карточки заметок с кнопками управления
-        for note in notes:
-            note_frame = Frame(
-                self.scrollable_frame,
-                fg_color=get_color("COLOR_FRAME_BG"),
-                corner_radius=8,
-                border_width=1,
-                border_color=get_color("COLOR_DIVIDER")
-            )
-            note_frame.pack(fill="x", pady=5, padx=10)
-            
-            # Текст заметки
-            note_text = Label(
-                note_frame,
-                text=note.text,
-                font=get_font("FONT_NORMAL"),
-                text_color=get_color("COLOR_TEXT"),
-                wraplength=400,
-                justify="left"
-            )
-            note_text.pack(pady=10, padx=15, fill="x")
-            
-            # Кнопки управления
-            buttons_frame = Frame(note_frame, fg_color="transparent")
-            buttons_frame.pack(fill="x", padx=10, pady=(0, 10))
-            
-            edit_btn = EnhancedButton(
-                buttons_frame,
-                text="✏️",
-                width=30,
-                height=30,
-                command=lambda n=note: self.start_edit(n),
-                fg_color=get_color("COLOR_INFO"),
-                hover_animation=True
-            )
-            edit_btn.pack(side="left", padx=2)
-            
-            delete_btn = EnhancedButton(
-                buttons_frame,
-                text="🗑️",
-                width=30,
-                height=30,
-                command=lambda n=note: self.delete_note(n),
-                fg_color=get_color("COLOR_ERROR"),
-                hover_animation=True
-            )
-            delete_btn.pack(side="right", padx=2)
-            
-            favorite_btn = EnhancedButton(
-                buttons_frame,
-                text="★" if note.is_favorite else "☆",
-                width=30,
-                height=30,
-                command=lambda n=note: self.toggle_favorite(n),
-                fg_color=get_color("COLOR_WARNING") if note.is_favorite else get_color("COLOR_BUTTON_BG"),
-                hover_animation=True
-            )
-            favorite_btn.pack(side="right", padx=2)
+        results = self.note_service.search(query, category=self.selected_category, limit=100)
+        fuzzy = not results and self.note_service.fuzzy_ready
+        if fuzzy:
+            # Точных совпадений нет - пробуем найти с учётом опечаток
+            results = self.note_service.fuzzy_search(query, category=self.selected_category, limit=100)
+        empty_text = f"Ничего не найдено по запросу '{query}'"
+        if not results and not self.note_service.fuzzy_ready:
+            empty_text += " (поиск с опечатками ещё готовится)"
+        self._render_notes([result.note for result in results], empty_text)
+        found = f"Похожих заметок: {len(results)}" if fuzzy else f"Найдено заметок: {len(results)}"
+        self._set_status(found, "COLOR_INFO")
+
+    def show_notes_for_category(self, category):
+        self._render_notes(
+            self.note_service.get_notes(category),
+            f"Нет заметок в категории '{category}'"
+        )
+
+    def _render_notes(self, notes, empty_text):
+        self.note_list.set_items(notes, empty_text)
 
     def start_edit(self, note):
         self.current_edit_note_id = note.id
@@ -246,10 +365,7 @@ class ManageNotes(BaseView):
         self.edit_frame.pack(fill="x", padx=20, pady=10)
         AnimationManager.slide_in(self.edit_frame, direction="right", duration=0.1)
         
-        self.status_label.configure(
-            text="Редактирование заметки...",
-            text_color=get_color("COLOR_INFO")
-        )
+        self._set_status("Редактирование заметки...", "COLOR_INFO")
 
     def save_edit(self):
         if not self.current_edit_note_id:
@@ -257,31 +373,16 @@ class ManageNotes(BaseView):
             
         new_text = self.edit_textbox.get("0.0", "end").strip()
         if not new_text:
-            self.status_label.configure(
-                text="⚠️ Заметка не может быть пустой!",
-                text_color=get_color("COLOR_ERROR")
-            )
+            self._set_status("⚠️ Заметка не может быть пустой!", "COLOR_ERROR")
             return
         
-        # Обновляем заметку через сервис
-        notes = self.note_service.get_notes()
-        for note in notes:
-            if note.id == self.current_edit_note_id:
-                note.text = new_text
-                break
-        
-        self.note_service.save_notes()
+        # Обновляем заметку через сервис (одна запись в журнал)
+        self.note_service.update_note(self.current_edit_note_id, new_text)
         
         # Сначала скрываем окно редактирования
         self.cancel_edit()
         
-        # Затем обновляем список заметок
-        self.show_notes_for_category(self.selected_category)
-        
-        self.status_label.configure(
-            text="✓ Заметка успешно обновлена!",
-            text_color=get_color("COLOR_SUCCESS")
-        )
+        self._set_status("✓ Заметка успешно обновлена!", "COLOR_SUCCESS")
         
         if self.on_update:
             self.on_update()
@@ -316,83 +417,69 @@ class ManageNotes(BaseView):
         self.edit_frame.place_forget()
         self.current_edit_note_id = None
         self.edit_textbox.delete("0.0", "end")
-        self.status_label.configure(
-            text=f"Категория: {self.selected_category}" if self.selected_category else "",
-            text_color=get_color("COLOR_TEXT_SECONDARY")
-        )
+        self._set_status(f"Категория: {self.selected_category}" if self.selected_category else "", "COLOR_TEXT_SECONDARY")
 
     def delete_note(self, note):
         if self.note_service.delete_note(note.id):
-            self.show_notes_for_category(self.selected_category)
-            self.status_label.configure(
-                text="✓ Заметка удалена",
-                text_color=get_color("COLOR_SUCCESS")
-            )
+            self._set_status("✓ Заметка удалена", "COLOR_SUCCESS")
             if self.on_update:
                 self.on_update()
 
     def toggle_favorite(self, note):
+        was_favorite = note.is_favorite
         if self.note_service.toggle_favorite(note.id):
-            self.show_notes_for_category(self.selected_category)
-            status_text = "★ Добавлено в избранное" if not note.is_favorite else "☆ Убрано из избранного"
-            self.status_label.configure(
-                text=status_text,
-                text_color=get_color("COLOR_INFO")
-            )
+            status_text = "★ Добавлено в избранное" if not was_favorite else "☆ Убрано из избранного"
+            self._set_status(status_text, "COLOR_INFO")
 
     def open_add_note(self):
         if self.on_add_note:
             self.on_add_note()
 
     def refresh(self):
-        self.note_service.load_notes()
-        if self.selected_category:
+        # Данные уже в общем хранилище, перечитывать файл не нужно
+        categories = self.note_service.get_categories()
+        if categories != [btn.cget("text") for btn in self.category_buttons]:
+            self._build_category_buttons(categories)
+        if self.search_entry.get().strip():
+            self.run_search()
+        elif self.selected_category:
             self.show_notes_for_category(self.selected_category)
 
+    def _on_notes_changed(self, change):
+        if self.current_edit_note_id in change.removed:
+            self.cancel_edit()
+        self.refresh()
+
+    def on_show(self):
+        # Достраиваем то, что не успело создаться до ухода с экрана
+        self.note_list.schedule_layout()
+
+    def on_hide(self):
+        self.note_list.cancel_pending()
+
+    def destroy(self):
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self.note_service.unsubscribe(self._on_notes_changed)
+        super().destroy()
+
+    def _set_status(self, text, color_token):
+        self.status_label.configure(text=text)
+        set_theme_tokens(self.status_label, text_color=color_token)
+
     def update_theme(self):
-        self.configure(fg_color=get_color("COLOR_FRAME_BG"))
-        
-        # Обновляем навигацию
+        # Собственные виджеты экрана и строки списка привязаны к токенам темы
+        # (bind_theme) и перекрашиваются по разнице тем; панель навигации
+        # обновляет себя сама. Высота строк зависит от масштаба шрифта
         if hasattr(self, 'nav_bar'):
             self.nav_bar.update_theme()
-        
-        if hasattr(self, 'title_label'):
-            self.title_label.configure(
-                text_color=get_color("COLOR_TEXT"),
-                font=get_font("FONT_TITLE")
-            )
-        
-        self.category_label.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_SUBTITLE")
-        )
-        
-        self.scrollable_frame.configure(fg_color=get_color("COLOR_FRAME_BG"))
-        
-        self.edit_frame.configure(
-            fg_color=get_color("COLOR_FRAME_BG"),
-            border_color=get_color("COLOR_INFO")
-        )
-        
-        self.edit_title.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_SUBTITLE")
-        )
-        
-        self.edit_textbox.configure(
-            fg_color=get_color("COLOR_INPUT_BG"),
-            text_color=get_color("COLOR_TEXT"),
-            border_color=get_color("COLOR_INPUT_BORDER")
-        )
-        
-        self.status_label.configure(
-            text_color=get_color("COLOR_TEXT_SECONDARY"),
-            font=get_font("FONT_NORMAL")
-        )
-        
-        # Обновляем кнопки
-        self.add_btn.update_theme()
-        for btn in self.category_buttons:
-            btn.update_theme()
-        self.save_edit_btn.update_theme()
-        self.cancel_edit_btn.update_theme()
\ No newline at end of file
+        self._update_row_height()
+
+    def _update_row_height(self):
+        """Подгоняет высоту строк списка под шрифт (после смены масштаба)."""
+        height = _NoteRow.row_height()
+        if height == self.note_list.row_height:
+            return
+        for row in self.note_list.iter_rows():
+            row.resize(height)
+        self.note_list.set_row_height(height)
@@ -7,20 +7,23 @@ from ui.widgets.motivation_widget import MotivationWidget
 from ui.components.label import Label
 from ui.components.frame import Frame
 from ui.style import get_color, get_font
-from core.services.note_service import NoteService
+from ui.themes.theme_bindings import bind_theme, set_theme_tokens
+from core.services.note_repository import get_note_service
 from ui.animations.transitions import AnimationManager
 import customtkinter as ctk
 
 class NotesView(BaseView):
-    def __init__(self, master, show_add_note=None, **kwargs):
-        self.note_service = NoteService()
+    def __init__(self, master, note_service=None, show_add_note=None, **kwargs):
+        self.note_service = note_service or get_note_service()
         self.show_add_note = show_add_note
         self.active_category = "Все"
         self.current_note = None
         super().__init__(master, **kwargs)
+        self.note_service.subscribe(self._on_notes_changed)
 
     def setup_ui(self):
         self.configure(fg_color=get_color("COLOR_FRAME_BG"))
+        bind_theme(self, fg_color="COLOR_FRAME_BG")
 
         # Панель быстрого доступа
         self.quick_panel = QuickAccessPanel(
@@ -36,25 +39,15 @@ class NotesView(BaseView):
             font=get_font("FONT_TITLE"),
             text_color=get_color("COLOR_TEXT")
         )
+        bind_theme(self.title_label, text_color="COLOR_TEXT", font="FONT_TITLE")
         self.title_label.pack(pady=(15, 8))
 
         # Панель категорий
         self.category_frame = Frame(self, fg_color="transparent")
         self.category_frame.pack(fill="x", padx=15, pady=8)
 
-        categories = ["Все"] + self.note_service.get_categories()
         self.category_buttons = []
-        
-        for cat in categories:
-            btn = EnhancedButton(
-                self.category_frame,
-                text=cat,
-                command=lambda c=cat: self.filter_by_category(c),
-                fg_color=get_color("COLOR_ACCENT") if cat == self.active_category else get_color("COLOR_BUTTON_BG"),
-                hover_animation=True
-            )
-            btn.pack(side="left", padx=3, expand=True, fill="x")
-            self.category_buttons.append(btn)
+        self._build_category_buttons(["Все"] + self.note_service.get_categories())
 
         # Область отображения заметки
         self.note_display_frame = Frame(
@@ -64,6 +57,7 @@ class NotesView(BaseView):
             border_width=2,
             border_color=get_color("COLOR_DIVIDER")
         )
+        bind_theme(self.note_display_frame, fg_color="COLOR_FRAME_BG", border_color="COLOR_DIVIDER")
         self.note_display_frame.pack(fill="both", expand=True, padx=15, pady=15)
 
         self.note_text = Label(
@@ -74,6 +68,7 @@ class NotesView(BaseView):
             text_color=get_color("COLOR_TEXT_SECONDARY"),
             justify="center"
         )
+        bind_theme(self.note_text, text_color="COLOR_TEXT_SECONDARY", font="FONT_SUBTITLE")
         self.note_text.pack(expand=True, pady=30, padx=20)
 
         # Нижняя панель с кнопками и мотивацией
@@ -96,6 +91,7 @@ class NotesView(BaseView):
             hover_animation=True,
             height=40
         )
+        bind_theme(self.show_note_btn, fg_color="COLOR_ACCENT")
         self.show_note_btn.pack(side="left", padx=5, expand=True, fill="x")
 
         if self.show_add_note:
@@ -107,81 +103,74 @@ class NotesView(BaseView):
                 hover_animation=True,
                 height=40
             )
+            bind_theme(self.add_note_btn, fg_color="COLOR_SUCCESS")
             self.add_note_btn.pack(side="right", padx=5)
 
+    def _build_category_buttons(self, categories):
+        for btn in self.category_buttons:
+            btn.destroy()
+        self.category_buttons = []
+        
+        for cat in categories:
+            token = "COLOR_ACCENT" if cat == self.active_category else "COLOR_BUTTON_BG"
+            btn = EnhancedButton(
+                self.category_frame,
+                text=cat,
+                command=lambda c=cat: self.filter_by_category(c),
+                fg_color=get_color(token),
+                hover_animation=True
+            )
+            bind_theme(btn, fg_color=token)
+            btn.pack(side="left", padx=3, expand=True, fill="x")
+            self.category_buttons.append(btn)
+
     def filter_by_category(self, category):
         self.active_category = category
         
         # Обновляем кнопки категорий
         for btn in self.category_buttons:
             is_active = btn.cget("text") == category
-            btn.configure(
-                fg_color=get_color("COLOR_ACCENT") if is_active else get_color("COLOR_BUTTON_BG")
-            )
+            set_theme_tokens(btn, fg_color="COLOR_ACCENT" if is_active else "COLOR_BUTTON_BG")
             if is_active:
-                AnimationManager.scale_in(btn, duration=0.2)
+                AnimationManager.pulse(btn, duration=0.2)
 
     def show_random_note(self):
         category = None if self.active_category == "Все" else self.active_category
         notes = self.note_service.get_notes(category)
         
         if not notes:
-            self.note_text.configure(
-                text="Нет заметок в выбранной категории.\nДобавьте новую заметку!",
-                text_color=get_color("COLOR_TEXT_SECONDARY")
-            )
+            self.note_text.configure(text="Нет заметок в выбранной категории.\nДобавьте новую заметку!")
+            set_theme_tokens(self.note_text, text_color="COLOR_TEXT_SECONDARY")
             return
         
         self.current_note = random.choice(notes)
-        self.note_text.configure(
-            text=self.current_note.text,
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_SUBTITLE")
-        )
+        self.note_text.configure(text=self.current_note.text)
+        set_theme_tokens(self.note_text, text_color="COLOR_TEXT")
         
         # Анимация появления
         AnimationManager.fade_in(self.note_display_frame, duration=0.4)
 
     def refresh_notes(self):
-        self.note_service.load_notes()
-        # Обновляем категории
+        # Перестраиваем кнопки категорий только если набор категорий изменился
         categories = ["Все"] + self.note_service.get_categories()
-        # Можно добавить логику обновления кнопок категорий
+        if categories != [btn.cget("text") for btn in self.category_buttons]:
+            if self.active_category not in categories:
+                self.active_category = "Все"
+            self._build_category_buttons(categories)
+
+    def _on_notes_changed(self, change):
+        if change.reset or change.added or change.removed:
+            self.refresh_notes()
+        if self.current_note is not None and self.current_note.id in change.removed:
+            self.current_note = None
+
+    def destroy(self):
+        self.note_service.unsubscribe(self._on_notes_changed)
+        super().destroy()
 
     def update_theme(self):
-        self.configure(fg_color=get_color("COLOR_FRAME_BG"))
-        
-        # Обновляем панель быстрого доступа
-        if hasattr(self, 'quick_panel'):
-            self.quick_panel.update_theme()
-        
-        self.title_label.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_TITLE")
-        )
-        
-        self.note_display_frame.configure(
-            fg_color=get_color("COLOR_FRAME_BG"),
-            border_color=get_color("COLOR_DIVIDER")
-        )
-        
-        self.note_text.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_SUBTITLE")
-        )
-        
-        # Обновляем кнопки
-        for btn in self.category_buttons:
-            btn.update_theme()
-            is_active = btn.cget("text") == self.active_category
-            btn.configure(
-                fg_color=get_color("COLOR_ACCENT") if is_active else get_color("COLOR_BUTTON_BG")
-            )
-        
-        self.show_note_btn.update_theme()
-        if hasattr(self, 'add_note_btn'):
-            self.add_note_btn.update_theme()
-        
-        # Обновляем мотивационный виджет
-        if hasattr(self, 'motivation_widget'):
-            self.motivation_widget.update_theme()
\ No newline at end of file
+        # Собственные виджеты экрана привязаны к токенам темы (bind_theme) и
+        # перекрашиваются по разнице тем; здесь остаются только виджеты,
+        # которые обновляют себя сами
+        self.quick_panel.update_theme()
+        self.motivation_widget.update_theme()
@@ -1,11 +1,15 @@
 import customtkinter as ctk
 from ui.style import get_color
+from ui.themes.theme_bindings import bind_theme, refresh_theme
 
 class Frame(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
-        if "fg_color" not in kwargs:
+        themed = "fg_color" not in kwargs
+        if themed:
             kwargs["fg_color"] = get_color("COLOR_FRAME_BG")
         super().__init__(master, **kwargs)
+        if themed:
+            bind_theme(self, fg_color="COLOR_FRAME_BG")
     
     def update_theme(self):
-        self.configure(fg_color=get_color("COLOR_FRAME_BG"))
\ No newline at end of file
+        refresh_theme(self)
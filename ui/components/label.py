@@ -1,16 +1,18 @@
 import customtkinter as ctk
 from ui.style import get_color, get_font
+from ui.themes.theme_bindings import bind_theme, refresh_theme
 
 class Label(ctk.CTkLabel):
     def __init__(self, master, **kwargs):
+        tokens = {}
         if "text_color" not in kwargs:
             kwargs["text_color"] = get_color("COLOR_TEXT")
+            tokens["text_color"] = "COLOR_TEXT"
         if "font" not in kwargs:
             kwargs["font"] = get_font("FONT_NORMAL")
+            tokens["font"] = "FONT_NORMAL"
         super().__init__(master, **kwargs)
+        bind_theme(self, **tokens)
     
     def update_theme(self):
-        self.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_NORMAL")
-        )
+        refresh_theme(self)
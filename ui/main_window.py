@@ -1,32 +1,62 @@
 import customtkinter as ctk
 from ui.components.frame import Frame
 from ui.components.label import Label
-from ui.buttons.notes.notes_view import NotesView
-from ui.buttons.notes.add_notes import Add_Note
-from ui.buttons.notes.manage_notes import ManageNotes
-from ui.style import set_theme, get_color, get_font
+from ui.style import set_theme, set_font_registry, set_font_scale, get_color, get_font
 
 
 # Новые импорты
-from ui.themes.theme_manager import ThemeManager
 from ui.animations.transitions import AnimationManager
 from ui.widgets.enhanced_button import EnhancedButton
-from core.services.note_service import NoteService
+from ui.views.view_cache import ViewCache
+from ui.themes.theme_bindings import ThemeBindings, bind_theme, global_bindings
+from ui.themes.font_registry import FontRegistry
+from ui.watchdog import StallWatchdog, watchdog_requested
+from core.utils import metrics, startup_profiler
 from config.settings import SettingsManager
 
 class MainWindow(ctk.CTk):
     def __init__(self):
-        super().__init__()
+        with startup_profiler.phase("Tk root"):
+            super().__init__()
+        # Привязки к теме виджетов окна; у представлений свои (BaseView)
+        self.theme_bindings = ThemeBindings()
         
         # Инициализация сервисов
-        self.settings_manager = SettingsManager()
-        self.note_service = NoteService()
+        with startup_profiler.phase("settings"):
+            self.settings_manager = SettingsManager()
+        metrics.configure(self.settings_manager.get('metrics_enabled', False))
+        # Изменения настроек доставляются подписчикам один раз за проход цикла событий
+        self.settings_manager.set_dispatcher(self.after_idle)
+        self._settings_subscriptions = [
+            self.settings_manager.subscribe('theme', self._on_theme_setting),
+            self.settings_manager.subscribe(
+                'animations_enabled', lambda key, old, new: AnimationManager.set_enabled(new)
+            ),
+            self.settings_manager.subscribe('metrics_enabled', lambda key, old, new: metrics.configure(new)),
+            self.settings_manager.subscribe(
+                ('view_cache_size', 'view_cache_max_widgets'), self._on_view_cache_setting
+            ),
+            self.settings_manager.subscribe(
+                ('watchdog_enabled', 'watchdog_threshold_ms'), self._on_watchdog_setting
+            ),
+            self.settings_manager.subscribe('font_scale', self._on_font_scale_setting),
+        ]
+        # Одно хранилище заметок на весь процесс, передаётся в представления;
+        # загружается после первой отрисовки окна (_finish_startup)
+        self.note_service = None
+        self.watchdog = None
+        self._startup_done = False
+        self._closed = False
         self.animation_manager = AnimationManager()
+        AnimationManager.set_enabled(self.settings_manager.get('animations_enabled', True))
         
         # Инициализация темы
         self.current_theme_name = self.settings_manager.get('theme', 'light')
         set_theme(self.current_theme_name)
-        ThemeManager.add_observer(self.on_theme_changed)
+        # Виджеты получают общие объекты шрифтов: смена темы или масштаба
+        # меняет сами шрифты, а не каждый виджет
+        self.font_registry = FontRegistry(self.settings_manager.get('font_scale', 1.0))
+        set_font_registry(self.font_registry)
         
         # Оптимизация: применяем тему сразу после создания виджетов
         self._theme_update_pending = False
@@ -52,13 +82,79 @@ class MainWindow(ctk.CTk):
         
         self.geometry(f"{width}x{height}")
         self.minsize(900, 650)
+        # Размер окна сохраняется по ходу изменения: set() только помечает
+        # настройки изменёнными, запись объединяется в фоновом потоке
+        self.bind("<Configure>", self._on_window_configure, add="+")
         self.configure(fg_color=get_color("COLOR_BG"))
+        bind_theme(self, fg_color="COLOR_BG")
         self.iconbitmap(self,"assets/icon.ico")
-        # Мгновенная инициализация
-        self._create_widgets()
-        self._init_views()
-        self.show_notes()
+        # До первой отрисовки строится только каркас: заголовок и навигация
+        with startup_profiler.phase("widgets"):
+            self._create_widgets()
+            self._init_views()
         self.center_window()
+        
+        # Заметки и первый экран — после первой отрисовки; запасной таймер на
+        # случай, если окно стартует свёрнутым и Expose не приходит
+        self._expose_binding = self.bind("<Expose>", self._on_first_paint, add="+")
+        self.after(500, self._finish_startup)
+
+    def _on_window_configure(self, event):
+        # Событие приходит и от дочерних виджетов; нужен только размер окна,
+        # и только после запуска, когда геометрия уже применена
+        if event.widget is not self or not self._startup_done:
+            return
+        self.settings_manager.set('window_width', event.width)
+        self.settings_manager.set('window_height', event.height)
+
+    def _on_first_paint(self, event=None):
+        startup_profiler.mark("first paint")
+        self.unbind("<Expose>", self._expose_binding)
+        self.after_idle(self._finish_startup)
+
+    def _finish_startup(self):
+        """Загружает заметки, показывает первый экран и запускает фоновые службы."""
+        if self._startup_done:
+            return
+        self._startup_done = True
+        self._ensure_note_service()
+        if self.view_cache.current_key is None:
+            with startup_profiler.phase("first view"):
+                self.show_notes()
+        startup_profiler.mark("content ready")
+        
+        self._start_watchdog()
+        startup_profiler.finish()
+
+    def _start_watchdog(self):
+        """Запускает сторож зависаний цикла событий (по настройке или переменной окружения)."""
+        if watchdog_requested(self.settings_manager.get('watchdog_enabled', False)):
+            self.watchdog = StallWatchdog(
+                self, threshold_ms=self.settings_manager.get('watchdog_threshold_ms', 200)
+            )
+            self.watchdog.start()
+
+    def _on_watchdog_setting(self, key, old, new):
+        if self.watchdog is not None:
+            self.watchdog.stop()
+            self.watchdog = None
+        if self._startup_done:
+            self._start_watchdog()
+
+    def _on_view_cache_setting(self, key, old, new):
+        self.view_cache.set_limits(
+            self.settings_manager.get('view_cache_size', 4),
+            self.settings_manager.get('view_cache_max_widgets', 20000)
+        )
+
+    def _ensure_note_service(self):
+        if self.note_service is None:
+            with startup_profiler.phase("note service"):
+                from core.services.note_repository import get_note_service
+                self.note_service = get_note_service(self.settings_manager.get('notes_backend', 'json'))
+            # Триграммный индекс строится в фоне, чтобы первый нечёткий поиск не блокировал окно
+            self.note_service.prepare_fuzzy_search()
+        return self.note_service
 
     def _create_widgets(self):
         """Создает основные элементы интерфейса"""
@@ -69,6 +165,7 @@ class MainWindow(ctk.CTk):
             font=get_font("FONT_TITLE"),
             text_color=get_color("COLOR_TEXT")
         )
+        bind_theme(self.title_label, text_color="COLOR_TEXT", font="FONT_TITLE")
         self.title_label.pack(pady=(20, 15))
 
         # Панель кнопок (адаптивная)
@@ -78,6 +175,7 @@ class MainWindow(ctk.CTk):
             corner_radius=10,
             height=60
         )
+        bind_theme(self.buttons_frame, fg_color="COLOR_FRAME_BG")
         self.buttons_frame.pack(fill="x", padx=15, pady=(0, 10))
         self.buttons_frame.pack_propagate(False)
 
@@ -152,12 +250,24 @@ class MainWindow(ctk.CTk):
             fg_color=get_color("COLOR_FRAME_BG"),
             corner_radius=10  # Уменьшено для производительности
         )
+        bind_theme(self.content_frame, fg_color="COLOR_FRAME_BG")
         self.content_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
 
     def _init_views(self):
         """Инициализирует все представления"""
-        # Изначально никаких представлений нет
+        # Представления создаются при первом показе и затем скрываются, а не уничтожаются
+        self.view_cache = ViewCache(
+            max_views=self.settings_manager.get('view_cache_size', 4),
+            max_widgets=self.settings_manager.get('view_cache_max_widgets', 20000)
+        )
+        self._view_factories = {
+            'notes': self._create_notes_view,
+            'add_note': self._create_add_note_view,
+            'manage_notes': self._create_manage_notes_view,
+            'profile': self._create_profile_view,
+            'ai_assistant': self._create_ai_assistant_view,
+        }
         self.current_view = None
         self.notes_view = None
         self.add_note_view = None
@@ -165,7 +275,7 @@ class MainWindow(ctk.CTk):
         self.emotion_wheel_view = None
         self.profile_view = None
         self.ai_assistant_view = None
-        self.view_history = []  # История просмотров для умной навигации
+        self.view_history = []  # История просмотров (имена экранов) для умной навигации
 
     # Остальные методы остаются без изменений...
     def center_window(self):
@@ -190,19 +300,29 @@ class MainWindow(ctk.CTk):
 
     def toggle_theme(self):
         """Переключает тему между светлой и темной"""
-        self.current_theme_name = "dark" if self.current_theme_name == "light" else "light"
+        theme = self.settings_manager.get('theme', 'light')
+        # Тема применяется подписчиком настройки theme (_on_theme_setting)
+        self.settings_manager.set('theme', "dark" if theme == "light" else "light")
+    
+    def _on_theme_setting(self, key, old, new):
+        """Применяет новое значение настройки theme."""
+        self.current_theme_name = new
         set_theme(self.current_theme_name)
-        self.settings_manager.set('theme', self.current_theme_name)
         
         # Обновляем иконку кнопки темы с анимацией
         self.theme_toggle_btn.configure(
             text="🌙" if self.current_theme_name == "light" else "☀️"
         )
-        self.animation_manager.scale_in(self.theme_toggle_btn, duration=0.2)
+        self.animation_manager.pulse(self.theme_toggle_btn, duration=0.2)
         
         # Обновляем все элементы сразу
         self.on_theme_changed()
     
+    def _on_font_scale_setting(self, key, old, new):
+        """Применяет новый масштаб шрифтов; текущее представление пересчитывает раскладку."""
+        if set_font_scale(new):
+            self.on_theme_changed()
+
     def on_theme_changed(self):
         """Оптимизированный обработчик изменения темы."""
         # Предотвращаем множественные обновления
@@ -212,28 +332,8 @@ class MainWindow(ctk.CTk):
         
         def update_theme():
             try:
-                # Обновляем основные элементы
-                self.configure(fg_color=get_color("COLOR_BG"))
-                
-                if hasattr(self, 'buttons_frame'):
-                    self.buttons_frame.configure(fg_color=get_color("COLOR_FRAME_BG"))
-                if hasattr(self, 'content_frame'):
-                    self.content_frame.configure(fg_color=get_color("COLOR_FRAME_BG"))
-                if hasattr(self, 'title_label'):
-                    self.title_label.configure(text_color=get_color("COLOR_TEXT"))
-
-                # Обновляем кнопки одним списком
-                for attr_name in ['btn_show_notes', 'btn_manage_notes', 
-                                'btn_profile', 'btn_ai_assistant', 'theme_toggle_btn', 'exit_button']:
-                    if hasattr(self, attr_name):
-                        btn = getattr(self, attr_name)
-                        if hasattr(btn, 'update_theme'):
-                            btn.update_theme()
-
-                # Обновляем текущее представление
-                if self.current_view and hasattr(self.current_view, 'update_theme'):
-                    self.current_view.update_theme()
-                    
+                with metrics.timer("theme.changed"):
+                    self._apply_theme()
             except Exception as e:
                 print(f"Ошибка обновления темы: {e}")
             finally:
@@ -242,37 +342,67 @@ class MainWindow(ctk.CTk):
         # Отложенное обновление для производительности
         self.after(10, update_theme)
 
+    def _apply_theme(self):
+        """Перекрашивает окно и представления.
+        
+        configure вызывается только для свойств, привязанных к токенам,
+        значения которых в новой теме отличаются (bind_theme). Скрытые
+        представления остаются в прежней версии темы и догоняют её при
+        показе (ViewCache.show → sync_theme).
+        """
+        self.theme_bindings.sync()
+        global_bindings().sync()
+        if self.current_view is not None and hasattr(self.current_view, 'sync_theme'):
+            self.current_view.sync_theme()
+
     def clear_content(self):
-        """Мгновенная очистка контента."""
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        """Уничтожает все построенные представления."""
+        self.view_cache.clear()
         self.current_view = None
 
+    def _show_view(self, key, remember=True):
+        """Показывает экран key из кэша, создавая его при первом обращении."""
+        # Переход до окончания запуска: хранилище загружается сразу
+        self._ensure_note_service()
+        previous = self.view_cache.current_key
+        # view.show.* — весь переход, view.build.* — только построение нового экрана
+        with metrics.timer(f"view.show.{key}"):
+            view = self.view_cache.show(key, lambda: self._build_view(key))
+        if remember and previous is not None and previous != key:
+            self._add_to_history(previous)
+        self.current_view = view
+        setattr(self, f"{key}_view", view)
+        return view
+
+    def _build_view(self, key):
+        with metrics.timer(f"view.build.{key}"):
+            return self._view_factories[key]()
+
     def show_notes(self):
         """Показывает представление с заметками"""
-        self.clear_content()
-        self.notes_view = NotesView(
+        self._show_view('notes')
+
+    def _create_notes_view(self):
+        from ui.buttons.notes.notes_view import NotesView
+        return NotesView(
             self.content_frame,
+            note_service=self.note_service,
             show_add_note=self.show_add_note
         )
-        self.notes_view.pack(fill="both", expand=True, padx=5, pady=5)
-        self._add_to_history(self.current_view)
-        self.current_view = self.notes_view
-        # Отключены для производительности
 
     def show_add_note(self):
         """Показывает форму добавления заметки"""
-        self.clear_content()
-        self.add_note_view = Add_Note(
+        self._show_view('add_note')
+
+    def _create_add_note_view(self):
+        from ui.buttons.notes.add_notes import Add_Note
+        return Add_Note(
             self.content_frame,
+            note_service=self.note_service,
             on_note_added=self.on_note_added,
             on_back=self._get_previous_view,
             on_home=self.show_notes
         )
-        self.add_note_view.pack(fill="both", expand=True, padx=5, pady=5)
-        self._add_to_history(self.current_view)
-        self.current_view = self.add_note_view
-        # Отключены для производительности
 
     def on_note_added(self):
         """Обработчик добавления новой заметки"""
@@ -287,103 +417,104 @@ class MainWindow(ctk.CTk):
 
     def show_manage_notes(self):
         """Показывает представление управления заметками"""
-        self.clear_content()
-        self.manage_notes_view = ManageNotes(
+        self._show_view('manage_notes')
+
+    def _create_manage_notes_view(self):
+        from ui.buttons.notes.manage_notes import ManageNotes
+        # Представление подписано на изменения хранилища и остаётся актуальным, пока скрыто
+        return ManageNotes(
             self.content_frame,
+            note_service=self.note_service,
             on_update=self.on_notes_updated,
             on_add_note=self.show_add_note,
             on_back=self._get_previous_view,
             on_home=self.show_notes
         )
-        self.manage_notes_view.pack(fill="both", expand=True, padx=5, pady=5)
-        self._add_to_history(self.current_view)
-        self.current_view = self.manage_notes_view
-        self.manage_notes_view.refresh()
-        # Отключены для производительности
 
     def on_notes_updated(self):
         """Обработчик обновления заметок"""
-        # Просто обновляем текущее представление
-        if self.manage_notes_view and hasattr(self.manage_notes_view, 'refresh'):
-            self.manage_notes_view.refresh()
+        # Представления сами обновляются по подписке на изменения хранилища
+        pass
 
 
     
     def show_profile(self):
         """Показывает профиль пользователя"""
+        self._show_view('profile')
+
+    def _create_profile_view(self):
         from ui.views.profile_view import ProfileView
-        
-        self.clear_content()
-        self.profile_view = ProfileView(
+        return ProfileView(
             self.content_frame,
             on_back=self._get_previous_view
         )
-        self.profile_view.pack(fill="both", expand=True)
-        self._add_to_history(self.current_view)
-        self.current_view = self.profile_view
-        # Отключены для производительности
 
-
-    
-    def _add_to_history(self, view):
-        """Добавляет представление в историю."""
-        if view and view != self.current_view:
-            self.view_history.append(view)
+    def _add_to_history(self, key):
+        """Добавляет экран в историю."""
+        if key and (not self.view_history or self.view_history[-1] != key):
+            self.view_history.append(key)
             # Ограничиваем историю 5 элементами
             if len(self.view_history) > 5:
                 self.view_history.pop(0)
     
     def _get_previous_view(self):
         """Возвращает к предыдущему представлению."""
-        if self.view_history:
-            # Находим последнее валидное представление
-            while self.view_history:
-                prev_view = self.view_history.pop()
-                if hasattr(prev_view, 'winfo_exists'):
-                    try:
-                        if prev_view.winfo_exists():
-                            continue
-                    except:
-                        pass
-                
-                # Определяем тип представления и показываем соответствующий экран
-                if hasattr(prev_view, '__class__'):
-                    view_name = prev_view.__class__.__name__
-                    if 'NotesView' in view_name:
-                        self.show_notes()
-                        return
-                    elif 'ManageNotes' in view_name:
-                        self.show_manage_notes()
-                        return
-
-                    elif 'AIAssistant' in view_name:
-                        self.show_ai_assistant()
-                        return
+        while self.view_history:
+            key = self.view_history.pop()
+            if key != self.view_cache.current_key and key in self._view_factories:
+                self._show_view(key, remember=False)
+                return
         
         # Если история пуста, возвращаемся к заметкам
         self.show_notes()
     
     def show_ai_assistant(self):
         """Показывает AI ассистента"""
+        self._show_view('ai_assistant')
+
+    def _create_ai_assistant_view(self):
         from ui.views.ai_assistant_view import AIAssistantView
-        
-        self.clear_content()
-        self.ai_assistant_view = AIAssistantView(
+        return AIAssistantView(
             self.content_frame,
             on_back=self._get_previous_view
         )
-        self.ai_assistant_view.pack(fill="both", expand=True)
-        self._add_to_history(self.current_view)
-        self.current_view = self.ai_assistant_view
-        # Отключены для производительности
     
     def on_exit(self):
-        """Обработчик выхода с сохранением настроек"""
-        # Сохраняем размеры окна
-        self.settings_manager.set('window_width', self.winfo_width())
-        self.settings_manager.set('window_height', self.winfo_height())
-        
-        # Очищаем наблюдателей
-        ThemeManager.remove_observer(self.on_theme_changed)
+        """Обработчик кнопки выхода"""
+        self.shutdown()
+    
+    def shutdown(self):
+        """Завершает работу приложения и закрывает окно.
         
-        self.destroy()
+        Единая точка выхода для кнопки «Выход» и закрытия окна (main.py):
+        сохраняет настройки и заметки, останавливает фоновые службы и
+        анимации. Повторный вызов ничего не делает.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            # Сохраняем размеры окна и принудительно записываем настройки
+            self.settings_manager.set('window_width', self.winfo_width())
+            self.settings_manager.set('window_height', self.winfo_height())
+            self.settings_manager.force_save()
+            # Останавливаем сторож зависаний и дописываем его журнал
+            if self.watchdog is not None:
+                self.watchdog.stop()
+                self.watchdog = None
+            # Дожидаемся фоновой записи заметок
+            if self.note_service is not None:
+                self.note_service.flush(timeout=5.0)
+            # Снимок метрик (если сбор включён)
+            if metrics.is_enabled():
+                metrics.registry.dump_json("data/metrics.json")
+            AnimationManager.clear_animations()
+        except Exception as e:
+            print(f"Ошибка при закрытии: {e}")
+        finally:
+            # Отписываемся от настроек
+            for unsubscribe in self._settings_subscriptions:
+                unsubscribe()
+            # Шрифты принадлежат этому окну и уничтожаются вместе с ним
+            set_font_registry(None)
+            self.destroy()
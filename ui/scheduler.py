@@ -0,0 +1,187 @@
+"""Кооперативный планировщик задач интерфейса.
+
+Длинная работа в главном потоке (построение сотен строк, пересчёт
+списков) разбивается на шаги: задача — это генератор, каждый next()
+выполняет небольшую порцию. Планировщик запускает шаги через after,
+пока не исчерпан бюджет кадра, и отдаёт управление циклу событий Tk,
+чтобы окно успевало перерисовываться и отвечать на ввод.
+"""
+
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple
+
+PRIORITY_HIGH = 0     # Отклик на действия пользователя
+PRIORITY_NORMAL = 1   # Отрисовка видимого содержимого
+PRIORITY_LOW = 2      # Фоновая подготовка (запас строк, прогрев кэшей)
+
+
+class UITask:
+    """Задача планировщика; позволяет отменить её или узнать о завершении."""
+
+    def __init__(self, steps: Iterable[Any], priority: int, owner: Any = None,
+                 on_done: Optional[Callable[[], None]] = None):
+        self.steps = iter(steps)
+        self.priority = priority
+        self.owner = owner
+        self.on_done = on_done
+        self.cancelled = False
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+    def cancel(self) -> None:
+        """Отменяет задачу; генератор закрывается, его finally выполняется."""
+        if self.done or self.cancelled:
+            return
+        self.cancelled = True
+        close = getattr(self.steps, 'close', None)
+        if close is not None:
+            try:
+                close()
+            except ValueError:
+                # Задача отменяет саму себя из своего же шага: её снимут с очереди позже
+                pass
+
+    @property
+    def active(self) -> bool:
+        return not (self.done or self.cancelled)
+
+
+class UIScheduler:
+    """Выполняет задачи порциями в пределах бюджета кадра."""
+
+    def __init__(self, root, budget_ms: float = 8.0):
+        """Инициализирует планировщик.
+
+        Args:
+            root: Виджет, через after которого планируются порции (обычно корневое окно)
+            budget_ms: Сколько миллисекунд подряд можно занимать цикл событий
+        """
+        self.root = root
+        self.budget = budget_ms / 1000
+        self._queue: List[Tuple[int, int, UITask]] = []
+        self._counter = itertools.count()
+        self._job = None
+        self._running = False
+        self.slices = 0
+        self.steps = 0
+        self.max_slice_ms = 0.0
+
+    def submit(self, steps: Iterable[Any], priority: int = PRIORITY_NORMAL, owner: Any = None,
+               on_done: Optional[Callable[[], None]] = None, run_now: bool = False) -> UITask:
+        """Ставит задачу в очередь.
+
+        Args:
+            steps: Генератор (или другой итератор); каждый шаг — порция работы
+            priority: Приоритет (меньше — раньше)
+            owner: Владелец задачи, по которому её можно отменить (cancel_owner)
+            on_done: Вызывается после последнего шага
+            run_now: Сразу выполнить первую порцию, не дожидаясь цикла событий
+        """
+        task = UITask(steps, priority, owner, on_done)
+        heapq.heappush(self._queue, (priority, next(self._counter), task))
+        if run_now and not self._running:
+            self._run_slice()
+        else:
+            self._schedule(idle=True)
+        return task
+
+    def cancel_owner(self, owner: Any) -> int:
+        """Отменяет все задачи владельца (например, при уходе с экрана)."""
+        cancelled = 0
+        for _, _, task in self._queue:
+            if task.owner is owner and task.active:
+                task.cancel()
+                cancelled += 1
+        return cancelled
+
+    def pending(self) -> int:
+        return sum(1 for _, _, task in self._queue if task.active)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'pending': self.pending(),
+            'slices': self.slices,
+            'steps': self.steps,
+            'max_slice_ms': self.max_slice_ms,
+        }
+
+    def _schedule(self, idle: bool = False) -> None:
+        if self._job is not None or not self._queue:
+            return
+        # Следующая порция — после обработки накопившихся событий Tk
+        self._job = self.root.after_idle(self._run_slice) if idle else self.root.after(1, self._run_slice)
+
+    def _run_slice(self) -> None:
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        started = time.perf_counter()
+        deadline = started + self.budget
+        self._running = True
+        try:
+            self._run_steps(deadline)
+        finally:
+            self._running = False
+            self.slices += 1
+            self.max_slice_ms = max(self.max_slice_ms, (time.perf_counter() - started) * 1000)
+            # Очередь не должна останавливаться из-за ошибки в одной задаче
+            self._schedule()
+
+    def _run_steps(self, deadline: float) -> None:
+        while self._queue:
+            task = self._queue[0][2]
+            if not task.active or not self._owner_alive(task):
+                heapq.heappop(self._queue)
+                task.cancelled = task.cancelled or not task.done
+                continue
+            try:
+                next(task.steps)
+                self.steps += 1
+            except StopIteration:
+                heapq.heappop(self._queue)
+                task.done = True
+                if task.on_done is not None:
+                    try:
+                        task.on_done()
+                    except Exception as e:
+                        task.error = e
+                        print(f"Ошибка завершения фоновой задачи интерфейса: {e}")
+            except Exception as e:
+                heapq.heappop(self._queue)
+                task.error = e
+                task.cancelled = True
+                print(f"Ошибка фоновой задачи интерфейса: {e}")
+            if time.perf_counter() >= deadline:
+                break
+
+    @staticmethod
+    def _owner_alive(task: UITask) -> bool:
+        exists = getattr(task.owner, 'winfo_exists', None)
+        if exists is None:
+            return True
+        try:
+            return bool(exists())
+        except Exception:
+            return False
+
+
+def get_scheduler(widget) -> UIScheduler:
+    """Общий планировщик окна, которому принадлежит widget."""
+    root = widget._root()
+    scheduler = getattr(root, '_ui_scheduler', None)
+    if scheduler is None:
+        scheduler = UIScheduler(root)
+        root._ui_scheduler = scheduler
+    return scheduler
+
+
+def chunked(items: Iterable[Any], action: Callable[[Any], None], size: int = 1) -> Generator[None, None, None]:
+    """Превращает обработку элементов в задачу: шаг — size элементов."""
+    count = 0
+    for item in items:
+        action(item)
+        count += 1
+        if count % size == 0:
+            yield
@@ -8,6 +8,12 @@ class ThemeType(Enum):
 # Оптимизированная система тем с кэшированием
 CURRENT_THEME = {}
 _THEME_CACHE = {}
+# Имя текущей темы и счётчик её смен: представления сравнивают версию,
+# чтобы узнать, пропустили ли они переключение
+_CURRENT_THEME_NAME: Optional[str] = None
+_THEME_VERSION = 0
+# Реестр общих объектов шрифтов (ui.themes.font_registry), подключается окном
+_FONT_REGISTRY = None
 
 LIGHT_THEME = {
     # Основные цвета - светлая тема с лучшим контрастом
@@ -98,11 +104,16 @@ class ThemeManager:
     @classmethod
     def set_theme(cls, theme: ThemeType) -> None:
         """Устанавливает текущую тему"""
-        global CURRENT_THEME
+        global CURRENT_THEME, _CURRENT_THEME_NAME, _THEME_VERSION
         if theme not in cls._themes:
             raise ValueError(f"Unknown theme: {theme}")
         CURRENT_THEME.clear()
         CURRENT_THEME.update(cls._themes[theme])
+        _CURRENT_THEME_NAME = theme.value if isinstance(theme, ThemeType) else theme
+        _THEME_VERSION += 1
+        if _FONT_REGISTRY is not None:
+            # Шрифты меняются на месте: виджеты держат общие объекты
+            _FONT_REGISTRY.sync()
     
     @classmethod
     def add_custom_theme(cls, name: str, theme_data: Dict[str, Any]) -> None:
@@ -113,9 +124,9 @@ def set_theme(name: str) -> None:
     """Оптимизированная установка темы с кэшированием."""
     global _THEME_CACHE
     
-    # Проверяем кэш
-    if name in _THEME_CACHE and CURRENT_THEME == _THEME_CACHE[name]:
-        return  # Тема уже установлена
+    # Тема уже установлена
+    if name == _CURRENT_THEME_NAME:
+        return
     
     theme_map = {"light": ThemeType.LIGHT, "dark": ThemeType.DARK}
     if name not in theme_map:
@@ -165,8 +176,34 @@ def get_font(name: str):
         font = fallback_fonts.get(name, ("Segoe UI", 14))
         print(f"Шрифт {name} не найден, используется fallback: {font}")
     
+    if _FONT_REGISTRY is not None:
+        return _FONT_REGISTRY.font(name, font)
     return font
 
+def set_font_registry(registry) -> None:
+    """Подключает реестр общих шрифтов: get_font будет возвращать его объекты."""
+    global _FONT_REGISTRY
+    _FONT_REGISTRY = registry
+
+def get_font_registry():
+    return _FONT_REGISTRY
+
+def set_font_scale(scale: float) -> bool:
+    """Меняет масштаб общих шрифтов.
+
+    Размеры шрифтов меняются на месте, а версия темы увеличивается, чтобы
+    представления пересчитали зависящую от шрифта раскладку (высоту строк
+    списков) в update_theme — скрытые при следующем показе.
+
+    Returns:
+        True, если хотя бы один шрифт изменился
+    """
+    global _THEME_VERSION
+    if _FONT_REGISTRY is None or not _FONT_REGISTRY.set_scale(scale):
+        return False
+    _THEME_VERSION += 1
+    return True
+
 def get_theme_colors() -> Dict[str, str]:
     """Возвращает все цвета текущей темы"""
     return {k: v for k, v in CURRENT_THEME.items() if k.startswith("COLOR_")}
@@ -177,10 +214,11 @@ def get_fonts() -> Dict[str, tuple]:
 
 def get_current_theme_name() -> Optional[str]:
     """Возвращает имя текущей темы"""
-    for theme_type, theme_data in ThemeManager._themes.items():
-        if CURRENT_THEME == theme_data:
-            return theme_type.value if isinstance(theme_type, ThemeType) else theme_type
-    return None
+    return _CURRENT_THEME_NAME
+
+def get_theme_version() -> int:
+    """Номер версии темы: увеличивается при каждой её смене."""
+    return _THEME_VERSION
 
 def clear_theme_cache() -> None:
     """Очищает кэш тем (для отладки)."""
@@ -191,6 +229,7 @@ def get_theme_info() -> dict:
     """Возвращает информацию о текущей теме для отладки."""
     return {
         "current_theme_name": get_current_theme_name(),
+        "theme_version": _THEME_VERSION,
         "colors_count": len([k for k in CURRENT_THEME.keys() if k.startswith("COLOR_")]),
         "fonts_count": len([k for k in CURRENT_THEME.keys() if k.startswith("FONT_")]),
         "cache_size": len(_THEME_CACHE)
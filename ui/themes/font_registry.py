@@ -0,0 +1,129 @@
+"""Общие объекты шрифтов темы.
+
+Для каждого имени FONT_* создаётся один CTkFont, и get_font возвращает
+его всем виджетам. Смена темы или масштаба шрифта меняет несколько
+объектов шрифтов на месте: виджеты, которые их держат, обновляются сами
+(CTkFont вызывает их обработчики), и перебирать дерево виджетов не нужно.
+
+Ширина измеренного текста кэшируется по шрифту: measure() обращается к
+Tk только для новой строки, кэш шрифта сбрасывается при его изменении.
+"""
+
+from typing import Any, Dict, Tuple
+
+import customtkinter as ctk
+
+from ui.style import CURRENT_THEME
+
+MIN_SCALE = 0.75
+MAX_SCALE = 2.0
+MEASURE_CACHE_SIZE = 2048  # Строк на шрифт, после чего кэш шрифта сбрасывается
+
+FontSpec = Tuple[str, int, str]   # (семейство, размер в пикселях, насыщенность)
+
+
+def clamp_scale(scale: float) -> float:
+    try:
+        scale = float(scale)
+    except (TypeError, ValueError):
+        return 1.0
+    return min(MAX_SCALE, max(MIN_SCALE, scale))
+
+
+def normalize_spec(font: Any, scale: float = 1.0) -> FontSpec:
+    """Кортеж темы ("Segoe UI", 14[, "bold"]) → (семейство, размер с масштабом, насыщенность)."""
+    family, size = font[0], font[1]
+    weight = "bold" if any("bold" in str(part) for part in font[2:]) else "normal"
+    return family, max(1, round(size * scale)), weight
+
+
+class FontRegistry:
+    """Именованные CTkFont, общие для всех виджетов окна."""
+
+    def __init__(self, scale: float = 1.0):
+        """Инициализирует реестр; шрифты создаются при первом обращении.
+
+        Args:
+            scale: Масштаб шрифтов (настройка font_scale)
+        """
+        self.scale = clamp_scale(scale)
+        self._fonts: Dict[str, ctk.CTkFont] = {}
+        self._specs: Dict[str, FontSpec] = {}
+        self._fallbacks: Dict[str, Any] = {}
+        self._measures: Dict[str, Dict[str, int]] = {}
+        self._linespace: Dict[str, int] = {}
+        self.reconfigured = 0
+        self.measure_hits = 0
+        self.measure_misses = 0
+
+    def font(self, name: str, fallback: Any = ("Segoe UI", 14)) -> ctk.CTkFont:
+        """Общий шрифт name; описание берётся из текущей темы (или fallback)."""
+        font = self._fonts.get(name)
+        if font is None:
+            self._fallbacks[name] = fallback
+            family, size, weight = self._specs[name] = normalize_spec(
+                CURRENT_THEME.get(name, fallback), self.scale
+            )
+            font = self._fonts[name] = ctk.CTkFont(family=family, size=size, weight=weight)
+        return font
+
+    def is_shared(self, font: Any) -> bool:
+        return any(shared is font for shared in self._fonts.values())
+
+    def sync(self) -> int:
+        """Приводит шрифты к текущей теме и масштабу.
+
+        Returns:
+            Сколько шрифтов изменилось
+        """
+        changed = 0
+        for name, font in self._fonts.items():
+            spec = normalize_spec(CURRENT_THEME.get(name, self._fallbacks[name]), self.scale)
+            if spec == self._specs[name]:
+                continue
+            family, size, weight = self._specs[name] = spec
+            font.configure(family=family, size=size, weight=weight)
+            self._measures.pop(name, None)
+            self._linespace.pop(name, None)
+            changed += 1
+        self.reconfigured += changed
+        return changed
+
+    def set_scale(self, scale: float) -> int:
+        """Меняет масштаб всех шрифтов; возвращает число изменившихся."""
+        scale = clamp_scale(scale)
+        if scale == self.scale:
+            return 0
+        self.scale = scale
+        return self.sync()
+
+    def measure(self, name: str, text: str) -> int:
+        """Ширина text в пикселях шрифтом name (с кэшем)."""
+        cache = self._measures.get(name)
+        if cache is None:
+            cache = self._measures[name] = {}
+        width = cache.get(text)
+        if width is not None:
+            self.measure_hits += 1
+            return width
+        self.measure_misses += 1
+        if len(cache) >= MEASURE_CACHE_SIZE:
+            cache.clear()
+        width = cache[text] = self.font(name).measure(text)
+        return width
+
+    def linespace(self, name: str) -> int:
+        """Высота строки шрифта name в пикселях (с кэшем)."""
+        height = self._linespace.get(name)
+        if height is None:
+            height = self._linespace[name] = self.font(name).metrics("linespace")
+        return height
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'fonts': len(self._fonts),
+            'scale': self.scale,
+            'reconfigured': self.reconfigured,
+            'measure_hits': self.measure_hits,
+            'measure_misses': self.measure_misses,
+        }
@@ -0,0 +1,207 @@
+"""Привязка свойств виджетов к токенам темы.
+
+Виджет регистрирует, какие токены темы он использует:
+
+    bind_theme(label, text_color="COLOR_TEXT", font="FONT_TITLE")
+
+При смене темы вычисляется разница между старой и новой темой, и
+configure вызывается только для виджетов и свойств, чьи токены
+изменились. Шрифты одинаковы в светлой и тёмной темах, поэтому при
+переключении их никто не трогает; работа пропорциональна числу
+изменившихся свойств, а не размеру дерева виджетов. Все изменения
+одного виджета сводятся в один configure и выполняются за один проход.
+
+Привязки хранятся в областях (ThemeBindings): у каждого представления
+своя, чтобы скрытые экраны можно было перекрашивать отдельно. Виджет
+попадает в ближайшую область вверх по цепочке master; вне представлений
+— в общую. Область помнит версию темы, в которой она нарисована
+(get_theme_version): скрытое представление просто остаётся на старой
+версии и догоняет текущую одним sync() при показе.
+"""
+
+import tkinter
+import weakref
+from typing import Any, Dict, Iterable, Mapping, Optional, Set
+
+from core.utils import metrics
+from ui.style import CURRENT_THEME, get_color, get_font, get_font_registry, get_theme_version
+
+
+def theme_value(token: str) -> Any:
+    """Значение токена в текущей теме."""
+    return get_font(token) if token.startswith("FONT_") else get_color(token)
+
+
+def changed_tokens(old: Mapping[str, Any], new: Mapping[str, Any]) -> Set[str]:
+    """Токены, значения которых различаются в двух темах."""
+    return {token for token in old.keys() | new.keys() if old.get(token) != new.get(token)}
+
+
+class ThemeBindings:
+    """Область привязок: виджет → {свойство: токен} и обратный индекс по токенам."""
+
+    def __init__(self):
+        self._options: "weakref.WeakKeyDictionary[Any, Dict[str, str]]" = weakref.WeakKeyDictionary()
+        self._by_token: Dict[str, "weakref.WeakSet[Any]"] = {}
+        self.configure_calls = 0
+        # Версия темы, в которой нарисованы виджеты области, и значения её токенов
+        self.version = get_theme_version()
+        self._snapshot = dict(CURRENT_THEME)
+
+    def __len__(self) -> int:
+        return len(self._options)
+
+    def bind(self, widget: Any, **options: str) -> None:
+        """Привязывает свойства виджета к токенам (повторная привязка заменяет токен)."""
+        if not options:
+            return
+        if self.stale:
+            # Виджет создан в текущей теме, а область ещё в старой: без
+            # синхронизации возврат к старой теме не дал бы разницы для него
+            self.sync()
+        bound = self._options.get(widget)
+        if bound is None:
+            bound = self._options[widget] = {}
+        for option, token in options.items():
+            previous = bound.get(option)
+            if previous == token:
+                continue
+            bound[option] = token
+            if previous is not None and previous not in bound.values():
+                self._by_token[previous].discard(widget)
+            widgets = self._by_token.get(token)
+            if widgets is None:
+                widgets = self._by_token[token] = weakref.WeakSet()
+            widgets.add(widget)
+
+    def unbind(self, widget: Any, *options: str) -> None:
+        """Снимает привязку свойств (без options — всех свойств виджета)."""
+        bound = self._options.get(widget)
+        if bound is None:
+            return
+        for option in options or list(bound):
+            token = bound.pop(option, None)
+            if token is not None and token not in bound.values():
+                self._by_token[token].discard(widget)
+        if not bound:
+            del self._options[widget]
+
+    @property
+    def stale(self) -> bool:
+        """Тема сменилась с тех пор, как область была синхронизирована."""
+        return self.version != get_theme_version()
+
+    def sync(self) -> Set[str]:
+        """Догоняет текущую тему: перекрашивает свойства изменившихся токенов.
+
+        Returns:
+            Изменившиеся токены (пусто, если область уже в текущей теме или
+            тема вернулась к прежней)
+        """
+        version = get_theme_version()
+        if version == self.version:
+            return set()
+        changed = changed_tokens(self._snapshot, CURRENT_THEME)
+        self.version = version
+        self._snapshot = dict(CURRENT_THEME)
+        if changed:
+            self.apply(changed)
+        return changed
+
+    def tokens(self, widget: Any) -> Dict[str, str]:
+        return dict(self._options.get(widget, {}))
+
+    def refresh(self, widget: Any) -> None:
+        """Заново применяет все привязанные свойства виджета из текущей темы."""
+        bound = self._options.get(widget)
+        if bound:
+            self._configure(widget, {option: theme_value(token) for option, token in bound.items()})
+
+    def apply(self, changed: Iterable[str]) -> int:
+        """Перекрашивает свойства, привязанные к изменившимся токенам.
+
+        Returns:
+            Число вызовов configure
+        """
+        updates: Dict[Any, Dict[str, Any]] = {}
+        fonts = get_font_registry()
+        for token in changed:
+            widgets = self._by_token.get(token)
+            if not widgets:
+                continue
+            value = theme_value(token)
+            if fonts is not None and fonts.is_shared(value):
+                # Общий шрифт уже изменён на месте (FontRegistry.sync), виджеты держат его
+                continue
+            for widget in list(widgets):
+                for option, bound in self._options.get(widget, {}).items():
+                    if bound == token:
+                        updates.setdefault(widget, {})[option] = value
+        calls = 0
+        for widget, values in updates.items():
+            if self._configure(widget, values):
+                calls += 1
+        self.configure_calls += calls
+        metrics.inc("theme.configure_calls", calls)
+        return calls
+
+    def _configure(self, widget: Any, values: Dict[str, Any]) -> bool:
+        try:
+            widget.configure(**values)
+            return True
+        except tkinter.TclError:
+            # Виджет уже уничтожен, но ещё не собран сборщиком мусора
+            self.unbind(widget)
+            return False
+
+
+_global_bindings = ThemeBindings()
+
+
+def global_bindings() -> ThemeBindings:
+    """Область для виджетов вне представлений."""
+    return _global_bindings
+
+
+def find_bindings(widget: Any) -> ThemeBindings:
+    """Ближайшая область вверх по цепочке master (или общая)."""
+    current = widget
+    while current is not None:
+        bindings = current.__dict__.get('theme_bindings')
+        if isinstance(bindings, ThemeBindings):
+            return bindings
+        current = getattr(current, 'master', None)
+    return _global_bindings
+
+
+def bind_theme(widget: Any, bindings: Optional[ThemeBindings] = None, **options: str) -> Any:
+    """Привязывает свойства виджета к токенам темы; возвращает сам виджет.
+
+    Args:
+        widget: Виджет
+        bindings: Область привязок (по умолчанию ближайшая вверх по master)
+        **options: Свойство configure → токен темы
+    """
+    if bindings is None:
+        bindings = find_bindings(widget)
+    bindings.bind(widget, **options)
+    return widget
+
+
+def set_theme_tokens(widget: Any, **options: str) -> Any:
+    """Задаёт свойства значениями токенов и привязывает их к ним.
+
+    Для свойств, зависящих от состояния (активная кнопка, цвет статуса):
+    при смене состояния меняется токен, при смене темы — значение.
+    """
+    widget.configure(**{option: theme_value(token) for option, token in options.items()})
+    return bind_theme(widget, **options)
+
+
+def unbind_theme(widget: Any, *options: str) -> None:
+    find_bindings(widget).unbind(widget, *options)
+
+
+def refresh_theme(widget: Any) -> None:
+    """Применяет все привязанные свойства виджета из текущей темы."""
+    find_bindings(widget).refresh(widget)
@@ -1,11 +1,17 @@
 import customtkinter as ctk
 from abc import ABC, abstractmethod
 from ui.animations.transitions import AnimationManager
+from ui.style import get_theme_version
+from ui.themes.theme_bindings import ThemeBindings
 
 class BaseView(ctk.CTkFrame, ABC):
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
         self.animation_manager = AnimationManager()
+        # Привязки виджетов экрана к токенам темы (см. bind_theme) и версия
+        # темы, в которой экран нарисован: скрытый экран догоняет её при показе
+        self.theme_bindings = ThemeBindings()
+        self.theme_version = get_theme_version()
         self.setup_ui()
     
     @abstractmethod
@@ -18,13 +24,33 @@ class BaseView(ctk.CTkFrame, ABC):
         """Обновление темы виджетов"""
         pass
     
+    @property
+    def theme_dirty(self) -> bool:
+        """Экран пропустил смену темы."""
+        return self.theme_version != get_theme_version()
+    
+    def sync_theme(self) -> bool:
+        """Применяет пропущенные смены темы; для видимого экрана — сразу, для скрытого — при показе.
+        
+        Returns:
+            True, если тема применялась
+        """
+        if not self.theme_dirty:
+            return False
+        self.theme_version = get_theme_version()
+        self.theme_bindings.sync()
+        self.update_theme()
+        return True
+    
     def show_with_animation(self, animation_type: str = "fade"):
-        """Показывает представление с анимацией"""
+        """Показывает представление с анимацией ("fade" или "slide").
+
+        Представление упаковывается через pack, поэтому scale_in к нему не
+        применим (см. AnimationManager.scale_in).
+        """
         self.pack(fill="both", expand=True, padx=10, pady=10)
         
         if animation_type == "fade":
             self.animation_manager.fade_in(self)
         elif animation_type == "slide":
             self.animation_manager.slide_in(self)
-        elif animation_type == "scale":
-            self.animation_manager.scale_in(self)
\ No newline at end of file
@@ -2,8 +2,12 @@ import customtkinter as ctk
 from typing import Callable, Optional
 from ui.views.base_view import BaseView
 from ui.widgets.note_card import NoteCard
+from ui.widgets.widget_pool import WidgetPool
+from ui.widgets.keyed_list import KeyedList, ReconcileStats
+from ui.scheduler import get_scheduler
 from ui.widgets.enhanced_button import EnhancedButton
 from ui.style import get_color, get_font
+from ui.themes.theme_bindings import bind_theme
 from core.services.note_service import NoteService
 
 class NotesView(BaseView):
@@ -12,9 +16,11 @@ class NotesView(BaseView):
         self.on_add_note = on_add_note
         self.selected_category = "Все"
         super().__init__(parent)
+        self.note_service.subscribe(self._on_notes_changed)
     
     def setup_ui(self):
         self.configure(fg_color=get_color("COLOR_FRAME_BG"))
+        bind_theme(self, fg_color="COLOR_FRAME_BG")
         
         # Заголовок
         self.title_label = ctk.CTkLabel(
@@ -23,6 +29,7 @@ class NotesView(BaseView):
             font=get_font("FONT_TITLE"),
             text_color=get_color("COLOR_TEXT")
         )
+        bind_theme(self.title_label, text_color="COLOR_TEXT", font="FONT_TITLE")
         self.title_label.pack(pady=20)
         
         # Панель фильтров
@@ -45,6 +52,7 @@ class NotesView(BaseView):
             command=self._on_add_click,
             fg_color=get_color("COLOR_ACCENT")
         )
+        bind_theme(self.add_btn, fg_color="COLOR_ACCENT")
         self.add_btn.pack(side="right", padx=10)
         
         # Область прокрутки для заметок
@@ -53,60 +61,96 @@ class NotesView(BaseView):
             fg_color=get_color("COLOR_FRAME_BG"),
             corner_radius=0
         )
+        bind_theme(self.scrollable_frame, fg_color="COLOR_FRAME_BG")
         self.scrollable_frame.pack(fill="both", expand=True, padx=20, pady=10)
         
+        self.no_notes_label = ctk.CTkLabel(
+            self.scrollable_frame,
+            text="Пока нет заметок. Добавьте первую!",
+            font=get_font("FONT_NORMAL"),
+            text_color=get_color("COLOR_TEXT_SECONDARY")
+        )
+        bind_theme(self.no_notes_label, text_color="COLOR_TEXT_SECONDARY", font="FONT_NORMAL")
+        
+        # Карточки не уничтожаются при перерисовке, а возвращаются в пул
+        self.card_pool = WidgetPool(lambda: NoteCard(
+            self.scrollable_frame,
+            on_delete=self.on_note_delete,
+            on_favorite=self.on_note_favorite
+        ))
+        # Карточки сопоставляются заметкам по id: при изменении перерисовываются
+        # только добавленные, удалённые, переставленные и изменившиеся
+        self.cards = KeyedList(
+            self.card_pool,
+            key=lambda note: note.id,
+            bind=lambda card, note: card.bind_note(note),
+            signature=lambda note: (note.text, note.category, note.is_favorite),
+            fill="x", pady=5, padx=10
+        )
+        self.last_reconcile = None
+        self._render_task = None
+        
         self.refresh_notes()
     
     def refresh_notes(self):
-        # Очищаем текущие заметки
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
         # Получаем заметки
         category = None if self.selected_category == "Все" else self.selected_category
         notes = self.note_service.get_notes(category)
         
+        # Незавершённая отрисовка предыдущего состояния больше не нужна
+        if self._render_task is not None:
+            self._render_task.cancel()
+            self._render_task = None
+        
         if not notes:
-            no_notes_label = ctk.CTkLabel(
-                self.scrollable_frame,
-                text="Пока нет заметок. Добавьте первую!",
-                font=get_font("FONT_NORMAL"),
-                text_color=get_color("COLOR_TEXT_SECONDARY")
-            )
-            no_notes_label.pack(pady=50)
+            self.cards.clear()
+            self.no_notes_label.pack(pady=50)
             return
+        self.no_notes_label.pack_forget()
         
-        # Создаем карточки заметок
-        for note in notes:
-            card = NoteCard(
-                self.scrollable_frame,
-                note=note,
-                on_delete=self.on_note_delete,
-                on_favorite=self.on_note_favorite
-            )
-            card.pack(fill="x", pady=5, padx=10)
+        # Карточки согласуются порциями в пределах бюджета кадра; первая
+        # порция выполняется сразу, чтобы верх списка появился без задержки
+        self.last_reconcile = ReconcileStats()
+        self._render_task = get_scheduler(self).submit(
+            self.cards.iter_update(notes, self.last_reconcile),
+            owner=self,
+            run_now=True
+        )
+    
+    def on_show(self):
+        if self._render_task is not None and self._render_task.cancelled:
+            self.refresh_notes()
+    
+    def on_hide(self):
+        get_scheduler(self).cancel_owner(self)
+    
+    def get_pool_stats(self):
+        """Размер пула карточек и доля переиспользованных."""
+        return self.card_pool.stats()
     
     def on_category_changed(self, category: str):
         self.selected_category = category
         self.refresh_notes()
     
     def on_note_delete(self, note_id: str):
-        if self.note_service.delete_note(note_id):
-            self.refresh_notes()
+        self.note_service.delete_note(note_id)
     
     def on_note_favorite(self, note_id: str):
-        if self.note_service.toggle_favorite(note_id):
-            self.refresh_notes()
+        self.note_service.toggle_favorite(note_id)
+    
+    def _on_notes_changed(self, change):
+        # Изменения приходят из общего хранилища, файл не перечитывается
+        self.refresh_notes()
+    
+    def destroy(self):
+        self.note_service.unsubscribe(self._on_notes_changed)
+        super().destroy()
     
     def _on_add_click(self):
         if self.on_add_note:
             self.on_add_note()
     
     def update_theme(self):
-        self.configure(fg_color=get_color("COLOR_FRAME_BG"))
-        self.title_label.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_TITLE")
-        )
-        self.scrollable_frame.configure(fg_color=get_color("COLOR_FRAME_BG"))
-        self.add_btn.update_theme()
\ No newline at end of file
+        # Все виджеты экрана, включая карточки в пуле, привязаны к токенам темы
+        # (bind_theme): при смене темы перекрашиваются только изменившиеся свойства
+        pass
\ No newline at end of file
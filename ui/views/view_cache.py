@@ -0,0 +1,143 @@
+"""Кэш представлений главного окна.
+
+Вместо уничтожения и повторного построения экрана при каждом переходе
+представления скрываются через pack_forget и показываются снова. Так
+сохраняется их состояние (выбранная категория, прокрутка, черновик), а
+переключение между уже построенными экранами стоит один pack.
+Давно не открывавшиеся представления вытесняются по принципу LRU.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def count_widgets(widget) -> int:
+    """Число виджетов в поддереве (оценка занимаемой памяти)."""
+    total = 0
+    stack = [widget]
+    while stack:
+        current = stack.pop()
+        total += 1
+        stack.extend(current.winfo_children())
+    return total
+
+
+class ViewCache:
+    """LRU-кэш представлений с ограничением по числу экранов и виджетов."""
+
+    def __init__(self, max_views: int = 4, max_widgets: Optional[int] = None,
+                 pack_options: Optional[Dict[str, Any]] = None):
+        """Инициализирует кэш.
+
+        Args:
+            max_views: Сколько представлений держать построенными
+            max_widgets: Предел суммарного числа виджетов скрытых представлений
+                (None — без ограничения)
+            pack_options: Параметры pack при показе представления
+        """
+        self.max_views = max(1, max_views)
+        self.max_widgets = max_widgets
+        self.pack_options = pack_options or {"fill": "both", "expand": True, "padx": 5, "pady": 5}
+        self._views: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._weights: Dict[Hashable, int] = {}
+        self.current_key: Optional[Hashable] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def current(self) -> Optional[Any]:
+        return self._views.get(self.current_key) if self.current_key is not None else None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        return self._views.get(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._views
+
+    def show(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Показывает представление key, при необходимости создавая его.
+
+        Args:
+            key: Имя экрана
+            factory: Создаёт представление, если его нет в кэше
+        """
+        current = self.current
+        view = self._views.get(key)
+        if view is not None and view is current:
+            return view
+        if current is not None:
+            self._hide(self.current_key, current)
+
+        if view is None:
+            self.misses += 1
+            view = factory()
+            self._views[key] = view
+        else:
+            self.hits += 1
+            # Смену темы скрытое представление применяет только сейчас, до показа
+            if hasattr(view, 'sync_theme'):
+                view.sync_theme()
+        self._views.move_to_end(key)
+        self._weights.pop(key, None)
+        self.current_key = key
+
+        view.pack(**self.pack_options)
+        if hasattr(view, 'on_show'):
+            view.on_show()
+        self._evict()
+        return view
+
+    def set_limits(self, max_views: int, max_widgets: Optional[int] = None) -> None:
+        """Меняет ограничения и сразу вытесняет лишние представления."""
+        self.max_views = max(1, max_views)
+        self.max_widgets = max_widgets
+        self._evict()
+
+    def invalidate(self, key: Hashable) -> None:
+        """Уничтожает представление, чтобы при следующем показе построить его заново."""
+        view = self._views.pop(key, None)
+        self._weights.pop(key, None)
+        if key == self.current_key:
+            self.current_key = None
+        if view is not None:
+            view.destroy()
+
+    def clear(self) -> None:
+        for key in list(self._views):
+            self.invalidate(key)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'views': len(self._views),
+            'hidden_widgets': sum(self._weights.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _hide(self, key: Hashable, view: Any) -> None:
+        if hasattr(view, 'on_hide'):
+            view.on_hide()
+        view.pack_forget()
+        if self.max_widgets is not None:
+            # Подсчёт откладывается, чтобы не задерживать показ следующего экрана
+            view.after_idle(lambda: self._weigh(key, view))
+
+    def _weigh(self, key: Hashable, view: Any) -> None:
+        if self._views.get(key) is not view or key == self.current_key:
+            return
+        self._weights[key] = count_widgets(view)
+        self._evict()
+
+    def _evict(self) -> None:
+        # Вытесняются самые давно показанные скрытые представления
+        while len(self._views) > self.max_views or self._over_widget_limit():
+            victim = next((key for key in self._views if key != self.current_key), None)
+            if victim is None:
+                return
+            self.invalidate(victim)
+            self.evictions += 1
+
+    def _over_widget_limit(self) -> bool:
+        return self.max_widgets is not None and sum(self._weights.values()) > self.max_widgets
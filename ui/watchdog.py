@@ -0,0 +1,208 @@
+"""Сторож зависаний цикла событий Tk.
+
+Сердцебиение через after каждые interval_ms измеряет, насколько позже
+запланированного цикл событий его выполнил: эта задержка попадает в
+гистограмму. Если задержка превысила порог, это зависание: вспомогательный
+поток, не дожидаясь, пока главный освободится, снимает его стек через
+sys._current_frames. Зависания пишутся в локальный журнал с ротацией;
+запись на диск идёт из вспомогательного потока.
+
+Включается настройкой watchdog_enabled или переменной окружения
+RELIEVE_STRESS_WATCHDOG=1.
+"""
+
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.utils.metrics import Histogram, env_flag
+
+WATCHDOG_ENV = "RELIEVE_STRESS_WATCHDOG"
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+def watchdog_requested(setting: bool = False) -> bool:
+    """Нужно ли включать сторож: переменная окружения важнее настройки."""
+    return env_flag(WATCHDOG_ENV, setting)
+
+
+@dataclass
+class StallRecord:
+    """Одно зависание цикла событий."""
+    duration_ms: float
+    started_at: float              # time.time() начала зависания
+    stack: Optional[str] = None    # Стек главного потока во время зависания
+
+
+class StallWatchdog:
+    """Измеряет задержку цикла событий и фиксирует зависания."""
+
+    def __init__(self, root, interval_ms: int = 100, threshold_ms: float = 200,
+                 log_path: Optional[str] = "data/ui_stalls.log", max_bytes: int = 512 * 1024,
+                 backup_count: int = 3, keep: int = 100):
+        """Инициализирует сторож.
+
+        Args:
+            root: Виджет, через after которого идёт сердцебиение (обычно корневое окно)
+            interval_ms: Период сердцебиения
+            threshold_ms: Задержка, начиная с которой она считается зависанием
+            log_path: Журнал зависаний (None — не писать на диск)
+            max_bytes: Размер журнала, после которого он ротируется
+            backup_count: Сколько старых журналов хранить
+            keep: Сколько последних зависаний держать в памяти
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.log_path = Path(log_path) if log_path else None
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.histogram = Histogram(LATENCY_BUCKETS_MS)
+        self.beats = 0
+        self._stalls: "deque[StallRecord]" = deque(maxlen=keep)
+        self._stall_count = 0
+        self._lock = threading.Lock()
+        self._expected: Optional[float] = None   # Когда должно прийти следующее сердцебиение
+        self._stack: Optional[str] = None        # Стек, снятый во время текущего зависания
+        self._sampled_for: Optional[float] = None
+        self._samples = 0
+        self._job = None
+        self._thread: Optional[threading.Thread] = None
+        self._records: "queue.Queue[Optional[StallRecord]]" = queue.Queue()
+        self._main_ident: Optional[int] = None
+        self._logger: Optional[logging.Logger] = None
+
+    @property
+    def running(self) -> bool:
+        return self._job is not None
+
+    def start(self) -> None:
+        """Запускает сердцебиение; вызывается из потока Tk."""
+        if self.running:
+            return
+        self._main_ident = threading.get_ident()
+        self._expected = time.perf_counter() + self.interval_ms / 1000
+        self._job = self.root.after(self.interval_ms, self._beat)
+        self._thread = threading.Thread(target=self._monitor, name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 1.0) -> None:
+        """Останавливает сердцебиение и дописывает журнал."""
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+        with self._lock:
+            self._expected = None
+        if self._thread is not None:
+            self._records.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        if self._logger is not None:
+            for handler in self._logger.handlers:
+                handler.close()
+
+    def stalls(self) -> List[StallRecord]:
+        """Последние зависания, от старых к новым."""
+        with self._lock:
+            return list(self._stalls)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'beats': self.beats,
+                'stalls': self._stall_count,
+                'stack_samples': self._samples,
+                'threshold_ms': self.threshold_ms,
+                'latency': self.histogram.snapshot(),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histogram.reset()
+            self._stalls.clear()
+            self.beats = 0
+            self._stall_count = 0
+            self._samples = 0
+
+    def _beat(self) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            if self._expected is None:
+                return
+            latency_ms = max(0.0, (now - self._expected) * 1000)
+            self._expected = now + self.interval_ms / 1000
+            stack, self._stack = self._stack, None
+            self.beats += 1
+            self.histogram.add(latency_ms)
+            record = None
+            if latency_ms >= self.threshold_ms:
+                record = StallRecord(latency_ms, time.time() - latency_ms / 1000, stack)
+                self._stalls.append(record)
+                self._stall_count += 1
+        if record is not None:
+            self._records.put(record)
+        self._job = self.root.after(self.interval_ms, self._beat)
+
+    def _monitor(self) -> None:
+        poll = max(self.threshold_ms / 4000, 0.005)
+        while True:
+            try:
+                record = self._records.get(timeout=poll)
+            except queue.Empty:
+                record = False
+            if record is None:
+                return
+            if record:
+                self._log(record)
+            self._sample_if_stalled()
+
+    def _sample_if_stalled(self) -> None:
+        with self._lock:
+            expected = self._expected
+            if expected is None or self._sampled_for == expected:
+                return
+            if (time.perf_counter() - expected) * 1000 < self.threshold_ms:
+                return
+            # Один снимок на зависание: пока сердцебиение не пришло, expected не меняется
+            self._sampled_for = expected
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame, limit=40))
+        with self._lock:
+            if self._expected == expected:
+                self._stack = stack
+                self._samples += 1
+
+    def _log(self, record: StallRecord) -> None:
+        if self.log_path is None:
+            return
+        try:
+            if self._logger is None:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                handler = logging.handlers.RotatingFileHandler(
+                    self.log_path, maxBytes=self.max_bytes,
+                    backupCount=self.backup_count, encoding='utf-8'
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                # Отдельный логгер, не связанный с корневым: в консоль ничего не идёт
+                self._logger = logging.Logger("relieve_stress.ui_stalls")
+                self._logger.addHandler(handler)
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(record.started_at))
+            message = f"{started} зависание {record.duration_ms:.0f} мс"
+            if record.stack:
+                message += "\n" + record.stack.rstrip()
+            self._logger.warning(message)
+        except OSError as e:
+            print(f"Ошибка записи журнала зависаний: {e}")
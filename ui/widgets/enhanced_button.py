@@ -7,11 +7,20 @@ import customtkinter as ctk
 from typing import Optional, Callable, Any
 from ui.style import get_color, get_font
 from ui.animations.transitions import AnimationManager
+from ui.themes.theme_bindings import bind_theme, refresh_theme
 
 
 class EnhancedButton(ctk.CTkButton):
     """Улучшенная кнопка с поддержкой анимаций и тем."""
     
+    # Свойства по умолчанию и токены темы, из которых они берутся
+    THEME_DEFAULTS = {
+        'fg_color': "COLOR_BUTTON_BG",
+        'hover_color': "COLOR_BUTTON_HOVER",
+        'text_color': "COLOR_TEXT",
+        'font': "FONT_NORMAL",
+    }
+    
     def __init__(self, parent: ctk.CTkBaseClass, hover_animation: bool = True, 
                  pulse_on_click: bool = False, **kwargs):
         """Инициализирует улучшенную кнопку.
@@ -26,29 +35,31 @@ class EnhancedButton(ctk.CTkButton):
         self._original_command = kwargs.get('command')
         
         # Применяем стандартные стили
-        self._apply_default_styles(kwargs)
+        theme_tokens = self._apply_default_styles(kwargs)
         
         # Заменяем команду для добавления анимации
         if self.pulse_on_click and self._original_command:
             kwargs['command'] = self._enhanced_command
         
         super().__init__(parent, **kwargs)
+        # Стандартные цвета следуют за темой; заданные явно привязывает владелец кнопки
+        bind_theme(self, **theme_tokens)
         self._setup_hover_effects()
     
-    def _apply_default_styles(self, kwargs: dict) -> None:
-        """Применяет стандартные стили к кнопке."""
-        defaults = {
-            'fg_color': get_color("COLOR_BUTTON_BG"),
-            'hover_color': get_color("COLOR_BUTTON_HOVER"),
-            'text_color': get_color("COLOR_TEXT"),
-            'font': get_font("FONT_NORMAL"),
-            'corner_radius': 8,
-            'border_width': 0
-        }
+    def _apply_default_styles(self, kwargs: dict) -> dict:
+        """Применяет стандартные стили к кнопке.
         
-        for key, value in defaults.items():
+        Returns:
+            Свойства, получившие значения из темы, и их токены
+        """
+        theme_tokens = {}
+        for key, token in self.THEME_DEFAULTS.items():
             if key not in kwargs:
-                kwargs[key] = value
+                kwargs[key] = get_font(token) if key == 'font' else get_color(token)
+                theme_tokens[key] = token
+        kwargs.setdefault('corner_radius', 8)
+        kwargs.setdefault('border_width', 0)
+        return theme_tokens
     
     def _setup_hover_effects(self) -> None:
         """Настраивает эффекты наведения."""
@@ -82,13 +93,8 @@ class EnhancedButton(ctk.CTkButton):
                 print(f"Ошибка в команде кнопки: {e}")
     
     def update_theme(self) -> None:
-        """Обновляет тему кнопки."""
-        self.configure(
-            fg_color=get_color("COLOR_BUTTON_BG"),
-            hover_color=get_color("COLOR_BUTTON_HOVER"),
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_NORMAL")
-        )
+        """Заново применяет привязанные к теме свойства кнопки."""
+        refresh_theme(self)
     
     def set_loading(self, loading: bool = True) -> None:
         """Устанавливает состояние загрузки."""
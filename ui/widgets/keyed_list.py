@@ -0,0 +1,179 @@
+"""Согласование списка виджетов с новым списком элементов по ключу.
+
+Вместо полной перерисовки сравнивает предыдущий и новый списки по ключу
+(например, Note.id) и выполняет минимальный набор операций: удаляет
+исчезнувшие строки, создаёт новые, перепривязывает изменившиеся и
+переставляет только те, что не входят в наибольшую сохранившую порядок
+подпоследовательность. Переключение избранного у одной заметки из
+двух тысяч затрагивает одну строку.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Iterator, List, Optional, Sequence, Set, TypeVar
+
+from ui.widgets.widget_pool import WidgetPool
+
+T = TypeVar("T")
+
+
+@dataclass
+class ReconcileStats:
+    """Сколько строк затронуло одно согласование."""
+    inserted: int = 0
+    removed: int = 0
+    moved: int = 0
+    updated: int = 0
+
+    @property
+    def touched(self) -> int:
+        return self.inserted + self.removed + self.moved + self.updated
+
+
+def stable_positions(positions: Sequence[int]) -> Set[int]:
+    """Индексы наибольшей возрастающей подпоследовательности.
+
+    positions — старые позиции сохранившихся элементов в новом порядке;
+    элементы из результата остаются на месте, остальные переставляются.
+    """
+    tails: List[int] = []        # Наименьший хвост возрастающей цепочки каждой длины
+    tail_index: List[int] = []   # Индекс элемента, стоящего в хвосте
+    previous = [-1] * len(positions)
+    for i, position in enumerate(positions):
+        length = bisect_left(tails, position)
+        if length == len(tails):
+            tails.append(position)
+            tail_index.append(i)
+        else:
+            tails[length] = position
+            tail_index[length] = i
+        previous[i] = tail_index[length - 1] if length else -1
+
+    result = set()
+    i = tail_index[-1] if tail_index else -1
+    while i != -1:
+        result.add(i)
+        i = previous[i]
+    return result
+
+
+class KeyedList(Generic[T]):
+    """Строки в контейнере с упаковкой pack, согласуемые по ключу элемента."""
+
+    def __init__(self, pool: WidgetPool, key: Callable[[T], Hashable],
+                 bind: Callable[[Any, T], None], signature: Callable[[T], Hashable],
+                 **pack_options):
+        """Инициализирует список.
+
+        Args:
+            pool: Пул, из которого берутся и куда возвращаются виджеты строк
+            key: Ключ элемента (одинаковый у одной и той же заметки)
+            bind: Показывает элемент в виджете строки
+            signature: Снимок отображаемых полей; строка перепривязывается,
+                только если снимок изменился
+            pack_options: Параметры pack для строк
+        """
+        self.pool = pool
+        self.key = key
+        self.bind = bind
+        self.signature = signature
+        self.pack_options = pack_options
+        self._keys: List[Hashable] = []
+        self._widgets: Dict[Hashable, Any] = {}
+        self._signatures: Dict[Hashable, Hashable] = {}
+        self._order_valid = True  # Порядок _keys совпадает с порядком упаковки
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def widgets(self) -> List[Any]:
+        """Виджеты строк в порядке отображения."""
+        return [self._widgets[key] for key in self._keys]
+
+    def update(self, items: Sequence[T]) -> ReconcileStats:
+        """Приводит строки в соответствие с items."""
+        stats = ReconcileStats()
+        for _ in self.iter_update(items, stats):
+            pass
+        return stats
+
+    def iter_update(self, items: Sequence[T], stats: Optional[ReconcileStats] = None) -> Iterator[None]:
+        """То же, что update, но по шагам: после каждой затронутой строки yield.
+
+        Подходит для UIScheduler. Если задачу отменить на середине, следующее
+        согласование переупакует все строки, так как их порядок не гарантирован.
+        """
+        stats = stats if stats is not None else ReconcileStats()
+        new_keys = [self.key(item) for item in items]
+        new_set = set(new_keys)
+
+        for key in list(self._widgets):
+            if key not in new_set:
+                self.pool.release(self._widgets.pop(key))
+                del self._signatures[key]
+                stats.removed += 1
+
+        if self._order_valid:
+            old_position = {key: i for i, key in enumerate(self._keys) if key in new_set}
+            kept = [i for i, key in enumerate(new_keys) if key in old_position]
+            stable = {kept[i] for i in stable_positions([old_position[new_keys[i]] for i in kept])}
+        else:
+            stable = set()
+        # Первая неподвижная строка: перед ней встаёт всё, что окажется в начале
+        first_stable = next((self._widgets[new_keys[i]] for i in sorted(stable)), None)
+        completed = False
+        try:
+            yield from self._apply(new_keys, items, stable, first_stable, stats)
+            completed = True
+        finally:
+            if completed:
+                self._keys = new_keys
+                self._order_valid = True
+            else:
+                # Прервано на середине: порядок строк на экране не совпадает ни с каким списком
+                self._keys = list(self._widgets)
+                self._order_valid = False
+
+    def _apply(self, new_keys, items, stable, first_stable, stats) -> Iterator[None]:
+        previous = None
+        for i, (key, item) in enumerate(zip(new_keys, items)):
+            widget = self._widgets.get(key)
+            signature = self.signature(item)
+            touched = True
+            if widget is None:
+                widget = self.pool.acquire()
+                self.bind(widget, item)
+                self._widgets[key] = widget
+                self._signatures[key] = signature
+                self._place(widget, previous, first_stable)
+                stats.inserted += 1
+            else:
+                touched = False
+                if self._signatures[key] != signature:
+                    self.bind(widget, item)
+                    self._signatures[key] = signature
+                    stats.updated += 1
+                    touched = True
+                if i not in stable:
+                    self._place(widget, previous, first_stable)
+                    stats.moved += 1
+                    touched = True
+            previous = widget
+            if touched:
+                yield
+
+    def clear(self) -> None:
+        for widget in self._widgets.values():
+            self.pool.release(widget)
+        self._keys = []
+        self._widgets = {}
+        self._signatures = {}
+        self._order_valid = True
+
+    def _place(self, widget, previous, first_stable) -> None:
+        if previous is not None:
+            widget.pack(after=previous, **self.pack_options)
+        elif first_stable is not None and first_stable is not widget:
+            widget.pack(before=first_stable, **self.pack_options)
+        else:
+            widget.pack(**self.pack_options)
@@ -6,21 +6,27 @@
 import customtkinter as ctk
 from typing import Optional, Callable
 from ui.style import get_color, get_font
-from ui.animations.transitions import AnimationManager
+from ui.themes.theme_bindings import bind_theme, refresh_theme
 from core.models.note import Note
 
 
 class NoteCard(ctk.CTkFrame):
-    """Карточка для отображения заметки с кнопками управления."""
+    """Карточка для отображения заметки с кнопками управления.
     
-    def __init__(self, parent: ctk.CTkBaseClass, note: Note, 
+    Карточку можно переиспользовать для другой заметки через bind_note(),
+    не пересоздавая виджеты (см. WidgetPool).
+    """
+    
+    TEXT_LIMIT = 150
+    
+    def __init__(self, parent: ctk.CTkBaseClass, note: Optional[Note] = None, 
                  on_delete: Optional[Callable[[str], None]] = None,
                  on_favorite: Optional[Callable[[str], None]] = None, **kwargs):
         """Инициализирует карточку заметки.
         
         Args:
             parent: Родительский элемент
-            note: Объект заметки
+            note: Объект заметки (можно привязать позже через bind_note)
             on_delete: Коллбэк для удаления
             on_favorite: Коллбэк для избранного
         """
@@ -39,21 +45,39 @@ class NoteCard(ctk.CTkFrame):
             border_width=1,
             border_color=get_color("COLOR_DIVIDER")
         )
+        bind_theme(self, fg_color="COLOR_FRAME_BG", border_color="COLOR_DIVIDER")
         
         self._create_text_area()
         self._create_control_panel()
+        if self.note is not None:
+            self.bind_note(self.note)
+    
+    def bind_note(self, note: Note) -> None:
+        """Показывает в карточке другую заметку.
+        
+        Обновляются только текст, категория и кнопка избранного; новые
+        виджеты не создаются.
+        
+        Args:
+            note: Объект заметки
+        """
+        self.note = note
+        self.text_label.configure(text=self._truncate_text(note.text, self.TEXT_LIMIT))
+        self.category_label.configure(text=f"#{note.category}")
+        self._update_favorite_button()
     
     def _create_text_area(self) -> None:
         """Создаёт область с текстом заметки."""
         self.text_label = ctk.CTkLabel(
             self,
-            text=self._truncate_text(self.note.text, 150),
+            text="",
             font=get_font("FONT_NORMAL"),
             text_color=get_color("COLOR_TEXT"),
             wraplength=300,
             justify="left",
             anchor="w"
         )
+        bind_theme(self.text_label, text_color="COLOR_TEXT", font="FONT_NORMAL")
         self.text_label.pack(pady=10, padx=15, fill="x")
     
     def _create_control_panel(self) -> None:
@@ -64,22 +88,22 @@ class NoteCard(ctk.CTkFrame):
         # Метка категории
         self.category_label = ctk.CTkLabel(
             self.buttons_frame,
-            text=f"#{self.note.category}",
+            text="",
             font=get_font("FONT_SMALL"),
             text_color=get_color("COLOR_TEXT_SECONDARY")
         )
+        bind_theme(self.category_label, text_color="COLOR_TEXT_SECONDARY", font="FONT_SMALL")
         self.category_label.pack(side="left", padx=5)
         
-        # Кнопка избранного
-        favorite_text = "★" if self.note.is_favorite else "☆"
+        # Кнопка избранного (состояние выставляется в bind_note)
         self.favorite_btn = ctk.CTkButton(
             self.buttons_frame,
-            text=favorite_text,
+            text="☆",
             width=30,
             height=30,
             command=self._on_favorite_click,
-            fg_color=get_color("COLOR_WARNING") if self.note.is_favorite else get_color("COLOR_BUTTON_BG"),
-            hover_color=get_color("COLOR_WARNING") if not self.note.is_favorite else get_color("COLOR_BUTTON_HOVER")
+            fg_color=get_color("COLOR_BUTTON_BG"),
+            hover_color=get_color("COLOR_WARNING")
         )
         self.favorite_btn.pack(side="right", padx=2)
         
@@ -93,6 +117,7 @@ class NoteCard(ctk.CTkFrame):
             fg_color=get_color("COLOR_ERROR"),
             hover_color=get_color("COLOR_ERROR")
         )
+        bind_theme(self.delete_btn, fg_color="COLOR_ERROR", hover_color="COLOR_ERROR")
         self.delete_btn.pack(side="right", padx=2)
     
     def _setup_hover_effects(self) -> None:
@@ -103,32 +128,35 @@ class NoteCard(ctk.CTkFrame):
     def _on_hover_enter(self, event) -> None:
         """Обработчик наведения мыши."""
         self.configure(border_color=get_color("COLOR_ACCENT"))
-        AnimationManager.scale_in(self, duration=0.1, scale_from=1.0, scale_to=1.02)
     
     def _on_hover_leave(self, event) -> None:
         """Обработчик ухода мыши."""
         self.configure(border_color=get_color("COLOR_DIVIDER"))
-        AnimationManager.scale_in(self, duration=0.1, scale_from=1.02, scale_to=1.0)
     
     def _on_favorite_click(self) -> None:
         """Обработчик нажатия кнопки избранного."""
-        if self.on_favorite:
+        if self.on_favorite and self.note is not None:
             self.on_favorite(self.note.id)
             # Обновляем визуальное состояние
             self._update_favorite_button()
     
     def _on_delete_click(self) -> None:
         """Обработчик нажатия кнопки удаления."""
-        if self.on_delete:
+        if self.on_delete and self.note is not None:
             self.on_delete(self.note.id)
     
     def _update_favorite_button(self) -> None:
         """Обновляет внешний вид кнопки избранного."""
-        favorite_text = "★" if self.note.is_favorite else "☆"
+        is_favorite = self.note is not None and self.note.is_favorite
+        fg_token = "COLOR_WARNING" if is_favorite else "COLOR_BUTTON_BG"
+        hover_token = "COLOR_BUTTON_HOVER" if is_favorite else "COLOR_WARNING"
         self.favorite_btn.configure(
-            text=favorite_text,
-            fg_color=get_color("COLOR_WARNING") if self.note.is_favorite else get_color("COLOR_BUTTON_BG")
+            text="★" if is_favorite else "☆",
+            fg_color=get_color(fg_token),
+            hover_color=get_color(hover_token)
         )
+        # Токены зависят от состояния: при смене темы берутся актуальные
+        bind_theme(self.favorite_btn, fg_color=fg_token, hover_color=hover_token)
     
     @staticmethod
     def _truncate_text(text: str, max_length: int) -> str:
@@ -136,22 +164,10 @@ class NoteCard(ctk.CTkFrame):
         return text[:max_length] + "..." if len(text) > max_length else text
     
     def update_theme(self) -> None:
-        """Обновляет тему карточки."""
-        self.configure(
-            fg_color=get_color("COLOR_FRAME_BG"),
-            border_color=get_color("COLOR_DIVIDER")
-        )
+        """Обновляет тему карточки.
         
-        self.text_label.configure(
-            text_color=get_color("COLOR_TEXT"),
-            font=get_font("FONT_NORMAL")
-        )
-        
-        self.category_label.configure(
-            text_color=get_color("COLOR_TEXT_SECONDARY"),
-            font=get_font("FONT_SMALL")
-        )
-        
-        # Обновляем кнопки
-        self._update_favorite_button()
-        self.delete_btn.configure(fg_color=get_color("COLOR_ERROR"))
\ No newline at end of file
+        Свойства привязаны к токенам темы (bind_theme) и перекрашиваются
+        при её смене сами; метод оставлен для явного обновления.
+        """
+        for widget in (self, self.text_label, self.category_label, self.favorite_btn, self.delete_btn):
+            refresh_theme(widget)
@@ -0,0 +1,295 @@
+"""Виртуализированный список с переиспользованием строк.
+
+Создаёт виджеты только для строк, попадающих в видимую область (плюс
+небольшой запас сверху и снизу), и при прокрутке перепривязывает их к
+другим элементам. Стоимость открытия и прокрутки не зависит от длины
+списка: на 50 и на 50 000 заметок создаётся одинаковое число виджетов.
+"""
+
+import sys
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import customtkinter as ctk
+from ui.style import get_color, get_font
+from ui.scheduler import PRIORITY_NORMAL, UIScheduler
+from ui.themes.theme_bindings import bind_theme, refresh_theme
+
+
+_STALE = object()  # Снимок строки (или позиция), которую нужно обновить в любом случае
+
+
+class VirtualList(ctk.CTkFrame):
+    """Список элементов одинаковой высоты с отрисовкой только видимых строк."""
+
+    SCROLL_STEP = 20  # Пикселей на одно деление колеса мыши
+
+    def __init__(self, parent: ctk.CTkBaseClass, row_height: int,
+                 create_row: Callable[[ctk.CTkBaseClass], Any],
+                 bind_row: Callable[[Any, Any], None],
+                 overscan: int = 2, empty_text: str = "",
+                 key: Optional[Callable[[Any], Hashable]] = None,
+                 signature: Optional[Callable[[Any], Hashable]] = None,
+                 scheduler: Optional[UIScheduler] = None, **kwargs):
+        """Инициализирует список.
+
+        Args:
+            parent: Родительский элемент
+            row_height: Высота строки в пикселях (вместе с отступом)
+            create_row: Создаёт виджет строки в переданном контейнере
+            bind_row: Показывает элемент в уже созданной строке
+            overscan: Сколько строк держать готовыми за пределами видимой области
+            empty_text: Текст, показываемый при пустом списке
+            key: Ключ элемента; строка остаётся за своим элементом, даже если
+                он сдвинулся (по умолчанию ключ — позиция)
+            signature: Снимок отображаемых полей элемента; без него set_items
+                перепривязывает все видимые строки
+            scheduler: Планировщик для создания строк порциями; без него все
+                строки пула создаются сразу
+        """
+        themed = "fg_color" not in kwargs
+        kwargs.setdefault("fg_color", get_color("COLOR_FRAME_BG"))
+        kwargs.setdefault("corner_radius", 0)
+        super().__init__(parent, **kwargs)
+        if themed:
+            bind_theme(self, fg_color="COLOR_FRAME_BG")
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.overscan = overscan
+        self.key = key
+        self.signature = signature
+        self.scheduler = scheduler
+
+        self._items: Sequence[Any] = ()
+        self._offset = 0  # Прокрутка в пикселях от начала списка
+        # Пул строк и то, что в каждой показано: ключ элемента, снимок и позиция
+        self._rows: List[Any] = []
+        self._row_key: List[Optional[Hashable]] = []
+        self._row_signature: List[Any] = []
+        self._row_y: List[Optional[int]] = []
+        self._slot_by_key: Dict[Hashable, int] = {}
+        self.last_rebinds = 0  # Сколько строк перепривязала последняя перестройка
+        self._rows_needed = 0
+        self._grow_task = None
+        self._layout_job = None
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", lambda event: self.schedule_layout())
+
+        self.empty_label = ctk.CTkLabel(
+            self.viewport,
+            text=empty_text,
+            font=get_font("FONT_NORMAL"),
+            text_color=get_color("COLOR_TEXT_SECONDARY")
+        )
+        bind_theme(self.empty_label, text_color="COLOR_TEXT_SECONDARY", font="FONT_NORMAL")
+
+        # Колесо мыши ловится глобально, как в CTkScrollableFrame, и фильтруется по виджету;
+        # обработчики снимаются в destroy, иначе каждый список оставлял бы свой навсегда
+        self._wheel_bindings: List[Tuple[str, str]] = [
+            (sequence, self.bind_all(sequence, self._on_mouse_wheel, add="+"))
+            for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>")
+        ]
+
+    @property
+    def items(self) -> Sequence[Any]:
+        return self._items
+
+    def set_items(self, items: Sequence[Any], empty_text: Optional[str] = None) -> None:
+        """Заменяет элементы списка, сохраняя положение прокрутки."""
+        self._items = items
+        if empty_text is not None:
+            self.empty_label.configure(text=empty_text)
+        if self.signature is None:
+            self._invalidate()
+        self._layout()
+
+    def refresh(self) -> None:
+        """Заново привязывает видимые строки (после изменения самих элементов)."""
+        self._invalidate()
+        self._layout()
+
+    def _invalidate(self) -> None:
+        self._row_signature = [_STALE] * len(self._rows)
+
+    def set_row_height(self, row_height: int) -> None:
+        """Меняет высоту строки (например, после смены масштаба шрифта).
+
+        Прокрутка пересчитывается так, чтобы вверху остался тот же элемент;
+        все строки заново расставляются по новым позициям.
+        """
+        if row_height == self.row_height:
+            return
+        self._offset = self._offset * row_height // self.row_height
+        self.row_height = row_height
+        self._row_y = [_STALE if y is not None else None for y in self._row_y]
+        self._layout()
+
+    def scroll_to(self, index: int) -> None:
+        """Прокручивает так, чтобы элемент index оказался вверху."""
+        self._offset = index * self.row_height
+        self._layout()
+
+    def scroll_by(self, pixels: float) -> None:
+        self._offset += int(pixels)
+        self._layout()
+
+    def iter_rows(self):
+        """Все созданные строки (например, для смены темы)."""
+        return iter(self._rows)
+
+    def schedule_layout(self) -> None:
+        """Перестраивает список при ближайшем простое цикла событий."""
+        # Серия событий <Configure> при изменении размера даёт одну перестройку
+        if self._layout_job is None:
+            self._layout_job = self.after_idle(self._layout)
+
+    def _layout(self) -> None:
+        self._layout_job = None
+        count = len(self._items)
+        height = max(self.viewport.winfo_height(), self.row_height)
+        total = count * self.row_height
+        self._offset = max(0, min(self._offset, total - height))
+
+        if count:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.place(relx=0.5, y=50, anchor="n")
+
+        first = max(0, self._offset // self.row_height - self.overscan)
+        last = min(count, (self._offset + height) // self.row_height + 1 + self.overscan)
+        self._ensure_rows(last - first)
+
+        # Строки остаются за элементами с тем же ключом; освободившиеся
+        # достаются элементам, впервые попавшим в окно. Сначала видимые:
+        # пока пул растёт, строк может не хватить на запас
+        top = self._offset // self.row_height
+        order = list(range(max(first, top), last)) + list(range(first, max(first, top)))
+        window = {self._key(index): index for index in order}
+        free = [slot for slot, key in enumerate(self._row_key) if key not in window]
+        free.reverse()
+        rebinds = 0
+        for key, index in window.items():
+            item = self._items[index]
+            slot = self._slot_by_key.get(key)
+            signature = self.signature(item) if self.signature is not None else None
+            if slot is None:
+                if not free:
+                    continue
+                slot = free.pop()
+                self._assign(slot, key)
+            if self._row_signature[slot] is _STALE or self._row_signature[slot] != signature:
+                self.bind_row(self._rows[slot], item)
+                self._row_signature[slot] = signature
+                rebinds += 1
+            y = index * self.row_height - self._offset
+            if self._row_y[slot] != y:
+                self._rows[slot].place(x=0, y=y, relwidth=1.0)
+                self._row_y[slot] = y
+        for slot in free:
+            if self._row_y[slot] is not None:
+                self._rows[slot].place_forget()
+                self._row_y[slot] = None
+            self._assign(slot, None)
+        self.last_rebinds = rebinds
+
+        if total > height:
+            self.scrollbar.set(self._offset / total, (self._offset + height) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _key(self, index: int) -> Hashable:
+        return self.key(self._items[index]) if self.key is not None else index
+
+    def _assign(self, slot: int, key: Optional[Hashable]) -> None:
+        old = self._row_key[slot]
+        if old is not None and self._slot_by_key.get(old) == slot:
+            del self._slot_by_key[old]
+        self._row_key[slot] = key
+        if key is not None:
+            self._slot_by_key[key] = slot
+            # Строка показывает другой элемент: снимок прежнего не годится
+            self._row_signature[slot] = _STALE
+
+    def _ensure_rows(self, needed: int) -> None:
+        self._rows_needed = needed
+        if self.scheduler is None:
+            while len(self._rows) < needed:
+                self._add_row()
+            return
+        # Первые строки создаются сразу в пределах бюджета кадра, остальные — порциями
+        deadline = time.perf_counter() + self.scheduler.budget
+        while len(self._rows) < needed and (not self._rows or time.perf_counter() < deadline):
+            self._add_row()
+        if len(self._rows) < needed and (self._grow_task is None or not self._grow_task.active):
+            self._grow_task = self.scheduler.submit(self._grow_rows(), priority=PRIORITY_NORMAL, owner=self)
+
+    def _grow_rows(self):
+        while len(self._rows) < self._rows_needed:
+            self._add_row()
+            self.schedule_layout()
+            yield
+
+    def cancel_pending(self) -> None:
+        """Отменяет отложенное создание строк (например, при уходе с экрана)."""
+        if self.scheduler is not None:
+            self.scheduler.cancel_owner(self)
+
+    def _add_row(self) -> None:
+        self._rows.append(self.create_row(self.viewport))
+        self._row_key.append(None)
+        self._row_signature.append(_STALE)
+        self._row_y.append(None)
+
+    def _on_scrollbar(self, action: str, value, unit: Optional[str] = None) -> None:
+        total = len(self._items) * self.row_height
+        if action == "moveto":
+            self._offset = int(float(value) * total)
+            self._layout()
+        elif action == "scroll":
+            step = self.viewport.winfo_height() if unit == "pages" else self.SCROLL_STEP
+            self.scroll_by(int(value) * step)
+
+    def _on_mouse_wheel(self, event) -> None:
+        path, own = str(event.widget), str(self)
+        if not (path == own or path.startswith(own + ".")) or not self.winfo_exists():
+            return
+        if event.num == 4:
+            units = -1
+        elif event.num == 5:
+            units = 1
+        elif sys.platform.startswith("win"):
+            units = -event.delta / 120
+        else:
+            units = -event.delta
+        self.scroll_by(units * self.SCROLL_STEP)
+
+    def destroy(self):
+        if self._layout_job is not None:
+            self.after_cancel(self._layout_job)
+            self._layout_job = None
+        for sequence, funcid in self._wheel_bindings:
+            self._unbind_all(sequence, funcid)
+        self._wheel_bindings = []
+        super().destroy()
+
+    def _unbind_all(self, sequence: str, funcid: str) -> None:
+        """Снимает один глобальный обработчик, не трогая чужие на той же последовательности.
+
+        unbind_all удалил бы все обработчики (в том числе CTkScrollableFrame),
+        поэтому из скрипта привязки вырезается только строка с funcid.
+        """
+        script = self.tk.call("bind", "all", sequence)
+        kept = "\n".join(line for line in script.split("\n") if funcid not in line)
+        self.tk.call("bind", "all", sequence, kept)
+        self.deletecommand(funcid)
+
+    def update_theme(self) -> None:
+        # Строки привязаны к токенам темы сами и перекрашиваются при её смене
+        refresh_theme(self)
+        refresh_theme(self.empty_label)
@@ -0,0 +1,77 @@
+"""Пул переиспользуемых виджетов.
+
+Создание виджета Tk заметно дороже, чем смена его текста и цвета,
+поэтому списки не уничтожают карточки при перерисовке, а возвращают их в
+пул и берут оттуда же при следующем показе.
+"""
+
+from typing import Callable, Dict, Generic, List, Optional, TypeVar
+
+W = TypeVar("W")
+
+
+class WidgetPool(Generic[W]):
+    """Пул виджетов одного вида с учётом попаданий."""
+
+    def __init__(self, factory: Callable[[], W], max_idle: Optional[int] = None):
+        """Инициализирует пул.
+
+        Args:
+            factory: Создаёт новый виджет, когда свободных нет
+            max_idle: Сколько свободных виджетов хранить (None — без ограничения)
+        """
+        self.factory = factory
+        self.max_idle = max_idle
+        self._idle: List[W] = []
+        self._in_use = 0
+        self.created = 0
+        self.destroyed = 0
+        self.hits = 0
+        self.misses = 0
+
+    def acquire(self) -> W:
+        """Возвращает свободный виджет или создаёт новый."""
+        self._in_use += 1
+        if self._idle:
+            self.hits += 1
+            return self._idle.pop()
+        self.misses += 1
+        self.created += 1
+        return self.factory()
+
+    def release(self, widget: W) -> None:
+        """Скрывает виджет и возвращает его в пул."""
+        self._in_use = max(0, self._in_use - 1)
+        widget.pack_forget()
+        if self.max_idle is not None and len(self._idle) >= self.max_idle:
+            widget.destroy()
+            self.destroyed += 1
+            return
+        self._idle.append(widget)
+
+    def clear(self) -> None:
+        """Уничтожает свободные виджеты."""
+        for widget in self._idle:
+            widget.destroy()
+        self.destroyed += len(self._idle)
+        self._idle = []
+
+    @property
+    def size(self) -> int:
+        """Число живых виджетов пула (занятых и свободных)."""
+        return self.created - self.destroyed
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'size': self.size,
+            'in_use': self._in_use,
+            'idle': len(self._idle),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }